@@ -0,0 +1,417 @@
+"""
+Command-line runner simulating a scenario without the graphical interface
+
+Example::
+
+    brms-run scenario.xlsx results.sqlite --start 2022-01-01 --end 2022-12-31
+    brms-bench-curves scenario.xlsx
+    brms-short-rate scenario.xlsx --date 2022-01-03 --paths 10000
+    brms-stress scenario.xlsx stress.csv --shift 0 --shift 100 --run-off 0.2
+
+The balance sheet, cash, payments, book totals and trading book VaR/ES of every
+date are written to a SQLite database, or to a directory of Parquet files if the
+output path ends with ".parquet". PySide6 is never imported.
+
+`brms-bench-curves` times the curve engines on the yield history of a scenario
+and compares them with the bootstrap, see
+:func:`brms.models.curve_engines.benchmark_engines`.
+
+`brms-short-rate` simulates short-rate paths calibrated to the yield curve of a
+date and reports the distributions of the economic value of equity and the net
+interest income of the bank, see
+:class:`brms.models.short_rate_model.ShortRateScenarioGenerator`.
+
+`brms-stress` runs every combination of the given stress parameters through the
+simulation and writes one row per variant and date, see
+:class:`brms.models.stress_test.StressTestRunner`.
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import time
+
+
+def parse_date(text: str) -> datetime.date:
+    try:
+        return datetime.date.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date {text!r}, use YYYY-MM-DD")
+
+
+def load_scenario(file_path, log):
+    """
+    Load a scenario without the graphical interface.
+
+    :raises ValueError: If the scenario fails to load.
+    """
+
+    # The models use plain Python signals instead of Qt when headless
+    os.environ["BRMS_HEADLESS"] = "1"
+    from brms.models.scenario_model import ScenarioModel
+
+    scenario = ScenarioModel()
+    if not scenario.load_scenario(file_path):
+        summary = scenario.validation_report.summary()
+        raise ValueError(summary or f"Failed to load the scenario {file_path}")
+    if not scenario.validation_report.rejected().empty:
+        log(f"Rejected rows:\n{scenario.validation_report.summary()}")
+    return scenario
+
+
+def run(
+    file_path,
+    output_path,
+    start=None,
+    end=None,
+    risk=True,
+    curve_engine=None,
+    log=None,
+) -> int:
+    """
+    Simulate a scenario from `start` to `end` and write the results of every date.
+
+    :param file_path: The scenario file (Excel file).
+    :param output_path: Where the results are written, see
+        :func:`brms.models.results_sink.create_results_sink`.
+    :param start: The first date, defaults to the first reference date.
+    :param end: The last date, defaults to the last reference date.
+    :param risk: Whether to calculate the VaR and ES of the trading book.
+    :param curve_engine: Optional curve engine replacing the one of the scenario,
+        see :data:`brms.models.curve_engines.CURVE_ENGINES`.
+    :param log: Optional callable receiving progress messages.
+    :return: The number of dates simulated.
+    :rtype: int
+    :raises ValueError: If the scenario fails to load or the curve engine is
+        unknown.
+    """
+
+    log = log or (lambda message: None)
+    scenario = load_scenario(file_path, log)
+    if curve_engine is not None:
+        scenario.yield_curve_model().set_curve_engine(curve_engine)
+
+    from brms.models.results_sink import (
+        ResultsWriter,
+        collect_results,
+        create_results_sink,
+    )
+    from brms.models.simulation import Simulation
+    from brms.models.var_model import HistoricalVaRModel
+    from brms.utils import pydate_to_qldate
+
+    simulation = Simulation(scenario)
+
+    var_model = None
+    if risk:
+        var_model = HistoricalVaRModel()
+        yield_curve_model = scenario.yield_curve_model()
+        dates, _, yields = yield_curve_model.yield_history()
+        tenor_years = yield_curve_model.tenor_grid().years
+        var_model.set_history(dates, tenor_years, yields)
+        var_model.set_portfolio(scenario.cashflow_ledger)
+
+    index = 0 if start is None else simulation.index_of(start)
+    end = None if end is None else pydate_to_qldate(end)
+    dates = simulation.dates()
+    if index >= len(dates) or (end is not None and dates[index] > end):
+        return 0
+
+    writer = ResultsWriter(create_results_sink(output_path))
+    n_dates = 0
+    try:
+        simulation.start(index)
+        while True:
+            # Aggregating the books also updates the values collected below
+            metrics = simulation.results()
+            for key in ("date", "cash", "payments_received", "payments_paid"):
+                del metrics[key]
+            if var_model is not None:
+                yield_curve = scenario.yield_curve_model().yield_curve()
+                results = var_model.calculate(simulation.current_date, yield_curve)
+                for horizon, (var, es) in results.items():
+                    metrics[f"var_{horizon}d"] = var
+                    metrics[f"es_{horizon}d"] = es
+            writer.append(collect_results(simulation, metrics))
+            n_dates += 1
+            if n_dates % 100 == 0:
+                log(f"Simulated {n_dates} dates, up to {simulation.current_date}")
+            if not simulation.has_next():
+                break
+            if (
+                end is not None
+                and simulation.dates()[simulation.current_index + 1] > end
+            ):
+                break
+            simulation.step()
+    finally:
+        writer.close()
+    return n_dates
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="brms-run",
+        description="Simulate a BRMS scenario and record the results of every date.",
+    )
+    parser.add_argument("scenario", help="the scenario file (Excel file)")
+    parser.add_argument(
+        "output",
+        help="a SQLite database, or a directory of Parquet files if it ends "
+        "with .parquet",
+    )
+    parser.add_argument("--start", type=parse_date, help="first date, YYYY-MM-DD")
+    parser.add_argument("--end", type=parse_date, help="last date, YYYY-MM-DD")
+    parser.add_argument(
+        "--no-risk", action="store_true", help="skip the trading book VaR and ES"
+    )
+    parser.add_argument(
+        "--curve-engine",
+        help="how the yield curves are built, e.g. bootstrap or linear_zero, "
+        "instead of the one of the scenario",
+    )
+    parser.add_argument("-q", "--quiet", action="store_true", help="no progress")
+    args = parser.parse_args(argv)
+
+    def log(message):
+        if not args.quiet:
+            print(message, file=sys.stderr)
+
+    try:
+        n_dates = run(
+            args.scenario,
+            args.output,
+            start=args.start,
+            end=args.end,
+            risk=not args.no_risk,
+            curve_engine=args.curve_engine,
+            log=log,
+        )
+    except (OSError, ValueError, ImportError) as e:
+        print(f"brms-run: {e}", file=sys.stderr)
+        return 1
+    log(f"Wrote the results of {n_dates} dates to {args.output}")
+    return 0
+
+
+def benchmark_main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="brms-bench-curves",
+        description="Time the curve engines on the yield history of a scenario "
+        "and compare their zero rates with the bootstrap.",
+    )
+    parser.add_argument("scenario", help="the scenario file (Excel file)")
+    parser.add_argument(
+        "--engine",
+        action="append",
+        dest="engines",
+        help="an engine to benchmark, all of them by default; may be repeated",
+    )
+    parser.add_argument(
+        "--every", type=int, default=1, help="use every n-th reference date"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        scenario = load_scenario(args.scenario, lambda message: None)
+        from brms.models.curve_engines import benchmark_engines
+
+        yield_curve_model = scenario.yield_curve_model()
+        rows = range(0, yield_curve_model.rowCount(), max(args.every, 1))
+        results = benchmark_engines(yield_curve_model, args.engines, rows)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"brms-bench-curves: {e}", file=sys.stderr)
+        return 1
+
+    print(
+        f"{'engine':<16} {'ms/curve':>9} {'speed-up':>9} "
+        f"{'short max':>10} {'short mean':>11} {'long max':>9} {'long mean':>10}"
+    )
+    for name, r in results.items():
+        print(
+            f"{name:<16} {r['ms_per_curve']:>9.3f} {r['speed_up']:>8.1f}x "
+            f"{r['max_short_error_bp']:>10.2f} {r['mean_short_error_bp']:>11.2f} "
+            f"{r['max_long_error_bp']:>9.2f} {r['mean_long_error_bp']:>10.2f}"
+        )
+    print(
+        "Zero rate errors in basis points against the bootstrap, "
+        f"over {len(rows)} dates"
+    )
+    # The parametric curves of the whole history are fitted at once
+    for svensson, kind in ((False, "Nelson-Siegel"), (True, "Svensson")):
+        start = time.perf_counter()
+        history = yield_curve_model.nelson_siegel_history(svensson)
+        elapsed = 1e3 * (time.perf_counter() - start)
+        print(f"Fitted the {kind} curves of {len(history)} dates in {elapsed:.1f} ms")
+    return 0
+
+
+def short_rate_main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="brms-short-rate",
+        description="Simulate short-rate paths calibrated to the yield curve of a "
+        "date and report the distributions of the economic value of equity (EVE) "
+        "and the net interest income (NII) over the horizon.",
+    )
+    parser.add_argument("scenario", help="the scenario file (Excel file)")
+    parser.add_argument(
+        "--date",
+        type=parse_date,
+        help="valuation date, YYYY-MM-DD, the first by default",
+    )
+    parser.add_argument(
+        "--model", choices=["hull-white", "vasicek"], default="hull-white"
+    )
+    parser.add_argument("--paths", type=int, default=10_000, help="number of paths")
+    parser.add_argument("--horizon", type=float, default=1.0, help="horizon in years")
+    parser.add_argument("--mean-reversion", type=float, default=0.03)
+    parser.add_argument("--volatility", type=float, default=0.01)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="most worker processes, the CPU count by default; small runs are "
+        "priced in this process",
+    )
+    parser.add_argument("--seed", type=int, help="seed for reproducible paths")
+    args = parser.parse_args(argv)
+
+    try:
+        scenario = load_scenario(args.scenario, lambda message: None)
+        from brms.models.short_rate_model import ShortRateScenarioGenerator
+        from brms.models.simulation import Simulation
+
+        simulation = Simulation(scenario)
+        index = 0 if args.date is None else simulation.index_of(args.date)
+        if index >= len(simulation.dates()):
+            raise ValueError(f"No reference date on or after {args.date}")
+        simulation.start(index)
+        generator = ShortRateScenarioGenerator(
+            scenario.yield_curve_model().yield_curve(),
+            args.model,
+            args.mean_reversion,
+            args.volatility,
+        )
+        banking_book = scenario.bank_model().banking_book
+        result = generator.run(
+            scenario.cashflow_ledger,
+            banking_book.get_cash(),
+            banking_book.get_demand_deposits(),
+            n_paths=args.paths,
+            horizon=args.horizon,
+            n_workers=args.workers,
+            seed=args.seed,
+        )
+    except (OSError, ValueError, ImportError) as e:
+        print(f"brms-short-rate: {e}", file=sys.stderr)
+        return 1
+
+    print(
+        f"{args.paths} {args.model} paths from {simulation.current_date}, "
+        f"horizon {args.horizon:g} years, EVE today {result.base_eve:,.2f}"
+    )
+    summary = result.summary()
+    columns = list(summary["EVE"])
+    print(f"{'':<4}" + "".join(f"{c:>16}" for c in columns))
+    for name, stats in summary.items():
+        print(f"{name:<4}" + "".join(f"{stats[c]:>16,.2f}" for c in columns))
+    return 0
+
+
+def stress_main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="brms-stress",
+        description="Simulate every combination of the given stress parameters "
+        "and write the results of every variant and date to a table.",
+    )
+    parser.add_argument("scenario", help="the base scenario file (Excel file)")
+    parser.add_argument(
+        "output",
+        help="a CSV file, or a Parquet file if it ends with .parquet",
+    )
+    parser.add_argument("--start", type=parse_date, help="first date, YYYY-MM-DD")
+    parser.add_argument("--end", type=parse_date, help="last date, YYYY-MM-DD")
+    grid = parser.add_argument_group(
+        "stress parameters", "each may be repeated, 0 by default"
+    )
+    grid.add_argument(
+        "--shift",
+        type=float,
+        action="append",
+        dest="parallel_shifts_bp",
+        help="parallel shift of the par yields, in basis points",
+    )
+    grid.add_argument(
+        "--twist",
+        type=float,
+        action="append",
+        dest="twists_bp",
+        help="steepening of the par yields, in basis points",
+    )
+    grid.add_argument(
+        "--run-off",
+        type=float,
+        action="append",
+        dest="deposit_run_offs",
+        help="fraction of the demand deposits withdrawn at the start",
+    )
+    grid.add_argument(
+        "--prepayment",
+        type=float,
+        action="append",
+        dest="prepayment_rates",
+        help="annual constant prepayment rate of mortgages",
+    )
+    parser.add_argument(
+        "--rate-shift",
+        type=float,
+        action="append",
+        default=[],
+        dest="rate_shifts_bp",
+        help="also value the trading book on the curve of every variant shifted "
+        "by this many basis points; may be repeated",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="worker processes, the CPU count by default"
+    )
+    args = parser.parse_args(argv)
+
+    # The models use plain Python signals instead of Qt when headless
+    os.environ["BRMS_HEADLESS"] = "1"
+    try:
+        from brms.models.stress_test import StressTestRunner, stress_grid
+
+        variants = stress_grid(
+            *(
+                getattr(args, name) or (0.0,)
+                for name in (
+                    "parallel_shifts_bp",
+                    "twists_bp",
+                    "deposit_run_offs",
+                    "prepayment_rates",
+                )
+            )
+        )
+        runner = StressTestRunner(
+            args.scenario, args.start, args.end, args.rate_shifts_bp
+        )
+        results = runner.run(variants, args.workers)
+        if results.empty:
+            raise ValueError(f"No date of {args.scenario} to simulate")
+        if args.output.endswith(".parquet"):
+            results.to_parquet(args.output, index=False)
+        else:
+            results.to_csv(args.output, index=False)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"brms-stress: {e}", file=sys.stderr)
+        return 1
+    print(
+        f"Wrote the results of {len(variants)} variants over "
+        f"{results['date'].nunique()} dates to {args.output}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,21 @@
-from .book_controller import BankingBookController, TradingBookController
-from .calculator_controller import BondCalculatorController, LoanCalculatorController
-from .yield_curve_controller import YieldCurveController
+# The controllers are imported on first access, see brms.views
+import importlib
+
+_CONTROLLERS = {
+    "BankingBookController": ".book_controller",
+    "BondCalculatorController": ".calculator_controller",
+    "GapReportController": ".gap_report_controller",
+    "LiquidityController": ".liquidity_controller",
+    "LoanCalculatorController": ".calculator_controller",
+    "RiskMetricsController": ".risk_metrics_controller",
+    "TradingBookController": ".book_controller",
+    "YieldCurveController": ".yield_curve_controller",
+}
+
+__all__ = list(_CONTROLLERS)
+
+
+def __getattr__(name):
+    if name not in _CONTROLLERS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_CONTROLLERS[name], __name__), name)
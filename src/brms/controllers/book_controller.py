@@ -3,7 +3,7 @@ from PySide6.QtWidgets import QHeaderView
 
 from brms.controllers.base import BRMSController
 from brms.models.bank_book_model import BankBankingBookModel, BankTradingBookModel
-from brms.models.instruments import AmortizingFixedRateLoan, FixedRateBond, Instrument
+from brms.models.instruments import Instrument
 from brms.views.bank_book_widget import BankBankingBookWidget, BankTradingBookWidget
 from brms.views.base import TreeModel
 
@@ -65,8 +65,12 @@ class BookController(BRMSController):
         tree_view.header().setSectionResizeMode(0, QHeaderView.Stretch)
         tree_view.header().setSectionResizeMode(1, QHeaderView.ResizeToContents)
 
-    def update_assets_tree_view(self):
-        data = self.model.assets_data()
+    def update_assets_tree_view(self, recalculate=True):
+        if recalculate:
+            data = self.model.assets_data()
+        else:
+            # Show the last values, e.g. restored from a checkpoint
+            data = self.model.aggregation_state()[0]
         headers = self.assets_tree_view_header
         tree_view = self.view.assets_tree_view
         old_model = self.assets_tree_model
@@ -78,8 +82,12 @@ class BookController(BRMSController):
         self.expand_tree_view_items(expanded_indices, new_model, tree_view)
         self.set_tree_view_header_resize_mode(tree_view)
 
-    def update_liabilities_tree_view(self):
-        data = self.model.liabilities_data()
+    def update_liabilities_tree_view(self, recalculate=True):
+        if recalculate:
+            data = self.model.liabilities_data()
+        else:
+            # Show the last values, e.g. restored from a checkpoint
+            data = self.model.aggregation_state()[1]
         headers = self.liabilities_tree_view_header
         tree_view = self.view.liabilities_tree_view
         old_model = self.liabilities_tree_model
@@ -92,21 +100,7 @@ class BookController(BRMSController):
         self.set_tree_view_header_resize_mode(tree_view)
 
     def calculate_payments(self, prev_date: ql.Date, curr_date: ql.Date):
-
-        for instrument in (*self.model.assets, *self.model.liabilities):
-            if isinstance(instrument, AmortizingFixedRateLoan):
-                interest_pmt, principal_pmt, _ = instrument.payment_schedule()
-
-                for (pmt_date, pmt_i), (_, pmt_p) in zip(interest_pmt, principal_pmt):
-                    if prev_date < pmt_date <= curr_date:
-                        instrument.payments_received.emit(pmt_i + pmt_p)
-
-            elif isinstance(instrument, FixedRateBond):
-                payments = instrument.payment_schedule()
-
-                for pmt_date, pmt in payments:
-                    if prev_date < pmt_date <= curr_date:
-                        instrument.payments_received.emit(pmt)
+        self.model.calculate_payments(prev_date, curr_date)
 
 
 class TradingBookController(BookController):
@@ -1,7 +1,8 @@
+import numpy as np
 import QuantLib as ql
 
 from brms.models.instruments import InstrumentFactory
-from brms.utils import qdate_to_qldate
+from brms.utils import qdate_to_qldate, qldate_to_pydate
 from brms.views import BondCalculatorWidget, LoanCalculatorWidget
 
 
@@ -10,6 +11,7 @@ class BondCalculatorController:
         self.view = view
         self.view.payments_button.clicked.connect(self.update_bond_payments_schedule)
         self.view.calculate_button.clicked.connect(self.update_bond_value)
+        self.view.sweep_button.clicked.connect(self.update_price_yield_sweep)
 
     def parse_view_params(self):
         """
@@ -147,6 +149,57 @@ class BondCalculatorController:
 
         return bond, params
 
+    def parse_sweep_params(self, valuation_date: ql.Date, maturity_date: ql.Date):
+        """
+        Parse the grid of the price-yield sweep from the widget inputs.
+
+        The valuation dates are spread evenly from the valuation date to the day
+        before maturity.
+
+        Returns:
+            Tuple: The valuation dates (list[ql.Date]) and the yields as decimals
+            (np.ndarray).
+        """
+        yields = np.linspace(
+            self.view.sweep_min_yield_edit.value() / 100,
+            self.view.sweep_max_yield_edit.value() / 100,
+            self.view.sweep_steps_edit.value(),
+        )
+        first = valuation_date.serialNumber()
+        last = max(maturity_date.serialNumber() - 1, first)
+        serials = np.linspace(first, last, self.view.sweep_dates_edit.value())
+        valuation_dates = [ql.Date(int(d)) for d in np.unique(serials.round())]
+        return valuation_dates, yields
+
+    def update_price_yield_sweep(self):
+
+        bond, params = self.build_bond()
+        (
+            valuation_date,
+            fixed_forward_rate,
+            compounding,
+            comp_frequency,
+            *_,
+        ) = params
+
+        # Price the whole grid of valuation dates and yields at once
+        valuation_dates, yields = self.parse_sweep_params(
+            valuation_date, bond.maturity_date
+        )
+        sweep = bond.price_yield_sweep(
+            valuation_dates, yields, compounding, comp_frequency
+        )
+        self.view.show_price_yield_sweep(
+            100 * sweep.yields,
+            [qldate_to_pydate(d) for d in sweep.valuation_dates],
+            sweep.clean_prices,
+            sweep.durations,
+            sweep.convexities,
+            100 * fixed_forward_rate,
+        )
+
+        return bond, params
+
 
 class LoanCalculatorController:
     def __init__(self, view: LoanCalculatorWidget):
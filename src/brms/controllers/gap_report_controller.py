@@ -0,0 +1,42 @@
+import QuantLib as ql
+
+from brms.controllers.base import BRMSController
+from brms.models.bank_book_model import BankBankingBookModel
+from brms.models.gap_model import RepricingGapModel
+from brms.views.gap_report_widget import GapReportWidget
+
+
+class GapReportController(BRMSController):
+
+    def __init__(
+        self,
+        model: RepricingGapModel,
+        banking_book: BankBankingBookModel,
+        view: GapReportWidget,
+    ):
+        super().__init__()
+        self.model = model
+        self.banking_book = banking_book
+        self.view = view
+
+        self.update_view(ql.Date())
+
+    def reset(self):
+        self.model.reset()
+        self.update_view(ql.Date())
+
+    def update_view(self, date: ql.Date):
+        if date == ql.Date():
+            n_bands = len(self.model.bands)
+            self.view.show_gap_report(self.model.labels(), [[0.0] * n_bands] * 4)
+            return
+        cash = self.banking_book.get_cash()
+        deposits = self.banking_book.get_demand_deposits()
+        report = self.model.calculate(date, cash, deposits)
+        columns = [
+            report["assets"],
+            report["liabilities"],
+            report["gap"],
+            report["cumulative_gap"],
+        ]
+        self.view.show_gap_report(self.model.labels(), columns)
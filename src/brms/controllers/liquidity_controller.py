@@ -0,0 +1,49 @@
+import QuantLib as ql
+
+from brms.controllers.base import BRMSController
+from brms.models.bank_book_model import BankBankingBookModel
+from brms.models.liquidity_model import LiquidityProjectionModel
+from brms.views.liquidity_widget import LiquidityWidget
+
+
+class LiquidityController(BRMSController):
+
+    def __init__(
+        self,
+        model: LiquidityProjectionModel,
+        banking_book: BankBankingBookModel,
+        view: LiquidityWidget,
+    ):
+        super().__init__()
+        self.model = model
+        self.banking_book = banking_book
+        self.view = view
+        self.current_date = ql.Date()
+
+        self.view.initial_run_off_edit.setValue(self.model.initial_run_off * 100)
+        self.view.daily_run_off_edit.setValue(self.model.daily_run_off * 100)
+        self.view.initial_run_off_edit.valueChanged.connect(self.on_run_off_changed)
+        self.view.daily_run_off_edit.valueChanged.connect(self.on_run_off_changed)
+
+        self.update_view(self.current_date)
+
+    def reset(self):
+        self.model.reset()
+        self.update_view(ql.Date())
+
+    def on_run_off_changed(self):
+        self.model.initial_run_off = self.view.initial_run_off_edit.value() / 100
+        self.model.daily_run_off = self.view.daily_run_off_edit.value() / 100
+        self.update_view(self.current_date)
+
+    def update_view(self, date: ql.Date):
+        self.current_date = date
+        if date == ql.Date():
+            summary = [(h, 0.0, 0.0, 0.0, 0.0) for h in self.model.horizons]
+            self.view.show_liquidity(None, summary)
+            return
+        self.model.advance_to(date)
+        cash = self.banking_book.get_cash()
+        deposits = self.banking_book.get_demand_deposits()
+        projection = self.model.calculate(cash, deposits)
+        self.view.show_liquidity(projection["survival_horizon"], projection["summary"])
@@ -3,15 +3,30 @@ import time
 
 import QuantLib as ql
 from PySide6.QtCore import QTimer
-from PySide6.QtWidgets import QFileDialog
+from PySide6.QtWidgets import QFileDialog, QInputDialog
 
 from brms.controllers import (
     BankingBookController,
+    GapReportController,
+    LiquidityController,
+    RiskMetricsController,
     TradingBookController,
     YieldCurveController,
 )
 from brms.controllers.base import BRMSController
+from brms.models.checkpoint import load_checkpoint, save_checkpoint
+from brms.models.gap_model import RepricingGapModel
+from brms.models.history import SimulationHistory
+from brms.models.liquidity_model import LiquidityProjectionModel
+from brms.models.results_sink import (
+    ResultsWriter,
+    collect_results,
+    create_results_sink,
+)
+from brms.models.scenario_loader import ScenarioLoader
 from brms.models.scenario_model import ScenarioModel
+from brms.models.simulation import Simulation
+from brms.models.var_model import HistoricalVaRModel
 from brms.utils import pydate_to_qldate
 from brms.views.main_window import MainWindow
 
@@ -26,6 +41,19 @@ class MainController(BRMSController):
         self.simulation_interval = 500  # o.5 seconds per day
         self.simulation_timer = QTimer()
 
+        # The engine advancing the scenario
+        self.simulation = Simulation(self.scenario)
+        # Snapshots to go back to earlier dates
+        self.history = SimulationHistory()
+        # Writes the results of every date while recording
+        self.results_writer: ResultsWriter | None = None
+        # The index of the last date written, the results are written in date
+        # order and dates revisited after stepping back are not written again
+        self.recorded_index = -1
+        # Loads scenario files in the background
+        self.scenario_loader = ScenarioLoader(self.scenario)
+        self.progress_dialog = None
+
         # Current date in the simulation
         self.dates_in_simulation: list[ql.Date] = []
         self.current_date: ql.Date = ql.Date()
@@ -44,11 +72,28 @@ class MainController(BRMSController):
             self.scenario.bank_model().trading_book,  # trading book model
             self.view.bank_books_widget.bank_trading_book_widget,  # view
         )
+        self.risk_metrics_controller = RiskMetricsController(
+            HistoricalVaRModel(),  # model
+            self.view.risk_metrics_widget,  # view
+        )
+        self.gap_report_controller = GapReportController(
+            RepricingGapModel(),  # model
+            self.scenario.bank_model().banking_book,  # banking book model
+            self.view.gap_report_widget,  # view
+        )
+        self.liquidity_controller = LiquidityController(
+            LiquidityProjectionModel(),  # model
+            self.scenario.bank_model().banking_book,  # banking book model
+            self.view.liquidity_widget,  # view
+        )
         # All controllers
         self._controllers = [
             self.yield_curve_controller,
             self.banking_book_controller,
             self.trading_book_controller,
+            self.risk_metrics_controller,
+            self.gap_report_controller,
+            self.liquidity_controller,
         ]
 
         self.connect_signals_slots()
@@ -61,13 +106,19 @@ class MainController(BRMSController):
         for controller in self._controllers:
             controller.reset()
         # Reset main controller itself
+        self.scenario_loader.cancel()
         self.simulation_timer.stop()
         self.set_simulation_speed(500)
         # Current date in the simulation
+        self.stop_recording()
+        self.simulation.reset()
+        self.history.reset()
         self.dates_in_simulation.clear()
         self.set_current_simulation_date(ql.Date())
-        # At init, only allow Next or Start.
+        # At init, only allow Next, Back or Start.
         self.view.next_action.setEnabled(True)
+        self.view.previous_action.setEnabled(True)
+        self.view.go_to_date_action.setEnabled(True)
         self.view.start_action.setEnabled(True)
         self.view.pause_action.setDisabled(True)
         self.view.stop_action.setDisabled(True)
@@ -78,17 +129,30 @@ class MainController(BRMSController):
         self.view.exit_action.triggered.connect(self.on_exit_action)
         self.view.new_action.triggered.connect(self.on_new_action)
         self.view.open_action.triggered.connect(self.on_open_action)
+        self.view.save_action.triggered.connect(self.on_save_action)
+        self.view.load_checkpoint_action.triggered.connect(
+            self.on_load_checkpoint_action
+        )
+        self.view.record_action.triggered.connect(self.on_record_action)
         self.view.next_action.triggered.connect(self.on_next_simulation)
+        self.view.previous_action.triggered.connect(self.on_previous_simulation)
+        self.view.go_to_date_action.triggered.connect(self.on_go_to_date_action)
         self.view.start_action.triggered.connect(self.on_start_action)
         self.view.pause_action.triggered.connect(self.on_pause_action)
         self.view.stop_action.triggered.connect(self.on_stop_action)
         self.view.speed_up_action.triggered.connect(self.on_speed_up_action)
         self.view.speed_down_action.triggered.connect(self.on_speed_down_action)
         self.view.yield_curve_action.triggered.connect(self.on_yield_curve_action)
+        self.view.risk_metrics_action.triggered.connect(self.on_risk_metrics_action)
+        self.scenario_loader.validated.connect(self.on_scenario_validated)
+        self.scenario_loader.progress.connect(self.on_scenario_load_progress)
+        self.scenario_loader.positions_read.connect(self.on_positions_read)
+        self.scenario_loader.finished.connect(self.on_scenario_load_finished)
 
     # ====== Simulation ========================================================
 
     def on_exit_action(self):
+        self.stop_recording()
         self.view.close()
 
     def on_new_action(self):
@@ -100,10 +164,38 @@ class MainController(BRMSController):
         dir = ""
         filter = "Excel Files (*.xlsx)"
         file_path, _ = file_dialog.getOpenFileName(self.view, caption, dir, filter)
+        if not file_path:
+            return
+        if self.scenario_loader.is_running():
+            self.view.show_warning("A scenario is still being loaded.")
+            return
+        self.reset()
+        self.load_scenario_in_background(file_path)
+
+    def on_save_action(self):
+        if self.simulation.current_index < 0:
+            self.view.show_warning("No data")
+            return
+        file_dialog = QFileDialog()
+        caption = "Save Checkpoint"
+        dir = ""
+        filter = "BRMS Checkpoint (*.brms)"
+        file_path, _ = file_dialog.getSaveFileName(self.view, caption, dir, filter)
+        if not file_path:
+            return
+        save_checkpoint(file_path, self.simulation)
+        self.view.statusBar.showMessage(f"Checkpoint saved to {file_path}.")
+
+    def on_load_checkpoint_action(self):
+        file_dialog = QFileDialog()
+        caption = "Load Checkpoint"
+        dir = ""
+        filter = "BRMS Checkpoint (*.brms)"
+        file_path, _ = file_dialog.getOpenFileName(self.view, caption, dir, filter)
         if not file_path:
             return
         self.reset()
-        self.load_scenario(file_path)
+        self.load_checkpoint(file_path)
 
     def on_next_simulation(self):
         if len(self.dates_in_simulation) == 0:
@@ -114,17 +206,18 @@ class MainController(BRMSController):
 
         start_time = time.time()
 
-        idx = self.dates_in_simulation.index(self.current_date)
-        if idx >= len(self.dates_in_simulation) - 1:
+        if not self.simulation.has_next():
             self.on_stop_action()
             return
+        idx = self.simulation.current_index
         self.yield_curve_controller.set_current_selection(idx + 1, 0)
-        next_date = self.dates_in_simulation[idx + 1]
 
-        self.set_current_simulation_date(next_date)
         self.before_repricing()
         self.repricing()
+        self.set_current_simulation_date(self.simulation.current_date)
         self.after_repricing()
+        self.record_results()
+        self.history.record(self.simulation)
 
         end_time = time.time()
         elapsed_time = (end_time - start_time) * 1000
@@ -132,9 +225,95 @@ class MainController(BRMSController):
             f"Simulation completed in {elapsed_time:.2f} ms."
         )
 
+    def on_record_action(self, checked: bool):
+        if not checked:
+            self.stop_recording()
+            return
+        file_dialog = QFileDialog()
+        caption = "Record Results"
+        dir = ""
+        filter = "SQLite Database (*.sqlite *.db);;Parquet Directory (*.parquet)"
+        file_path, _ = file_dialog.getSaveFileName(self.view, caption, dir, filter)
+        if not file_path:
+            self.view.record_action.setChecked(False)
+            return
+        try:
+            sink = create_results_sink(file_path)
+        except ImportError:
+            self.view.show_warning("Writing Parquet files requires pyarrow.")
+            self.view.record_action.setChecked(False)
+            return
+        self.results_writer = ResultsWriter(sink)
+        self.recorded_index = -1
+        self.view.statusBar.showMessage(f"Recording results to {file_path}.")
+        if self.simulation.current_index >= 0:
+            self.record_results()
+
+    def record_results(self):
+        if self.results_writer is None:
+            return
+        if self.simulation.current_index <= self.recorded_index:
+            return
+        self.recorded_index = self.simulation.current_index
+        metrics = {}
+        for horizon, (var, es) in self.risk_metrics_controller.results.items():
+            metrics[f"var_{horizon}d"] = var
+            metrics[f"es_{horizon}d"] = es
+        self.results_writer.append(collect_results(self.simulation, metrics))
+
+    def stop_recording(self):
+        if self.results_writer is None:
+            return
+        writer, self.results_writer = self.results_writer, None
+        self.view.record_action.setChecked(False)
+        try:
+            writer.close()
+        except Exception as e:
+            self.view.show_warning(f"Failed to record results: {e}")
+
+    def on_previous_simulation(self):
+        if self.simulation.current_index <= 0:
+            return
+        self.seek(self.simulation.current_index - 1)
+
+    def on_go_to_date_action(self):
+        first_index = self.history.first_index()
+        if first_index is None:
+            self.view.show_warning("No data")
+            return
+        dates = [str(d) for d in self.dates_in_simulation[first_index:]]
+        current = max(self.simulation.current_index - first_index, 0)
+        date, ok = QInputDialog.getItem(
+            self.view, "Go to Date", "Date:", dates, current, False
+        )
+        if ok:
+            self.seek(first_index + dates.index(date))
+
+    def seek(self, index: int):
+        start_time = time.time()
+        try:
+            self.history.seek(self.simulation, index)
+        except ValueError:
+            self.view.show_warning("The date is not available.")
+            return
+        self.yield_curve_controller.set_current_selection(index, 0)
+        self.set_current_simulation_date(self.simulation.current_date)
+        self.after_repricing()
+        self.history.record(self.simulation)
+        # The simulation can move on from the new date
+        self.view.next_action.setEnabled(not self.simulation_timer.isActive())
+        self.view.start_action.setEnabled(not self.simulation_timer.isActive())
+
+        elapsed_time = (time.time() - start_time) * 1000
+        self.view.statusBar.showMessage(
+            f"Moved to {self.current_date} in {elapsed_time:.2f} ms."
+        )
+
     def on_start_action(self):
         self.view.statusBar.showMessage("Simulation started.")
         self.view.next_action.setDisabled(True)
+        self.view.previous_action.setDisabled(True)
+        self.view.go_to_date_action.setDisabled(True)
         self.view.start_action.setDisabled(True)
         self.view.pause_action.setEnabled(True)
         self.view.stop_action.setEnabled(True)
@@ -145,6 +324,8 @@ class MainController(BRMSController):
     def on_pause_action(self):
         self.view.statusBar.showMessage("Simulation paused.")
         self.view.next_action.setEnabled(True)
+        self.view.previous_action.setEnabled(True)
+        self.view.go_to_date_action.setEnabled(True)
         self.view.start_action.setEnabled(True)
         self.view.pause_action.setDisabled(True)
         self.view.stop_action.setDisabled(True)
@@ -152,6 +333,9 @@ class MainController(BRMSController):
 
     def on_stop_action(self):
         self.view.statusBar.showMessage("Simulation stopped.")
+        # Earlier dates can still be revisited
+        self.view.previous_action.setEnabled(True)
+        self.view.go_to_date_action.setEnabled(True)
         self.view.next_action.setDisabled(True)
         self.view.start_action.setDisabled(True)
         self.view.pause_action.setDisabled(True)
@@ -172,29 +356,29 @@ class MainController(BRMSController):
     def on_yield_curve_action(self):
         self.view.yield_curve_widget.show()
 
+    def on_risk_metrics_action(self):
+        self.view.risk_metrics_widget.show()
+
     # ==========================================================================
     def before_repricing(self):
         pass
 
     def repricing(self):
-        # yield_curve_ctrl has updated its own `yield_curve`
-        # After this, instruments will be revalued, i.e., data in model changed
-        self.scenario.relinkable_handle.linkTo(
-            self.scenario.yield_curve_model().yield_curve()
-        )
-
-        self.banking_book_controller.calculate_payments(
-            self.previous_date, self.current_date
-        )
-        self.trading_book_controller.calculate_payments(
-            self.previous_date, self.current_date
-        )
+        # The simulation links the yield curve of the next date and settles the
+        # payments due. After this, instruments will be revalued, i.e., data in
+        # model changed
+        self.simulation.step()
 
     def after_repricing(self):
         self.banking_book_controller.update_assets_tree_view()
         self.banking_book_controller.update_liabilities_tree_view()
         self.trading_book_controller.update_assets_tree_view()
         self.trading_book_controller.update_liabilities_tree_view()
+        self.risk_metrics_controller.update_view(
+            self.current_date, self.scenario.yield_curve_model().yield_curve()
+        )
+        self.gap_report_controller.update_view(self.current_date)
+        self.liquidity_controller.update_view(self.current_date)
 
     def set_simulation_speed(self, interval=500):
         text = f"Speed: <u>{interval/1000}</u> sec/day"
@@ -208,31 +392,131 @@ class MainController(BRMSController):
         self.previous_date = self.current_date
         self.current_date = date
         assert isinstance(self.current_date, ql.Date)
-        ql.Settings.instance().evaluationDate = self.current_date
         self.view.current_date_label.setText(
             f"Current Date: <u>{self.current_date}</u>"
         )
 
-    def load_scenario(self, file_path: str):
+    def load_scenario_in_background(self, file_path: str):
 
-        if not self.scenario.load_scenario(file_path):
-            self.view.show_warning("Failed to load scenario.")
+        self.progress_dialog = self.view.create_progress_dialog(
+            "Load Scenario", "Reading scenario..."
+        )
+        self.progress_dialog.canceled.connect(self.scenario_loader.cancel)
+        self.scenario_loader.start(file_path)
 
+    def on_scenario_validated(self, valid: bool):
+        if not valid:
+            return
+        self.scenario.load_meta()
+        self.scenario.load_yield_curve()
+        # Start on the first date so that positions are valued as they arrive
         self.dates_in_simulation = self.scenario.dates_in_simulation()
+        if self.dates_in_simulation:
+            self.simulation.start(0)
+            self.set_current_simulation_date(self.simulation.current_date)
+            self.yield_curve_controller.set_current_selection(0, 0)
 
-        self.yield_curve_controller.set_current_selection(0, 0)
-        self.set_current_simulation_date(
-            self.yield_curve_controller.get_date_from_selection()
-        )
-        self.scenario.relinkable_handle.linkTo(
-            self.scenario.yield_curve_model().yield_curve()
+    def on_scenario_load_progress(self, sheet: str, done: int, total: int):
+        if self.progress_dialog is None:
+            return
+        self.progress_dialog.setLabelText(f"Loading {sheet}...")
+        self.progress_dialog.setMaximum(total)
+        self.progress_dialog.setValue(done)
+
+    def on_positions_read(self, sheet: str, rows: list):
+        if self.scenario_loader.is_cancelled():
+            return
+        # The instruments are built here rather than on the loader thread, so that
+        # QuantLib objects are only ever created by this thread
+        for index, row in rows:
+            instrument = self.scenario.build_position(sheet, index, row)
+            if instrument is not None:
+                self.scenario.add_position(sheet, instrument)
+        # Show the books as they fill up
+        _, book, _ = self.scenario.POSITION_SHEETS[sheet]
+        if book == "banking_book":
+            controller = self.banking_book_controller
+        else:
+            controller = self.trading_book_controller
+        controller.update_assets_tree_view()
+        controller.update_liabilities_tree_view()
+
+    def on_scenario_load_finished(self, completed: bool):
+        cancelled = self.scenario_loader.is_cancelled()
+        if self.progress_dialog is not None:
+            # Closing the dialog would emit `canceled`
+            self.progress_dialog.canceled.disconnect(self.scenario_loader.cancel)
+            self.progress_dialog.close()
+            self.progress_dialog.deleteLater()
+            self.progress_dialog = None
+        if not completed:
+            if cancelled:
+                self.view.statusBar.showMessage("Loading cancelled.")
+            else:
+                self.show_load_report(False)
+            self.reset()
+            return
+        self.scenario.build_cashflow_ledger()
+        # Colour the loaded values against nothing rather than partial books
+        bank = self.scenario.bank_model()
+        for book in (bank.banking_book, bank.trading_book):
+            book.set_aggregation_state([], [])
+        self.show_load_report(True)
+        self.start_loaded_scenario()
+
+    def show_load_report(self, loaded: bool):
+        report = self.scenario.validation_report
+        if not loaded:
+            self.view.show_warning("Failed to load scenario.", report.summary())
+        elif n_rejected := len(report.rejected()):
+            self.view.show_warning(
+                f"{n_rejected} rows of the scenario were skipped.", report.summary()
+            )
+
+    def start_loaded_scenario(self):
+
+        self.dates_in_simulation = self.scenario.dates_in_simulation()
+
+        if self.dates_in_simulation:
+            self.simulation.start(0)
+        self.refresh_loaded_views()
+        self.history.record(self.simulation)
+
+    def load_checkpoint(self, file_path: str):
+
+        try:
+            load_checkpoint(file_path, self.simulation)
+        except (OSError, ValueError) as e:
+            # The scenario may have been partly restored
+            self.reset()
+            self.view.show_warning("Failed to load checkpoint.", str(e))
+            return
+
+        self.dates_in_simulation = self.scenario.dates_in_simulation()
+        # Show the book values as saved, coloured against their previous values
+        self.refresh_loaded_views(recalculate=False)
+        self.history.record(self.simulation)
+
+    def refresh_loaded_views(self, recalculate=True):
+        self.yield_curve_controller.set_current_selection(
+            max(self.simulation.current_index, 0), 0
         )
+        self.set_current_simulation_date(self.simulation.current_date)
 
         # For efficiency, when loading scenario, instruments do not emit signals
         # so that views require manual refresh here.
-        self.banking_book_controller.update_assets_tree_view()
-        self.banking_book_controller.update_liabilities_tree_view()
-        self.trading_book_controller.update_assets_tree_view()
-        self.trading_book_controller.update_liabilities_tree_view()
+        self.banking_book_controller.update_assets_tree_view(recalculate)
+        self.banking_book_controller.update_liabilities_tree_view(recalculate)
+        self.trading_book_controller.update_assets_tree_view(recalculate)
+        self.trading_book_controller.update_liabilities_tree_view(recalculate)
         self.banking_book_controller.expand_all_tree_view()
         self.trading_book_controller.expand_all_tree_view()
+
+        self.risk_metrics_controller.set_scenario(self.scenario)
+        self.risk_metrics_controller.update_view(
+            self.current_date, self.scenario.yield_curve_model().yield_curve()
+        )
+        self.gap_report_controller.model.set_ledger(self.scenario.cashflow_ledger)
+        self.gap_report_controller.update_view(self.current_date)
+        self.liquidity_controller.model.set_ledger(self.scenario.cashflow_ledger)
+        self.liquidity_controller.update_view(self.current_date)
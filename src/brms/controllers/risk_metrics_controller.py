@@ -0,0 +1,47 @@
+import QuantLib as ql
+
+from brms.controllers.base import BRMSController
+from brms.models.scenario_model import ScenarioModel
+from brms.models.var_model import HistoricalVaRModel
+from brms.views.risk_metrics_widget import RiskMetricsWidget
+
+
+class RiskMetricsController(BRMSController):
+
+    def __init__(self, model: HistoricalVaRModel, view: RiskMetricsWidget):
+        super().__init__()
+        self.model = model
+        self.view = view
+        # The last calculated {horizon: (VaR, ES)}
+        self.results = {}
+
+        self.update_view(ql.Date())
+
+    def reset(self):
+        self.model.reset()
+        self.update_view(ql.Date())
+
+    def set_scenario(self, scenario: ScenarioModel):
+        """
+        Precompute the historical shocks and the trading book cashflows.
+        """
+        yield_curve_model = scenario.yield_curve_model()
+        dates, _, yields = yield_curve_model.yield_history()
+        tenor_years = yield_curve_model.tenor_grid().years
+        self.model.set_history(dates, tenor_years, yields)
+        self.model.set_portfolio(scenario.cashflow_ledger)
+
+    def update_view(self, date: ql.Date, yield_curve: ql.YieldTermStructure = None):
+        results = {}
+        if date != ql.Date() and yield_curve is not None:
+            results = self.model.calculate(date, yield_curve)
+        self.results = results
+        confidence = f"{self.model.confidence:.0%}"
+        metrics = []
+        for horizon in self.model.horizons:
+            var, es = results.get(horizon, (None, None))
+            metrics.append((f"{horizon}-day {confidence}", var, es))
+        title = "Trading Book Historical-Simulation VaR"
+        if date != ql.Date():
+            title = f"{title} as at {date}"
+        self.view.show_var(title, metrics)
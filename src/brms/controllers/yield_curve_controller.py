@@ -1,9 +1,9 @@
-from datetime import date, datetime
+import time
 
 import numpy as np
 import QuantLib as ql
 from dateutil.relativedelta import relativedelta
-from PySide6.QtCore import QItemSelectionModel, Qt
+from PySide6.QtCore import QItemSelectionModel, QTimer
 
 from brms.models import YieldCurveModel
 from brms.views import YieldCurveWidget
@@ -11,12 +11,31 @@ from brms.views import YieldCurveWidget
 
 class YieldCurveController:
 
+    # Milliseconds between frames of the playback
+    playback_interval = 40
+    # Milliseconds of the event loop spent filling the zero rate grid at a time
+    grid_time_slice = 20
+
     def __init__(self, model: YieldCurveModel, view: YieldCurveWidget):
         self.model = model
         self.view = view
 
         self.view.set_model(self.model)
 
+        # The zero rates of all reference dates are precomputed after a load, a
+        # few dates at a time while the event loop is idle and the widget shown,
+        # and then drawn by the playback, the scrubber and the table selection
+        self.zero_rate_grid = None
+        self.grid_timer = QTimer()
+        self.grid_timer.timeout.connect(self.fill_zero_rate_grid)
+        self.playback_timer = QTimer()
+        self.playback_timer.setInterval(self.playback_interval)
+        self.playback_timer.timeout.connect(self.on_next_frame)
+        self.model.modelReset.connect(self.on_model_reset)
+        self.view.visibility_changed.connect(self.on_visibility_changed)
+        self.view.play_action.toggled.connect(self.on_play_toggled)
+        self.view.scrubber.valueChanged.connect(self.show_frame)
+
         # Connect the selection changed signal to the slot
         # fmt: off
         self.view.visibility_changed.connect(self.update_plot)
@@ -29,6 +48,70 @@ class YieldCurveController:
         self.model.reset()
         self.clear_plot()
 
+    def on_model_reset(self):
+        self.grid_timer.stop()
+        self.view.set_playback_range(0)
+        self.zero_rate_grid = None
+        if self.model.rowCount() > 0:
+            self.zero_rate_grid = self.model.new_zero_rate_grid()
+            self.view.set_playback_label("Preparing playback...")
+            self.on_visibility_changed()
+
+    def on_visibility_changed(self):
+        # Fill the zero rate grid only while the widget is shown
+        grid = self.zero_rate_grid
+        if self.view.is_visible and grid is not None and not grid.complete:
+            self.grid_timer.start(0)
+        else:
+            self.grid_timer.stop()
+
+    def fill_zero_rate_grid(self):
+        grid = self.zero_rate_grid
+        if grid is None or grid is not self.model.zero_rate_grid():
+            self.grid_timer.stop()
+            return
+        deadline = time.perf_counter() + self.grid_time_slice / 1000
+        while not grid.complete and time.perf_counter() < deadline:
+            self.model.fill_zero_rates(grid, 1)
+        if grid.complete:
+            self.grid_timer.stop()
+            self.view.set_playback_range(len(grid))
+
+    def on_play_toggled(self, checked: bool):
+        if not checked:
+            self.playback_timer.stop()
+            return
+        if self.view.scrubber.value() == self.view.scrubber.maximum():
+            self.view.scrubber.setValue(0)
+        self.playback_timer.start()
+
+    def on_next_frame(self):
+        row = self.view.scrubber.value() + 1
+        if row > self.view.scrubber.maximum() or not self.view.is_visible:
+            self.view.play_action.setChecked(False)
+            return
+        self.view.scrubber.setValue(row)
+
+    def show_frame(self, row: int):
+        """
+        Plot the precomputed curves of the reference date at `row`.
+        """
+        grid = self.zero_rate_grid
+        if grid is None or row >= grid.n_filled:
+            return
+        ref_date, dates, yields, zero_dates, zero_rates = grid.frame(row)
+        date_str = ref_date.strftime("%B %d, %Y")  # Example: "January 01, 2023"
+        self.view.set_playback_label(ref_date.strftime("%Y-%m-%d"))
+        self.view.plot_widget.update_plot(
+            dates,
+            yields,
+            zero_dates,
+            zero_rates,
+            f"Yield Curve as at {date_str}",
+            self.view.plot_widget.rescale_checkbox.isChecked(),
+            self.view.plot_widget.grid_checkbox.isChecked(),
+        )
+
     def set_current_selection(self, row: int, column: int):
         """
         Set the current selection of the table_view.
@@ -57,13 +140,7 @@ class YieldCurveController:
         if not indexes:
             return
 
-        row = indexes[0].row()
-        model = self.model
-
-        # Retrieve the date from the vertical header
-        date_str = model.headerData(row, Qt.Vertical)
-
-        return datetime.strptime(date_str, "%Y-%m-%d")
+        return self.model.tenor_grid().reference_datetime(indexes[0].row())
 
     def get_yields_from_selection(self):
         indexes = self.view.table_view.selectionModel().selectedRows()
@@ -73,72 +150,30 @@ class YieldCurveController:
         row = indexes[0].row()
         model = self.model
 
-        # Retrieve the date from the vertical header
-        date_str = model.headerData(row, Qt.Vertical)
-        reference_date = datetime.strptime(date_str, "%Y-%m-%d")
-
-        # Retrieve the maturities from the horizontal header
-        maturities = [
-            model.headerData(col, Qt.Horizontal) for col in range(model.columnCount())
-        ]
-
-        # Maturity dates
-        maturity_dates = []
-        for m in maturities:
-            match m:
-                case "1M" | "1 Mo":
-                    new_date = reference_date + relativedelta(months=1)
-                case "2M" | "2 Mo":
-                    new_date = reference_date + relativedelta(months=2)
-                case "3M" | "3 Mo":
-                    new_date = reference_date + relativedelta(months=3)
-                case "4M" | "4 Mo":
-                    new_date = reference_date + relativedelta(months=4)
-                case "6M" | "6 Mo":
-                    new_date = reference_date + relativedelta(months=6)
-                case "1Y" | "1 Yr":
-                    new_date = reference_date + relativedelta(years=1)
-                case "2Y" | "2 Yr":
-                    new_date = reference_date + relativedelta(years=2)
-                case "3Y" | "3 Yr":
-                    new_date = reference_date + relativedelta(years=3)
-                case "5Y" | "5 Yr":
-                    new_date = reference_date + relativedelta(years=5)
-                case "7Y" | "7 Yr":
-                    new_date = reference_date + relativedelta(years=7)
-                case "10Y" | "10 Yr":
-                    new_date = reference_date + relativedelta(years=10)
-                case "20Y" | "20 Yr":
-                    new_date = reference_date + relativedelta(years=20)
-                case "30Y" | "30 Yr":
-                    new_date = reference_date + relativedelta(years=30)
-                case _:
-                    new_date = date
-
-            maturity_dates.append(new_date)
-
-        # Retrieve the yields for the selected row
-        yields = [model.index(row, col).data() for col in range(model.columnCount())]
-
-        # Filter out NaN values
-        yields = np.array(yields)
-        maturity_dates = np.array(maturity_dates)
-        valid_indices = ~np.isnan(yields)
-
-        return reference_date, maturity_dates[valid_indices], yields[valid_indices]
+        return model.get_curve_inputs(row)
 
     def clear_plot(self):
         self.view.plot_widget.clear_plot()
 
     def update_plot(self):
 
+        # Update only when the yield curve widget is visible, the simulation
+        # builds the curve it needs on its own
+        if not self.view.is_visible:
+            return
+
+        # Draw the precomputed curves once available, otherwise build the curve
+        # of the row without replacing the one the simulation values with
+        indexes = self.view.table_view.selectionModel().selectedRows()
+        if indexes and self.zero_rate_grid is not None:
+            if indexes[0].row() < self.zero_rate_grid.n_filled:
+                self.show_frame(indexes[0].row())
+                return
+
         yield_curve = self.build_yield_curve()
 
         if yield_curve is None:
             return
-        # Update only when the yield curve widget is visible?
-        if not self.view.is_visible:
-            return
 
         yield_data = self.get_yields_from_selection()
         if yield_data is None:
@@ -179,4 +214,4 @@ class YieldCurveController:
     def build_yield_curve(self):
 
         yield_data = self.get_yields_from_selection()
-        return self.model.build_yield_curve(yield_data)
+        return self.model.build_curve(yield_data)
@@ -1,10 +1,17 @@
 import sys
+import time
 
-from PySide6.QtWidgets import QApplication
+_launched = time.perf_counter()
 
-from brms.controllers.main_controller import MainController
-from brms.models.scenario_model import ScenarioModel
-from brms.views.main_window import MainWindow
+from PySide6.QtCore import QTimer  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from brms.views.main_window import MainWindow  # noqa: E402
+
+# Seconds from importing this module to the first paint of the main window. The
+# models, controllers and QuantLib are imported after it, pandas when the first
+# scenario is read and matplotlib and the calculators when first opened.
+STARTUP_BUDGET = 1.0
 
 
 class App(QApplication):
@@ -12,9 +19,29 @@ class App(QApplication):
     def __init__(self, sys_argv):
         super(App, self).__init__(sys_argv)
         self.view = MainWindow()
+        self.model = None
+        self.controller = None
+        self.view.show()
+        # Build the rest once the window is painted
+        QTimer.singleShot(0, self.create_controller)
+
+    def create_controller(self):
+        startup_time = time.perf_counter() - _launched
+        if startup_time > STARTUP_BUDGET:
+            print(
+                f"Startup took {startup_time:.2f}s, over the budget of "
+                f"{STARTUP_BUDGET:.2f}s",
+                file=sys.stderr,
+            )
+
+        from brms.controllers.main_controller import MainController
+        from brms.models.scenario_model import ScenarioModel
+
         self.model = ScenarioModel()
         self.controller = MainController(self.model, self.view)
-        self.view.show()
+        # Write the results still buffered when the window is closed
+        self.aboutToQuit.connect(self.controller.stop_recording)
+        self.view.statusBar.showMessage(f"Started in {startup_time:.2f}s")
         self.view.show_load_scenario_messagebox()
 
 
@@ -5,24 +5,42 @@ The base class for Banking Book and Trading Book
 from collections import defaultdict
 
 import QuantLib as ql
-from PySide6.QtCore import QObject, Signal
 
-from brms.models.instruments import Cash, Instrument
+from brms.models.instrument_store import InstrumentStore, Position
+from brms.models.instruments import (
+    BondLike,
+    Cash,
+    DemandDeposit,
+    Instrument,
+    InstrumentFactory,
+)
+from brms.models.qt import QObject, Signal
+from brms.models.valuation import BASE_CURVE, ValuationContext
 
 
 class BankBookModel(QObject):
 
     asset_added = Signal()
     liability_added = Signal()
+    # Payments settled by the bond-like positions of the book
+    payment_received = Signal(float)
+    payment_paid = Signal(float)
 
     color_black = "black"
     color_green = "green"
     color_red = "red"
 
+    # The maximum number of payment schedules cached by the store, unbounded if None
+    max_schedules: int | None = None
+
     def __init__(self) -> None:
         super().__init__()
-        self.assets: list[Instrument] = []
-        self.liabilities: list[Instrument] = []
+        # Bond-like positions are rows of the store, listed as views
+        self.store = InstrumentStore(self.max_schedules)
+        self.assets: list[Instrument | Position] = []
+        self.liabilities: list[Instrument | Position] = []
+        # The date the positions are valued on, set by the simulation
+        self.valuation_context = ValuationContext(ql.Date.todaysDate())
 
         # Example structure of `self._assets_data`
         # This is used to store old data
@@ -43,6 +61,9 @@ class BankBookModel(QObject):
     def reset(self):
         self.assets.clear()
         self.liabilities.clear()
+        self.store.clear()
+        # Drop the shapes shared by the positions cleared above
+        InstrumentFactory.clear_interned()
         self._assets_data.clear()
         self._liabilities_data.clear()
 
@@ -57,15 +78,68 @@ class BankBookModel(QObject):
                 self.asset_added.emit()
             return
 
+        if isinstance(asset, BondLike):
+            asset = self.store.add(asset, 1)
         self.assets.append(asset)
         if emit_signal:
             self.asset_added.emit()
 
     def add_liability(self, liability, emit_signal=True):
+        if isinstance(liability, BondLike):
+            liability = self.store.add(liability, -1)
         self.liabilities.append(liability)
         if emit_signal:
             self.liability_added.emit()
 
+    def replace_asset(self, index: int, asset: BondLike) -> None:
+        """
+        Replace the bond-like asset at `index` with a new row of the store. The
+        replaced row is kept, so its view can be put back later.
+        """
+
+        self.assets[index] = self.store.add(asset, 1)
+
+    def calculate_payments(
+        self, prev_date: ql.Date, curr_date: ql.Date
+    ) -> tuple[float, float]:
+        """
+        Emit the payments of all bond-like positions falling in
+        `(prev_date, curr_date]`, as received for assets and as paid for
+        liabilities.
+
+        :return: The sums of the payments received and paid.
+        :rtype: tuple[float, float]
+        """
+
+        received = paid = 0.0
+        for position in (*self.assets, *self.liabilities):
+            if isinstance(position, Position):
+                payments = position.payments_between(prev_date, curr_date)
+                if position.sign > 0:
+                    signal = self.payment_received
+                    received += sum(payments)
+                else:
+                    signal = self.payment_paid
+                    paid += sum(payments)
+                for pmt in payments:
+                    signal.emit(pmt)
+        return received, paid
+
+    def set_valuation_context(self, context: ValuationContext) -> None:
+        self.valuation_context = context
+
+    def aggregation_state(self) -> tuple[list, list]:
+        """
+        Return the last computed assets and liabilities data, against which the
+        next values are coloured.
+        """
+
+        return self._assets_data, self._liabilities_data
+
+    def set_aggregation_state(self, assets_data: list, liabilities_data: list) -> None:
+        self._assets_data = assets_data
+        self._liabilities_data = liabilities_data
+
     def _determine_color(self, current_value, old_value):
         if old_value is None:
             return self.color_black
@@ -115,15 +189,20 @@ class BankBankingBookModel(BankBookModel):
         else:
             raise RuntimeError("No cash in the bank!")
 
+    def get_demand_deposits(self) -> float:
+        return sum(
+            (l.value() for l in self.liabilities if isinstance(l, DemandDeposit)), 0.0
+        )
+
     def assets_data(self):
 
         grouped_assets = defaultdict(lambda: defaultdict(list))
         # Group assets by class type and name
         # fmt: off
         for asset in self.assets:
-            grouped_assets[type(asset).instrument_type][asset.name].append(asset)
+            grouped_assets[asset.instrument_type][asset.name].append(asset)
 
-        eval_date = ql.Settings.instance().evaluationDate
+        eval_date = self.valuation_context.date
 
         # Create the data structure for the tree view
         data = []
@@ -157,9 +236,9 @@ class BankBankingBookModel(BankBookModel):
         # Group liabilities by class type and name
         # fmt: off
         for liability in self.liabilities:
-            grouped_liabilities[type(liability).instrument_type][liability.name].append(liability)
+            grouped_liabilities[liability.instrument_type][liability.name].append(liability)
 
-        eval_date = ql.Settings.instance().evaluationDate
+        eval_date = self.valuation_context.date
 
         # Create the data structure for the tree view
         data = []
@@ -193,15 +272,33 @@ class BankTradingBookModel(BankBookModel):
     def __init__(self) -> None:
         super().__init__()
 
+    def market_values(self, curve: str = BASE_CURVE) -> tuple[float, float]:
+        """
+        Return the market values of the assets and of the liabilities, with the
+        bond-like positions priced off the named curve of the scenario.
+        """
+
+        date = self.valuation_context.date
+
+        def value(position):
+            if isinstance(position, Position):
+                return position.npv(curve)
+            return position.value_on_trading_book(date)
+
+        return (
+            float(sum(map(value, self.assets), 0.0)),
+            float(sum(map(value, self.liabilities), 0.0)),
+        )
+
     def assets_data(self):
 
         grouped_assets = defaultdict(lambda: defaultdict(list))
         # Group assets by class type and name
         # fmt: off
         for asset in self.assets:
-            grouped_assets[type(asset).instrument_type][asset.name].append(asset)
+            grouped_assets[asset.instrument_type][asset.name].append(asset)
 
-        eval_date = ql.Settings.instance().evaluationDate
+        eval_date = self.valuation_context.date
 
         # Create the data structure for the tree view
         data = []
@@ -235,9 +332,9 @@ class BankTradingBookModel(BankBookModel):
         # Group liabilities by class type and name
         # fmt: off
         for liability in self.liabilities:
-            grouped_liabilities[type(liability).instrument_type][liability.name].append(liability)
+            grouped_liabilities[liability.instrument_type][liability.name].append(liability)
 
-        eval_date = ql.Settings.instance().evaluationDate
+        eval_date = self.valuation_context.date
 
         # Create the data structure for the tree view
         data = []
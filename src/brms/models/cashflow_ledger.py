@@ -0,0 +1,172 @@
+"""
+Date-sorted arrays of every scheduled cashflow held by the bank
+"""
+
+import datetime
+
+import numpy as np
+import QuantLib as ql
+
+from brms.models.instrument_store import BANKING_BOOK, TRADING_BOOK, Position
+
+INTEREST = 0
+PRINCIPAL = 1
+
+
+def to_serial(date: ql.Date | datetime.date | int) -> int:
+    """
+    Convert a date to the QuantLib serial number used by the ledger.
+
+    :param date: A `ql.Date`, a Python date or an already converted serial.
+    :type date: ql.Date | datetime.date | int
+    :return: The serial number of the date.
+    :rtype: int
+    """
+
+    if isinstance(date, ql.Date):
+        return date.serialNumber()
+    if isinstance(date, datetime.date):
+        return ql.Date(date.day, date.month, date.year).serialNumber()
+    return int(date)
+
+
+class CashflowLedger:
+    """
+    Struct-of-arrays view of the contractual cashflows of the bank's books.
+
+    Each row is one payment: its date (as a QuantLib serial), its amount, whether it
+    is interest or principal, its sign (+1 received by the bank, -1 paid by the
+    bank), the book it belongs to and the index of the position that generates it.
+    Rows are sorted by date so that any date window is a `np.searchsorted` away.
+    """
+
+    def __init__(
+        self,
+        dates: np.ndarray | None = None,
+        amounts: np.ndarray | None = None,
+        kinds: np.ndarray | None = None,
+        signs: np.ndarray | None = None,
+        books: np.ndarray | None = None,
+        positions: np.ndarray | None = None,
+        instruments: list | None = None,
+    ) -> None:
+        dates = np.asarray(dates if dates is not None else [], dtype=np.int64)
+        order = np.argsort(dates, kind="stable")
+        self.dates = dates[order]
+        self.amounts = self._column(amounts, np.float64, order)
+        self.kinds = self._column(kinds, np.int8, order)
+        self.signs = self._column(signs, np.int8, order)
+        self.books = self._column(books, np.int8, order)
+        self.positions = self._column(positions, np.int32, order)
+        # The instruments referenced by `self.positions`
+        self.instruments: list = instruments if instruments is not None else []
+
+    @staticmethod
+    def _column(values, dtype, order):
+        values = np.asarray(values if values is not None else [], dtype=dtype)
+        return values[order] if len(values) else values
+
+    @classmethod
+    def from_bank(cls, bank) -> "CashflowLedger":
+        """
+        Build the ledger from all bond-like positions of a :class:`BankModel`.
+
+        Cash and demand deposits are balances rather than scheduled cashflows and are
+        therefore not part of the ledger.
+
+        :param bank: The bank whose banking and trading books are collected.
+        :type bank: BankModel
+        :return: The ledger of all scheduled cashflows.
+        :rtype: CashflowLedger
+        """
+
+        dates, amounts, kinds, signs, books, positions = [], [], [], [], [], []
+        instruments = []
+        # fmt: off
+        holdings = [
+            (bank.banking_book.assets, 1, BANKING_BOOK),
+            (bank.banking_book.liabilities, -1, BANKING_BOOK),
+            (bank.trading_book.assets, 1, TRADING_BOOK),
+            (bank.trading_book.liabilities, -1, TRADING_BOOK),
+        ]
+        # fmt: on
+        for book_instruments, sign, book in holdings:
+            for instrument in book_instruments:
+                if not isinstance(instrument, Position):
+                    continue
+                position = len(instruments)
+                instruments.append(instrument)
+                cf_dates, cf_amounts, cf_is_coupon = instrument.cashflows()
+                dates.extend(cf_dates.tolist())
+                amounts.extend(cf_amounts.tolist())
+                kinds.extend(np.where(cf_is_coupon, INTEREST, PRINCIPAL).tolist())
+                signs.extend([sign] * len(cf_dates))
+                books.extend([book] * len(cf_dates))
+                positions.extend([position] * len(cf_dates))
+
+        return cls(dates, amounts, kinds, signs, books, positions, instruments)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def signed_amounts(self) -> np.ndarray:
+        """
+        Return the amounts from the bank's perspective (received positive).
+        """
+
+        return self.amounts * self.signs
+
+    def window(self, start, end) -> slice:
+        """
+        Return the slice of rows paid strictly after `start` and up to `end`.
+
+        This follows the convention used when processing payments during the
+        simulation, i.e., a payment on `start` has already been settled.
+
+        :param start: The (exclusive) start date.
+        :param end: The (inclusive) end date.
+        :return: The slice into the ledger arrays.
+        :rtype: slice
+        """
+
+        lo = np.searchsorted(self.dates, to_serial(start), side="right")
+        hi = np.searchsorted(self.dates, to_serial(end), side="right")
+        return slice(lo, hi)
+
+    def select(self, mask: np.ndarray) -> "CashflowLedger":
+        """
+        Return a new ledger containing only the rows where `mask` is true.
+
+        :param mask: A boolean array of the same length as the ledger.
+        :type mask: np.ndarray
+        :return: The filtered ledger, sharing the instrument list.
+        :rtype: CashflowLedger
+        """
+
+        return CashflowLedger(
+            self.dates[mask],
+            self.amounts[mask],
+            self.kinds[mask],
+            self.signs[mask],
+            self.books[mask],
+            self.positions[mask],
+            self.instruments,
+        )
+
+    def after(self, date) -> "CashflowLedger":
+        """
+        Return the cashflows still to be paid after `date`.
+        """
+
+        lo = np.searchsorted(self.dates, to_serial(date), side="right")
+        mask = np.zeros(len(self), dtype=bool)
+        mask[lo:] = True
+        return self.select(mask)
+
+    def net_payments_between(self, start, end) -> float:
+        """
+        Return the net amount received by the bank in the window `(start, end]`.
+        """
+
+        window = self.window(start, end)
+        return float(np.sum(self.amounts[window] * self.signs[window]))
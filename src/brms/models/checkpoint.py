@@ -0,0 +1,270 @@
+"""
+Save and restore the state of a simulation
+"""
+
+import copy
+import gzip
+import pickle
+import zlib
+
+import numpy as np
+import QuantLib as ql
+
+from brms.models import instruments
+from brms.models.curve_engines import DEFAULT_ENGINE
+from brms.models.instruments import Cash, DemandDeposit, Instrument
+from brms.models.simulation import Simulation
+
+CHECKPOINT_FORMAT = "brms-checkpoint"
+CHECKPOINT_VERSION = 1
+
+# Conventions are stored by name and rebuilt from these instances
+_CALENDARS = {
+    c.name(): c
+    for c in (
+        ql.NullCalendar(),
+        ql.TARGET(),
+        ql.UnitedStates(ql.UnitedStates.NYSE),
+        ql.UnitedStates(ql.UnitedStates.GovernmentBond),
+        ql.UnitedStates(ql.UnitedStates.Settlement),
+    )
+}
+_DAY_COUNTERS = {
+    d.name(): d
+    for d in (
+        ql.ActualActual(ql.ActualActual.ISDA),
+        ql.ActualActual(ql.ActualActual.ISMA),
+        ql.ActualActual(ql.ActualActual.Bond),
+        ql.Actual360(),
+        ql.Actual365Fixed(),
+        ql.Thirty360(ql.Thirty360.BondBasis),
+        ql.Thirty360(ql.Thirty360.USA),
+    )
+}
+_INSTRUMENT_TYPES = {
+    name: cls
+    for name, cls in vars(instruments).items()
+    if isinstance(cls, type) and issubclass(cls, Instrument)
+}
+_BOOKS = ("banking_book", "trading_book")
+# The only globals a checkpoint may refer to, those NumPy pickles its arrays and
+# scalars with. The state is otherwise made of builtin values.
+_NUMPY_GLOBALS = {
+    (module, name)
+    for package in ("numpy.core", "numpy._core")
+    for module, name in (
+        (f"{package}.multiarray", "_reconstruct"),
+        (f"{package}.multiarray", "scalar"),
+        (f"{package}.numeric", "_frombuffer"),
+    )
+} | {("numpy", "dtype"), ("numpy", "ndarray")}
+
+
+# Raised by unpickling corrupt data or restoring a state of the wrong shape,
+# and by QuantLib on invalid instrument specs
+_INVALID_STATE_ERRORS = (
+    KeyError,
+    IndexError,
+    TypeError,
+    AttributeError,
+    StopIteration,
+    RuntimeError,
+)
+
+
+class _StateUnpickler(pickle.Unpickler):
+    """
+    Unpickle plain values and NumPy arrays only, so that loading a file cannot
+    run arbitrary code.
+    """
+
+    def find_class(self, module, name):
+        if (module, name) not in _NUMPY_GLOBALS:
+            raise pickle.UnpicklingError(f"{module}.{name} is not allowed")
+        return super().find_class(module, name)
+
+
+def _encode(value):
+    """
+    Convert the QuantLib objects of an instrument spec to plain values.
+    """
+    if isinstance(value, ql.Date):
+        return ("Date", value.serialNumber())
+    if isinstance(value, ql.Period):
+        return ("Period", value.length(), value.units())
+    if isinstance(value, ql.Calendar):
+        return ("Calendar", value.name())
+    if isinstance(value, ql.DayCounter):
+        return ("DayCounter", value.name())
+    return value
+
+
+def _decode(value):
+    if not isinstance(value, tuple):
+        return value
+    match value:
+        case ("Date", serial):
+            return ql.Date(serial)
+        case ("Period", length, units):
+            return ql.Period(length, units)
+        case ("Calendar", name) if name in _CALENDARS:
+            return _CALENDARS[name]
+        case ("DayCounter", name) if name in _DAY_COUNTERS:
+            return _DAY_COUNTERS[name]
+    raise ValueError(f"Unknown value in checkpoint: {value!r}")
+
+
+def capture_state(simulation: Simulation, full=True) -> dict:
+    """
+    Capture the state of a simulation.
+
+    :param simulation: The simulation whose scenario is captured.
+    :param full: Whether to include the scenario itself, i.e. the yield data and
+        the instrument specs. Without it, only the state that changes while the
+        simulation advances is captured: the clock, the cash and deposit
+        balances and the aggregated book values the next values are coloured
+        against.
+    :return: A dict of plain Python and NumPy values.
+    :rtype: dict
+    """
+    scenario = simulation.scenario
+    bank = scenario.bank_model()
+    state = {
+        "current_index": simulation.current_index,
+        "previous_date": simulation.previous_date.serialNumber(),
+        "payments": (simulation.payments_received, simulation.payments_paid),
+        # Only cash and deposit balances change as the simulation advances
+        "balances": [
+            i.value()
+            for book in _BOOKS
+            for i in (*getattr(bank, book).assets, *getattr(bank, book).liabilities)
+            if isinstance(i, (Cash, DemandDeposit))
+        ],
+        "aggregation": {
+            book: copy.deepcopy(getattr(bank, book).aggregation_state())
+            for book in _BOOKS
+        },
+    }
+    if full:
+        dates, maturities, yields = scenario.yield_curve_model().yield_history()
+        state["file_path"] = scenario.file_path()
+        state["yield_dates"] = np.array(dates, dtype="datetime64[ns]")
+        state["maturities"] = list(maturities)
+        state["yields"] = yields.copy()
+        state["curve_engine"] = scenario.yield_curve_model().curve_engine()
+        state["positions"] = {
+            book: {
+                side: [
+                    (
+                        getattr(i, "instrument_class", type(i)).__name__,
+                        {k: _encode(v) for k, v in i.spec().items()},
+                    )
+                    for i in getattr(getattr(bank, book), side)
+                ]
+                for side in ("assets", "liabilities")
+            }
+            for book in _BOOKS
+        }
+    return state
+
+
+def restore_state(simulation: Simulation, state: dict) -> None:
+    """
+    Restore a state captured by :func:`capture_state`.
+
+    A full state replaces the scenario; otherwise the scenario must be the one
+    the state was captured from. Only the yield curve of the restored date is
+    built.
+    """
+    scenario = simulation.scenario
+    bank = scenario.bank_model()
+    if "positions" in state:
+        import pandas as pd
+
+        dates = pd.to_datetime(state["yield_dates"])
+        maturities = state["maturities"]
+        scenario._scenario_file_path = state["file_path"]
+        scenario.yield_curve_model().set_curve_engine(
+            state.get("curve_engine", DEFAULT_ENGINE)
+        )
+        scenario.set_yield_history(list(dates), maturities, state["yields"])
+        for book in _BOOKS:
+            book_model = getattr(bank, book)
+            book_model.reset()
+            for side, add in (
+                ("assets", book_model.add_asset),
+                ("liabilities", book_model.add_liability),
+            ):
+                for type_name, spec in state["positions"][book][side]:
+                    cls = _INSTRUMENT_TYPES[type_name]
+                    add(
+                        cls(**{k: _decode(v) for k, v in spec.items()}),
+                        emit_signal=False,
+                    )
+        scenario.cashflow_ledger = type(scenario.cashflow_ledger).from_bank(bank)
+
+    balances = iter(state["balances"])
+    for book in _BOOKS:
+        book_model = getattr(bank, book)
+        for i in (*book_model.assets, *book_model.liabilities):
+            if isinstance(i, (Cash, DemandDeposit)):
+                i.set_value(next(balances))
+        book_model.set_aggregation_state(*copy.deepcopy(state["aggregation"][book]))
+
+    simulation.current_index = state["current_index"]
+    if simulation.current_index < 0:
+        simulation.reset()
+        return
+    simulation.current_date = simulation.dates()[simulation.current_index]
+    simulation.previous_date = ql.Date(state["previous_date"])
+    simulation.payments_received, simulation.payments_paid = state["payments"]
+    simulation.reprice()
+
+
+def save_checkpoint(file_path: str, simulation: Simulation) -> None:
+    """
+    Save the full state of a simulation to a compressed binary file.
+    """
+    header = {"format": CHECKPOINT_FORMAT, "version": CHECKPOINT_VERSION}
+    with gzip.open(file_path, "wb") as f:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(capture_state(simulation), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_checkpoint(file_path: str, simulation: Simulation) -> None:
+    """
+    Restore a simulation from a file written by :func:`save_checkpoint`.
+
+    The scenario workbook is not read again.
+
+    Only plain values and NumPy arrays are unpickled, see :class:`_StateUnpickler`.
+
+    :raises ValueError: If the file is not a checkpoint of a supported version,
+        is truncated or corrupt, or describes a state that cannot be restored.
+    :raises OSError: If the file cannot be read.
+    """
+    try:
+        with gzip.open(file_path, "rb") as f:
+            header = _StateUnpickler(f).load()
+            if (
+                not isinstance(header, dict)
+                or header.get("format") != CHECKPOINT_FORMAT
+            ):
+                raise ValueError(f"{file_path} is not a checkpoint")
+            if header.get("version") != CHECKPOINT_VERSION:
+                raise ValueError(
+                    f"Unsupported checkpoint version {header.get('version')}"
+                )
+            state = _StateUnpickler(f).load()
+    except (
+        pickle.UnpicklingError,
+        EOFError,
+        gzip.BadGzipFile,
+        zlib.error,
+        *_INVALID_STATE_ERRORS,
+    ) as e:
+        raise ValueError(f"{file_path} is not a checkpoint") from e
+    try:
+        restore_state(simulation, state)
+    except _INVALID_STATE_ERRORS as e:
+        raise ValueError(f"{file_path} is not a valid checkpoint: {e!r}") from e
@@ -0,0 +1,662 @@
+"""
+Yield curves built from par yields, by bootstrap or by cheaper approximations
+
+An engine takes the inputs of :meth:`YieldCurveModel.get_curve_inputs`, the
+reference date, the maturity dates and the par yields in percent, and returns a
+QuantLib term structure. "bootstrap" is the exact QuantLib bootstrap of deposits
+and fixed rate bonds. The others bootstrap the par yields in NumPy on a
+semiannual coupon grid, then interpolate the zero rates linearly
+("linear_zero") or with the monotone convex method of Hagan and West
+("monotone_convex"), or fit a Nelson-Siegel or Svensson curve to them in closed
+form ("nelson_siegel", "svensson"). They are several times cheaper, at the cost
+of a few basis points, see :func:`benchmark_engines`.
+
+A scenario selects its engine with the optional "Curve engine" item of its Meta
+sheet.
+"""
+
+import time
+
+import numpy as np
+import QuantLib as ql
+from dateutil.relativedelta import relativedelta
+
+from brms.models.valuation import evaluation_date
+
+DEFAULT_ENGINE = "bootstrap"
+DAYS_PER_YEAR = 365.0
+# Maturities up to a year and a week are quoted as deposits, longer ones as bonds
+# paying semiannual coupons at par, as in the bootstrap
+SHORT_END = 1 + 7 / DAYS_PER_YEAR
+# Spacing in years of the zero rates sampled from the smooth curves
+SAMPLE_STEP = 0.25
+# Decay times in years tried by the Nelson-Siegel and Svensson fits
+NELSON_SIEGEL_TAUS = np.geomspace(0.25, 10.0, 25)
+SVENSSON_TAUS = [
+    (tau1, tau2)
+    for tau1 in np.geomspace(0.25, 5.0, 12)
+    for tau2 in np.geomspace(0.5, 30.0, 15)
+    if tau2 >= 2 * tau1
+]
+
+
+def bootstrap_curve(yield_data) -> ql.YieldTermStructure:
+    """
+    Bootstrap a log-cubic discount curve on deposits up to a year and fixed rate
+    bonds priced at par beyond.
+
+    The rate helpers follow the global evaluation date, so the bootstrap runs on
+    the reference date and its discount factors are then frozen in a curve that
+    no longer depends on the global.
+
+    :raises RuntimeError: If the bootstrap fails.
+    """
+
+    ref_date, dates, yields = yield_data
+
+    # Convert date to QuantLib Date
+    ql_date = ql.Date(ref_date.day, ref_date.month, ref_date.year)
+    with evaluation_date(ql_date):
+        return _bootstrap_curve(ql_date, ref_date, dates, yields)
+
+
+def _bootstrap_curve(ql_date, ref_date, dates, yields) -> ql.YieldTermStructure:
+
+    calendar = ql.UnitedStates(ql.UnitedStates.NYSE)
+    business_convention = ql.Following
+    end_of_month = False
+    day_count = ql.ActualActual(ql.ActualActual.ISDA)
+
+    # Maturity<=1yr
+    zcb_data = []
+    coupon_bond_data = []
+    # Add another week to be sure
+    one_year_later = ref_date + relativedelta(years=1) + relativedelta(weeks=1)
+    for maturity_date, y in zip(dates, yields):
+        if maturity_date <= one_year_later:
+            zcb_data.append((maturity_date, float(y) / 100))
+        else:
+            # Assuming price is 100.0 for simplicity
+            coupon_bond_data.append((maturity_date, float(y) / 100, 100.0))
+
+    # Create zero-coupon bond helpers for the short end
+    zcb_helpers = []
+    for maturity_date, rate in zcb_data:
+        maturity_period = ql.Period((maturity_date - ref_date).days, ql.Days)
+        zcb_helpers.append(
+            ql.DepositRateHelper(
+                ql.QuoteHandle(ql.SimpleQuote(rate)),
+                maturity_period,
+                0,  # settlement days
+                calendar,
+                business_convention,
+                end_of_month,
+                day_count,
+            )
+        )
+
+    # Create fixed rate bond helpers for the long end
+    bond_helpers = []
+    for maturity_date, coupon_rate, price in coupon_bond_data:
+        maturity_period = ql.Period((maturity_date - ref_date).days, ql.Days)
+        schedule = ql.Schedule(
+            ql_date,
+            ql_date + maturity_period,
+            ql.Period(ql.Semiannual),
+            calendar,
+            business_convention,
+            business_convention,
+            ql.DateGeneration.Backward,
+            end_of_month,
+        )
+        bond_helpers.append(
+            ql.FixedRateBondHelper(
+                ql.QuoteHandle(ql.SimpleQuote(price)),
+                0,  # settlement days
+                100.0,  # face value
+                schedule,
+                [coupon_rate],
+                day_count,
+            )
+        )
+
+    # Combine the helpers
+    rate_helpers = zcb_helpers + bond_helpers
+
+    # Build the yield curve
+    yield_curve = ql.PiecewiseLogCubicDiscount(ql_date, rate_helpers, day_count)
+    pillars = yield_curve.dates()
+    discounts = [yield_curve.discount(d) for d in pillars]
+    frozen_curve = ql.LogCubicDiscountCurve(pillars, discounts, day_count)
+    frozen_curve.enableExtrapolation()
+
+    return frozen_curve
+
+
+def _interpolation_matrix(x, xp) -> np.ndarray:
+    """
+    Return the matrix `w` such that `w @ fp` equals `np.interp(x, xp, fp)`, so
+    that many rows of values on the same points are interpolated at once.
+    """
+
+    x = np.asarray(x, dtype=np.float64)
+    xp = np.asarray(xp, dtype=np.float64)
+    weights = np.zeros((len(x), len(xp)))
+    if len(xp) == 1:
+        weights[:, 0] = 1.0
+        return weights
+    j = np.clip(np.searchsorted(xp, x, side="right") - 1, 0, len(xp) - 2)
+    w = np.clip((x - xp[j]) / (xp[j + 1] - xp[j]), 0.0, 1.0)
+    rows = np.arange(len(x))
+    weights[rows, j] = 1 - w
+    weights[rows, j + 1] += w
+    return weights
+
+
+def _interp(x, xp, fp) -> np.ndarray:
+    """
+    Interpolate linearly like `np.interp`, every row of `fp` if it has several.
+    """
+
+    if np.ndim(fp) == 1:
+        return np.interp(x, xp, fp)
+    return fp @ _interpolation_matrix(x, xp).T
+
+
+def par_to_zero(times, par_yields) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Bootstrap continuously compounded zero rates from par yields.
+
+    Yields up to :data:`SHORT_END` are simple deposit rates. Longer ones are the
+    coupons of bonds at par paying every half year, the par yields between the
+    quoted maturities being interpolated linearly.
+
+    :param times: The maturities in years, in increasing order.
+    :param par_yields: The par yields as decimals, or a (curves x maturities)
+        array of them, all bootstrapped at once.
+    :return: The times of the zero rates, the deposit maturities followed by the
+        coupon dates beyond a year, and the zero rates, one row per curve.
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+
+    times = np.asarray(times, dtype=np.float64)
+    par_yields = np.asarray(par_yields, dtype=np.float64)
+    short = times <= SHORT_END
+    short_times = times[short]
+    short_zeros = np.log1p(par_yields[..., short] * short_times) / short_times
+    if short.all():
+        return short_times, short_zeros
+
+    coupon_times = 0.5 * np.arange(1, int(round(2 * times[-1])) + 1)
+    coupons = 0.5 * _interp(coupon_times, times, par_yields)
+    discounts = np.ones(coupons.shape)
+    # The coupons of the first year are discounted off the deposits, if any
+    first = 0
+    if short.any():
+        first = np.searchsorted(coupon_times, SHORT_END, side="right")
+        short_coupon_times = coupon_times[:first]
+        discounts[..., :first] = np.exp(
+            -_interp(short_coupon_times, short_times, short_zeros) * short_coupon_times
+        )
+    annuity = discounts[..., :first].sum(axis=-1)
+    for k in range(first, len(coupon_times)):
+        discounts[..., k] = (1 - coupons[..., k] * annuity) / (1 + coupons[..., k])
+        annuity = annuity + discounts[..., k]
+    long_times = coupon_times[first:]
+    return (
+        np.concatenate([short_times, long_times]),
+        np.concatenate(
+            [short_zeros, -np.log(discounts[..., first:]) / long_times], axis=-1
+        ),
+    )
+
+
+def monotone_convex(times, zero_rates, query_times) -> np.ndarray:
+    """
+    Interpolate zero rates with the monotone convex method of Hagan and West.
+
+    The instantaneous forward rates are piecewise quadratic, continuous and
+    reproduce the discrete forwards between the given times, so the zero rates
+    at the given times are kept.
+
+    :param times: The times of the zero rates, positive and increasing.
+    :param zero_rates: The continuously compounded zero rates.
+    :param query_times: The times to interpolate at, up to the last time.
+    :return: The zero rates at `query_times`.
+    :rtype: np.ndarray
+    """
+
+    t = np.concatenate([[0.0], times])
+    dt = np.diff(t)
+    # Discrete forward rates of the intervals
+    fd = np.diff(np.concatenate([[0.0], zero_rates * times])) / dt
+    # Instantaneous forward rates at the times
+    f = np.empty(len(t))
+    f[1:-1] = (dt[:-1] * fd[1:] + dt[1:] * fd[:-1]) / (dt[:-1] + dt[1:])
+    f[0] = fd[0] - 0.5 * (f[1] - fd[0]) if len(fd) > 1 else fd[0]
+    f[-1] = fd[-1] - 0.5 * (f[-2] - fd[-1]) if len(fd) > 1 else fd[-1]
+
+    query_times = np.asarray(query_times, dtype=np.float64)
+    i = np.clip(np.searchsorted(t, query_times, side="left") - 1, 0, len(dt) - 1)
+    x = (query_times - t[i]) / dt[i]
+    g0, g1 = f[i] - fd[i], f[i + 1] - fd[i]
+
+    def rising(eta):
+        # The integral of ((x - eta) / (1 - eta))**2 from eta to x, if beyond it
+        return np.where(x > eta, np.maximum(x - eta, 0) ** 3 / (3 * (1 - eta) ** 2), 0)
+
+    def falling(eta):
+        # The integral of ((eta - x) / eta)**2 from 0 to min(x, eta)
+        m = np.minimum(x, eta)
+        return np.where(eta > 0, eta / 3 * (1 - ((eta - m) / eta) ** 3), 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # The integral over [0, x] of the deviation g of the forward from the
+        # discrete forward, in each of the four regions of the method
+        region_1 = g0 * (x - 2 * x**2 + x**3) + g1 * (x**3 - x**2)
+        region_2 = g0 * x + (g1 - g0) * rising((g1 + 2 * g0) / (g1 - g0))
+        region_3 = g1 * x + (g0 - g1) * falling(3 * g1 / (g1 - g0))
+        eta = g1 / (g1 + g0)
+        a = -g0 * g1 / (g0 + g1)
+        region_4 = a * x + (g0 - a) * falling(eta) + (g1 - a) * rising(eta)
+    integral = np.select(
+        [
+            (g0 == 0) & (g1 == 0),
+            ((g0 < 0) & (-0.5 * g0 <= g1) & (g1 <= -2 * g0))
+            | ((g0 > 0) & (-0.5 * g0 >= g1) & (g1 >= -2 * g0)),
+            ((g0 < 0) & (g1 > -2 * g0)) | ((g0 > 0) & (g1 < -2 * g0)),
+            ((g0 > 0) & (g1 < 0)) | ((g0 < 0) & (g1 > 0)),
+        ],
+        [np.zeros_like(x), region_1, region_2, region_3],
+        region_4,
+    )
+    cumulative = np.concatenate([[0.0], np.cumsum(fd * dt)])
+    area = cumulative[i] + dt[i] * (fd[i] * x + integral)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(query_times > 0, area / query_times, f[0])
+
+
+def nelson_siegel_loadings(times, taus) -> np.ndarray:
+    """
+    Return the loadings of the Nelson-Siegel (one decay time) or Svensson (two
+    decay times) factors.
+
+    :param times: The maturities in years, positive.
+    :param taus: The decay times in years, one or two per fit, shape
+        (fits, 1 or 2).
+    :return: A (fits x times x factors) array.
+    :rtype: np.ndarray
+    """
+
+    times = np.asarray(times, dtype=np.float64)
+    taus = np.atleast_2d(np.asarray(taus, dtype=np.float64))
+    x = times[None, :, None] / taus[:, None, :]
+    decay = np.exp(-x)
+    slope = -np.expm1(-x) / x
+    curvature = slope - decay
+    level = np.ones(x.shape[:2] + (1,))
+    return np.concatenate([level, slope[..., :1], curvature], axis=2)
+
+
+def fit_nelson_siegel(times, zero_rates, taus) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Fit Nelson-Siegel or Svensson curves to zero rates by least squares.
+
+    The factor weights are linear, so they are solved in closed form for each
+    candidate of decay times, and the candidate with the least squared error kept.
+    The candidates only depend on the maturities, so many curves quoted on the
+    same maturities are fitted at once.
+
+    :param times: The maturities in years, positive.
+    :param zero_rates: The zero rates to fit, or a (curves x maturities) array.
+    :param taus: The candidate decay times, shape (candidates, 1 or 2).
+    :return: The factor weights and the decay times of the best fit, one row per
+        curve if `zero_rates` has several.
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+
+    zero_rates = np.asarray(zero_rates, dtype=np.float64)
+    curves = np.atleast_2d(zero_rates)
+    taus = np.atleast_2d(np.asarray(taus, dtype=np.float64))
+    loadings = nelson_siegel_loadings(times, taus)
+    # (candidates x factors x curves)
+    betas = np.linalg.pinv(loadings) @ curves.T
+    residuals = loadings @ betas - curves.T
+    best = np.square(residuals).sum(axis=1).argmin(axis=0)
+    betas, taus = betas[best, :, np.arange(len(curves))], taus[best]
+    if zero_rates.ndim == 1:
+        return betas[0], taus[0]
+    return betas, taus
+
+
+def nelson_siegel(times, betas, taus) -> np.ndarray:
+    """
+    Evaluate Nelson-Siegel or Svensson curves at `times` (years, may be zero).
+
+    :param betas: The factor weights, or a (curves x factors) array.
+    :param taus: The decay times, or a (curves x 1 or 2) array.
+    :return: The zero rates, one row per curve if several.
+    :rtype: np.ndarray
+    """
+
+    times = np.maximum(np.asarray(times, dtype=np.float64), 1e-12)
+    betas = np.asarray(betas, dtype=np.float64)
+    loadings = nelson_siegel_loadings(times, np.atleast_2d(taus))
+    rates = np.einsum("ctp,cp->ct", loadings, np.atleast_2d(betas))
+    return rates[0] if betas.ndim == 1 else rates
+
+
+class NelsonSiegelHistory:
+    """
+    The Nelson-Siegel or Svensson parameters of every reference date of a yield
+    history.
+
+    The zero rates of any date and maturity are evaluated from the parameters in
+    closed form, many dates at once, without building QuantLib curves. The
+    parameters are a few numbers per date, which :meth:`save` keeps on disk.
+    """
+
+    def __init__(self, reference_dates, betas, taus, max_time: float) -> None:
+        """
+        :param reference_dates: The reference dates, in increasing order.
+        :param betas: The (dates x factors) factor weights.
+        :param taus: The (dates x 1 or 2) decay times in years.
+        :param max_time: The longest maturity fitted, in years.
+        """
+        self.reference_dates = np.asarray(reference_dates, dtype="datetime64[D]")
+        self.betas = np.asarray(betas, dtype=np.float64)
+        self.taus = np.asarray(taus, dtype=np.float64)
+        self.max_time = float(max_time)
+
+    @classmethod
+    def fit(cls, tenor_grid, yields, svensson=True, chunk_size=1024):
+        """
+        Fit the curves of all dates of a yield history at once.
+
+        The par yields of each date are bootstrapped to zero rates at the quoted
+        maturities, see :func:`par_to_zero`, and every date is fitted to them over
+        the same candidates of decay times in one least-squares pass, a chunk of
+        dates at a time to bound the memory used. Missing quotes are interpolated
+        from the quotes of the same date.
+
+        :param tenor_grid: The maturities and reference dates of the history,
+            see :class:`brms.models.yield_curve_model.TenorGrid`.
+        :param yields: The (dates x maturities) par yields in percent.
+        :param svensson: Whether to fit Svensson curves, Nelson-Siegel otherwise.
+        :param chunk_size: The number of dates fitted at a time.
+        """
+        times = tenor_grid.years[tenor_grid.valid]
+        par_yields = np.asarray(yields, dtype=np.float64)[:, tenor_grid.valid] / 100
+        missing = np.isnan(par_yields)
+        for row in np.flatnonzero(missing.any(axis=1) & ~missing.all(axis=1)):
+            quoted = ~missing[row]
+            par_yields[row] = np.interp(times, times[quoted], par_yields[row, quoted])
+
+        node_times, zero_rates = par_to_zero(times, par_yields)
+        zero_rates = _interp(times, node_times, zero_rates)
+        candidates = SVENSSON_TAUS if svensson else NELSON_SIEGEL_TAUS
+        candidates = np.asarray(candidates).reshape(len(candidates), -1)
+        n_taus = candidates.shape[1]
+        betas = np.empty((len(par_yields), n_taus + 2))
+        taus = np.empty((len(par_yields), n_taus))
+        for start in range(0, len(par_yields), chunk_size):
+            rows = slice(start, start + chunk_size)
+            betas[rows], taus[rows] = fit_nelson_siegel(
+                times, zero_rates[rows], candidates
+            )
+        return cls(tenor_grid.reference_dates, betas, taus, times.max(initial=0.0))
+
+    def __len__(self) -> int:
+        return len(self.reference_dates)
+
+    def row_of(self, date) -> int:
+        """
+        Return the row of the last reference date on or before `date`.
+
+        :raises ValueError: If `date` is before the first reference date.
+        """
+        day = np.datetime64(date.strftime("%Y-%m-%d"), "D")
+        row = int(np.searchsorted(self.reference_dates, day, side="right")) - 1
+        if row < 0:
+            raise ValueError(f"No reference date on or before {date}")
+        return row
+
+    def zero_rates(self, rows, times) -> np.ndarray:
+        """
+        Return the continuously compounded zero rates of a row, or of many rows
+        given as a slice or an array of rows, at `times` in years.
+        """
+        return nelson_siegel(times, self.betas[rows], self.taus[rows])
+
+    def discount_factors(self, rows, times) -> np.ndarray:
+        """
+        Return the discount factors of one or many rows at `times` in years.
+        """
+        times = np.asarray(times, dtype=np.float64)
+        return np.exp(-self.zero_rates(rows, times) * times)
+
+    def yield_curve(self, row: int) -> ql.YieldTermStructure:
+        """
+        Return the QuantLib curve of a row, sampled like the parametric engines.
+        """
+        ref_date = self.reference_dates[row].item()
+        sample_times = _sample_times(self.max_time)
+        return _zero_curve(ref_date, sample_times, self.zero_rates(row, sample_times))
+
+    def save(self, file_path) -> None:
+        np.savez_compressed(
+            file_path,
+            reference_dates=self.reference_dates,
+            betas=self.betas,
+            taus=self.taus,
+            max_time=self.max_time,
+        )
+
+    @classmethod
+    def load(cls, file_path) -> "NelsonSiegelHistory":
+        with np.load(file_path) as data:
+            return cls(
+                data["reference_dates"],
+                data["betas"],
+                data["taus"],
+                data["max_time"],
+            )
+
+
+def _times(ref_date, dates) -> np.ndarray:
+    return np.array([(d - ref_date).days for d in dates]) / DAYS_PER_YEAR
+
+
+def _zero_curve(ref_date, times, zero_rates) -> ql.YieldTermStructure:
+    """
+    Return a linear zero curve on continuously compounded rates at `times`.
+    """
+
+    ql_date = ql.Date(ref_date.day, ref_date.month, ref_date.year)
+    days = np.round(np.asarray(times) * DAYS_PER_YEAR).astype(int)
+    days, first = np.unique(days, return_index=True)
+    dates = [ql_date + int(d) for d in days]
+    rates = np.asarray(zero_rates)[first].tolist()
+    if days[0] != 0:
+        dates.insert(0, ql_date)
+        rates.insert(0, rates[0])
+    yield_curve = ql.ZeroCurve(dates, rates, ql.Actual365Fixed())
+    yield_curve.enableExtrapolation()
+    return yield_curve
+
+
+def _sample_times(last: float) -> np.ndarray:
+    return np.append(np.arange(0.0, last, SAMPLE_STEP), last)
+
+
+def linear_zero_curve(yield_data) -> ql.YieldTermStructure:
+    """
+    Bootstrap the par yields in NumPy and interpolate the zero rates linearly.
+    """
+
+    ref_date, dates, yields = yield_data
+    times, zero_rates = par_to_zero(_times(ref_date, dates), np.asarray(yields) / 100)
+    return _zero_curve(ref_date, times, zero_rates)
+
+
+def monotone_convex_curve(yield_data) -> ql.YieldTermStructure:
+    """
+    Bootstrap the par yields in NumPy and interpolate the zero rates with the
+    monotone convex method, sampled every quarter.
+    """
+
+    ref_date, dates, yields = yield_data
+    times, zero_rates = par_to_zero(_times(ref_date, dates), np.asarray(yields) / 100)
+    sample_times = _sample_times(times[-1])
+    return _zero_curve(
+        ref_date, sample_times, monotone_convex(times, zero_rates, sample_times)
+    )
+
+
+def _parametric_curve(yield_data, taus) -> ql.YieldTermStructure:
+    ref_date, dates, yields = yield_data
+    times = _times(ref_date, dates)
+    node_times, zero_rates = par_to_zero(times, np.asarray(yields) / 100)
+    # Fit the zero rates at the quoted maturities, equally weighted
+    zero_rates = np.interp(times, node_times, zero_rates)
+    taus = np.asarray(taus).reshape(len(taus), -1)
+    if len(times) < taus.shape[1] + 2:
+        # Too few quotes for the factors
+        return _zero_curve(ref_date, times, zero_rates)
+    betas, tau = fit_nelson_siegel(times, zero_rates, taus)
+    sample_times = _sample_times(times[-1])
+    return _zero_curve(ref_date, sample_times, nelson_siegel(sample_times, betas, tau))
+
+
+def nelson_siegel_curve(yield_data) -> ql.YieldTermStructure:
+    """
+    Fit a Nelson-Siegel curve to the zero rates bootstrapped in NumPy.
+    """
+
+    return _parametric_curve(yield_data, NELSON_SIEGEL_TAUS)
+
+
+def svensson_curve(yield_data) -> ql.YieldTermStructure:
+    """
+    Fit a Svensson curve to the zero rates bootstrapped in NumPy.
+    """
+
+    return _parametric_curve(yield_data, SVENSSON_TAUS)
+
+
+# The curve engines by name
+CURVE_ENGINES = {
+    "bootstrap": bootstrap_curve,
+    "linear_zero": linear_zero_curve,
+    "monotone_convex": monotone_convex_curve,
+    "nelson_siegel": nelson_siegel_curve,
+    "svensson": svensson_curve,
+}
+
+
+# The parametric engines, with whether they fit Svensson curves
+PARAMETRIC_ENGINES = {"nelson_siegel": False, "svensson": True}
+
+
+def get_curve_engine(name: str):
+    """
+    Return the curve engine called `name`, one of :data:`CURVE_ENGINES`.
+
+    :raises ValueError: If there is no such engine.
+    """
+
+    try:
+        return CURVE_ENGINES[name]
+    except KeyError:
+        names = ", ".join(CURVE_ENGINES)
+        raise ValueError(f"Unknown curve engine {name!r}, expected one of {names}")
+
+
+def benchmark_engines(yield_curve_model, engines=None, rows=None) -> dict:
+    """
+    Time the curve engines on the data of a yield curve model and compare their
+    curves with the bootstrap.
+
+    The errors are the differences from the bootstrap in the annually compounded
+    zero rates, in basis points, every month up to the longest maturity of each
+    date, up to a year ("short") and beyond ("long"). The bootstrap places its
+    pillars a number of business days after the reference date, rather than on
+    the maturity dates, which accounts for most of the short end errors.
+
+    :param yield_curve_model: The model holding the yield data.
+    :param engines: The names of the engines, all of them by default.
+    :param rows: The rows of the data to build curves for, all by default.
+    :return: Per engine, the mean time to build a curve in milliseconds, the
+        speed-up over the bootstrap and the largest and mean errors of the short
+        and long ends. Without any curve timed, e.g. if no date has yields, the
+        times and speed-ups are NaN.
+    :rtype: dict[str, dict[str, float]]
+    """
+
+    engines = list(CURVE_ENGINES if engines is None else engines)
+    if DEFAULT_ENGINE not in engines:
+        engines.insert(0, DEFAULT_ENGINE)
+    curve_engines = {name: get_curve_engine(name) for name in engines}
+    rows = range(yield_curve_model.rowCount()) if rows is None else rows
+    day_count = ql.ActualActual(ql.ActualActual.ISDA)
+
+    # Only the curves compared with the bootstrap are timed and counted
+    timings = dict.fromkeys(engines, 0.0)
+    n_curves = dict.fromkeys(engines, 0)
+    errors = {name: {"short": [], "long": []} for name in engines}
+    for row in rows:
+        yield_data = yield_curve_model.get_curve_inputs(row)
+        ref_date, dates, _ = yield_data
+        if not len(dates):
+            continue
+        ql_date = ql.Date(ref_date.day, ref_date.month, ref_date.year)
+        days = np.arange(30, (max(dates) - ref_date).days + 1, 30)
+        short = days <= 365
+        zero_rates, durations = {}, {}
+        for name, engine in curve_engines.items():
+            try:
+                start = time.perf_counter()
+                curve = engine(yield_data)
+                # The curves that are not frozen are built on first use
+                curve.discount(ql_date + 1)
+                durations[name] = time.perf_counter() - start
+                rates = np.array(
+                    [
+                        curve.zeroRate(
+                            ql_date + int(d), day_count, ql.Compounded, ql.Annual
+                        ).rate()
+                        for d in days
+                    ]
+                )
+            except RuntimeError:
+                rates = None
+            zero_rates[name] = rates
+        expected = zero_rates[DEFAULT_ENGINE]
+        if expected is None:
+            continue
+        for name, rates in zero_rates.items():
+            if rates is None:
+                continue
+            timings[name] += durations[name]
+            n_curves[name] += 1
+            error = 1e4 * np.abs(rates - expected)
+            errors[name]["short"].extend(error[short])
+            errors[name]["long"].extend(error[~short])
+
+    ms_per_curve = {
+        name: 1e3 * timings[name] / n_curves[name] if n_curves[name] else float("nan")
+        for name in engines
+    }
+    results = {}
+    for name in engines:
+        ms = ms_per_curve[name]
+        results[name] = {
+            "ms_per_curve": ms,
+            "speed_up": ms_per_curve[DEFAULT_ENGINE] / ms if ms else float("nan"),
+        }
+        for end, error in errors[name].items():
+            results[name][f"max_{end}_error_bp"] = max(error, default=float("nan"))
+            results[name][f"mean_{end}_error_bp"] = (
+                float(np.mean(error)) if error else float("nan")
+            )
+    return results
@@ -0,0 +1,98 @@
+"""
+Repricing gap and maturity ladder built from the cashflow ledger
+"""
+
+import numpy as np
+import QuantLib as ql
+
+from brms.models.cashflow_ledger import CashflowLedger, to_serial
+
+# Time bands as (label, upper bound as a period from the report date)
+TIME_BANDS: list[tuple[str, ql.Period | None]] = [
+    ("Overnight", ql.Period(1, ql.Days)),
+    ("1M", ql.Period(1, ql.Months)),
+    ("3M", ql.Period(3, ql.Months)),
+    ("6M", ql.Period(6, ql.Months)),
+    ("1Y", ql.Period(1, ql.Years)),
+    ("2Y", ql.Period(2, ql.Years)),
+    ("3Y", ql.Period(3, ql.Years)),
+    ("5Y", ql.Period(5, ql.Years)),
+    ("7Y", ql.Period(7, ql.Years)),
+    ("10Y", ql.Period(10, ql.Years)),
+    ("15Y", ql.Period(15, ql.Years)),
+    ("20Y", ql.Period(20, ql.Years)),
+    ("30Y", ql.Period(30, ql.Years)),
+    (">30Y", None),
+]
+
+
+class RepricingGapModel:
+    """
+    Bucket the principal and interest cashflows of all assets and liabilities
+    into time bands and compute the periodic and cumulative gaps.
+
+    The ledger is sorted by date, so bucketing is a `np.searchsorted` of the
+    remaining cashflow dates against the band edges of the report date.
+    Cash and demand deposits are repayable on demand and fall in the first band.
+    """
+
+    def __init__(self, bands=TIME_BANDS) -> None:
+        self.bands = bands
+        self._ledger = CashflowLedger()
+
+    def reset(self) -> None:
+        self._ledger = CashflowLedger()
+
+    def labels(self) -> list[str]:
+        return [label for label, _ in self.bands]
+
+    def set_ledger(self, ledger: CashflowLedger) -> None:
+        self._ledger = ledger
+
+    def band_edges(self, date: ql.Date) -> np.ndarray:
+        """
+        Return the inclusive upper bound of each band, except the last, as serials.
+        """
+
+        return np.array(
+            [(date + period).serialNumber() for _, period in self.bands[:-1]],
+            dtype=np.int64,
+        )
+
+    def calculate(self, date, cash=0.0, deposits=0.0) -> dict[str, np.ndarray]:
+        """
+        Calculate the maturity ladder on `date`.
+
+        :param date: The report date. Cashflows on or before it have been paid.
+        :param cash: The cash balance, placed in the first band as an asset.
+        :param deposits: The demand deposits, placed in the first band as a
+            liability.
+        :return: Arrays with one entry per band for "assets", "liabilities",
+            "gap" (assets less liabilities) and "cumulative_gap".
+        :rtype: dict[str, np.ndarray]
+        """
+
+        if not isinstance(date, ql.Date):
+            date = ql.Date(to_serial(date))
+        ledger = self._ledger
+        lo = np.searchsorted(ledger.dates, date.serialNumber(), side="right")
+        dates = ledger.dates[lo:]
+        amounts = ledger.amounts[lo:]
+        signs = ledger.signs[lo:]
+
+        n_bands = len(self.bands)
+        band = np.searchsorted(self.band_edges(date), dates, side="left")
+        assets = np.bincount(band, weights=amounts * (signs > 0), minlength=n_bands)
+        liabilities = np.bincount(
+            band, weights=amounts * (signs < 0), minlength=n_bands
+        )
+        assets[0] += cash
+        liabilities[0] += deposits
+
+        gap = assets - liabilities
+        return {
+            "assets": assets,
+            "liabilities": liabilities,
+            "gap": gap,
+            "cumulative_gap": np.cumsum(gap),
+        }
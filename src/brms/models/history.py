@@ -0,0 +1,118 @@
+"""
+Bounded history of simulation snapshots to step back and jump between dates
+"""
+
+import bisect
+import pickle
+from collections import deque
+
+from brms.models.checkpoint import capture_state, restore_state
+from brms.models.simulation import Simulation
+
+
+class SimulationHistory:
+    """
+    Periodic snapshots of a simulation, from which any earlier date is rebuilt by
+    restoring the nearest snapshot before it and replaying the days in between.
+
+    The first recorded state is pinned. Later snapshots are kept in a ring buffer
+    whose pickled size is capped at `max_bytes`; when full, the oldest ones are
+    evicted first, so dates before the oldest remaining snapshot are replayed
+    from the pinned state.
+    """
+
+    def __init__(self, interval=20, max_bytes=16 * 1024 * 1024) -> None:
+        """
+        :param interval: The number of days between snapshots.
+        :param max_bytes: The maximum total size of the snapshots besides the
+            pinned one.
+        """
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self._base: tuple[int, bytes] | None = None
+        # (index, pickled state) sorted by index
+        self._snapshots: deque[tuple[int, bytes]] = deque()
+        self._size = 0
+
+    def reset(self) -> None:
+        self._base = None
+        self._snapshots.clear()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._snapshots) + (self._base is not None)
+
+    def nbytes(self) -> int:
+        return self._size + (len(self._base[1]) if self._base else 0)
+
+    def first_index(self) -> int | None:
+        """
+        Return the index of the earliest date that can be restored.
+        """
+        return None if self._base is None else self._base[0]
+
+    def record(self, simulation: Simulation) -> None:
+        """
+        Snapshot the simulation if a snapshot is due on its current date.
+
+        Call this once the current date has been fully processed, so that the
+        snapshot includes the book values its views were last refreshed with.
+        """
+        index = simulation.current_index
+        if index < 0:
+            return
+        if self._base is None:
+            self._base = (index, self._dump(simulation))
+            return
+        if index <= self._base[0] or (index - self._base[0]) % self.interval:
+            return
+        indices = [i for i, _ in self._snapshots]
+        pos = bisect.bisect_left(indices, index)
+        if pos < len(indices) and indices[pos] == index:
+            return
+        snapshot = (index, self._dump(simulation))
+        self._snapshots.insert(pos, snapshot)
+        self._size += len(snapshot[1])
+        while self._size > self.max_bytes and self._snapshots:
+            _, evicted = self._snapshots.popleft()
+            self._size -= len(evicted)
+
+    def seek(self, simulation: Simulation, index: int) -> None:
+        """
+        Move the simulation to the date at `index`.
+
+        The nearest snapshot on or before `index` is restored and the remaining
+        days are replayed, settling their payments. The book values are then as
+        if the views had been refreshed on the day before `index`.
+
+        :raises ValueError: If `index` is before the first recorded date or
+            beyond the last simulation date.
+        """
+        if self._base is None or not self._base[0] <= index < len(simulation.dates()):
+            raise ValueError(f"Cannot move the simulation to index {index}")
+        start, state = max((s for s in self if s[0] <= index), key=lambda s: s[0])
+        # Replay from the current date if no snapshot is closer
+        if index < simulation.current_index or start > simulation.current_index:
+            restore_state(simulation, pickle.loads(state))
+        while simulation.current_index < index:
+            if simulation.current_index == index - 1:
+                self._aggregate(simulation)
+            # Only the last two dates are valued
+            simulation.step(reprice=simulation.current_index >= index - 2)
+
+    def __iter__(self):
+        if self._base is not None:
+            yield self._base
+        yield from self._snapshots
+
+    @staticmethod
+    def _dump(simulation: Simulation) -> bytes:
+        state = capture_state(simulation, full=False)
+        return pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _aggregate(simulation: Simulation) -> None:
+        bank = simulation.scenario.bank_model()
+        for book in (bank.banking_book, bank.trading_book):
+            book.assets_data()
+            book.liabilities_data()
@@ -0,0 +1,313 @@
+"""
+Struct-of-arrays storage of the bond-like positions of a book
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import QuantLib as ql
+
+from brms.models.instruments import AmortizingFixedRateLoan, BondLike
+from brms.models.valuation import BASE_CURVE, ScenarioCurves
+
+BANKING_BOOK = 0
+TRADING_BOOK = 1
+
+# The keys of the specs holding dates, stored as serial numbers
+_DATE_KEYS = frozenset({"issue_date", "maturity_date", "prepayment_start"})
+
+
+class Position:
+    """
+    A thin view of one row of an :class:`InstrumentStore`.
+
+    It offers the per-position interface of :class:`BondLike` instruments,
+    reading everything from the columns of the store.
+    """
+
+    __slots__ = ("store", "row")
+
+    def __init__(self, store: "InstrumentStore", row: int) -> None:
+        self.store = store
+        self.row = row
+
+    def __repr__(self) -> str:
+        return f"Position({self.instrument_class.__name__}, {self.name!r})"
+
+    @property
+    def instrument_class(self) -> type[BondLike]:
+        return self.store.type_of(self.row)
+
+    @property
+    def instrument_type(self) -> str:
+        return self.instrument_class.instrument_type
+
+    @property
+    def name(self) -> str:
+        return self.store.name_of(self.row)
+
+    @property
+    def sign(self) -> int:
+        return self.store.sign_of(self.row)
+
+    def spec(self) -> dict:
+        return self.store.spec_of(self.row)
+
+    def cashflows(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self.store.cashflows(self.row)
+
+    def notional(self, date: ql.Date) -> float:
+        return self.store.notional(self.row, date)
+
+    def npv(self, curve: str = BASE_CURVE) -> float:
+        return self.store.npv(self.row, curve)
+
+    def value_on_banking_book(self, date: ql.Date) -> float:
+        return self.notional(date)
+
+    def value_on_trading_book(self, date: ql.Date) -> float:
+        return self.npv()
+
+    def payments_between(self, start: ql.Date, end: ql.Date) -> list[float]:
+        return self.store.payments_between(self.row, start, end)
+
+    def payment_schedule(self):
+        return self.store.payment_schedule(self.row)
+
+    def materialize(self, curve: str = BASE_CURVE) -> ql.Bond:
+        return self.store.materialize(self.row, curve)
+
+
+class ScheduleCache:
+    """
+    Least-recently-used cache of the payment schedules of the rows of a store.
+    """
+
+    def __init__(self, max_entries: int | None = None) -> None:
+        """
+        :param max_entries: The maximum number of schedules kept, unbounded if None.
+        """
+        self.max_entries = max_entries
+        self._schedules: OrderedDict[int, object] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._schedules)
+
+    def get(self, row: int, build):
+        """
+        Return the schedule of `row`, calling `build()` to create it if missing.
+        """
+        try:
+            self._schedules.move_to_end(row)
+            return self._schedules[row]
+        except KeyError:
+            pass
+        schedule = self._schedules[row] = build()
+        if self.max_entries is not None:
+            while len(self._schedules) > self.max_entries:
+                self._schedules.popitem(last=False)
+        return schedule
+
+    def discard_from(self, row: int) -> None:
+        """
+        Forget the schedules of the rows from `row` on.
+        """
+        for key in [k for k in self._schedules if k >= row]:
+            del self._schedules[key]
+
+    def clear(self) -> None:
+        self._schedules.clear()
+
+
+class InstrumentStore:
+    """
+    Hold the bond-like positions of a book column-wise.
+
+    Each row is a position: its instrument class, name, spec and sign (+1 held,
+    -1 owed). The cashflows and the notional step functions of all rows are
+    concatenated into flat arrays indexed by per-row offsets. The spec of each
+    position, with its dates as serial numbers, is kept to rebuild its QuantLib
+    bond on demand.
+
+    Rows are appended as positions are added and the columns are rebuilt into
+    contiguous arrays on first read.
+    """
+
+    def __init__(self, max_schedules: int | None = None) -> None:
+        """
+        :param max_schedules: The maximum number of payment schedules cached,
+            unbounded if None.
+        """
+        self._curves: ScenarioCurves | None = None
+        self.schedules = ScheduleCache(max_schedules)
+        self.clear()
+
+    def clear(self) -> None:
+        self.schedules.clear()
+        self._types: list[type[BondLike]] = []
+        self._names: list[str] = []
+        self._specs: list[dict] = []
+        self.sign = np.empty(0, dtype=np.int8)
+        # The signs of the rows added since the columns were last built
+        self._signs: list[int] = []
+        self._cashflows: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self._notionals: list[tuple[np.ndarray, np.ndarray]] = []
+        self._frozen = False
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def set_curves(self, curves: ScenarioCurves) -> None:
+        """
+        Set the curves discounting the cashflows for the trading book value and
+        pricing the QuantLib bonds built by :meth:`materialize`.
+        """
+        self._curves = curves
+
+    def add(self, instrument: BondLike, sign=1) -> Position:
+        """
+        Append a position and return its view. The instrument is not retained.
+        """
+        cf_dates, cf_amounts, cf_is_coupon = instrument.cashflows()
+        self._types.append(type(instrument))
+        self._names.append(instrument.name)
+        self._specs.append(
+            {
+                key: value.serialNumber() if isinstance(value, ql.Date) else value
+                for key, value in instrument.spec().items()
+            }
+        )
+        self._signs.append(sign)
+        self._cashflows.append((cf_dates, cf_amounts, cf_is_coupon))
+        self._notionals.append((instrument._notional_dates, instrument._notionals))
+        self._frozen = False
+        return Position(self, len(self._specs) - 1)
+
+    def truncate(self, n_rows: int) -> None:
+        """
+        Remove the rows from `n_rows` on, whose views become invalid.
+        """
+        self._freeze()
+        self.sign = self.sign[:n_rows]
+        for rows in (
+            self._types,
+            self._names,
+            self._specs,
+            self._cashflows,
+            self._notionals,
+        ):
+            del rows[n_rows:]
+        self.schedules.discard_from(n_rows)
+        self._frozen = False
+
+    def _freeze(self) -> None:
+        if self._frozen:
+            return
+        self.sign = np.concatenate([self.sign, np.array(self._signs, dtype=np.int8)])
+        self._signs = []
+
+        def concatenate(chunks, dtype):
+            return (
+                np.concatenate(chunks).astype(dtype) if chunks else np.empty(0, dtype)
+            )
+
+        lengths = [len(dates) for dates, *_ in self._cashflows]
+        self.cf_offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        self.cf_dates = concatenate([c[0] for c in self._cashflows], np.int32)
+        self.cf_amounts = concatenate([c[1] for c in self._cashflows], np.float64)
+        self.cf_is_coupon = concatenate([c[2] for c in self._cashflows], bool)
+        lengths = [len(values) for _, values in self._notionals]
+        self.nt_offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        self.nt_dates = concatenate([n[0] for n in self._notionals], np.int32)
+        self.nt_values = concatenate([n[1] for n in self._notionals], np.float64)
+        # The per-row chunks now live in the flat arrays
+        self._cashflows = [
+            tuple(a[lo:hi] for a in (self.cf_dates, self.cf_amounts, self.cf_is_coupon))
+            for lo, hi in zip(self.cf_offsets[:-1], self.cf_offsets[1:])
+        ]
+        self._notionals = [
+            (self.nt_dates[lo - i : hi - i - 1], self.nt_values[lo:hi])
+            for i, (lo, hi) in enumerate(zip(self.nt_offsets[:-1], self.nt_offsets[1:]))
+        ]
+        self._frozen = True
+
+    def type_of(self, row: int) -> type[BondLike]:
+        return self._types[row]
+
+    def name_of(self, row: int) -> str:
+        return self._names[row]
+
+    def sign_of(self, row: int) -> int:
+        self._freeze()
+        return int(self.sign[row])
+
+    def spec_of(self, row: int) -> dict:
+        return {
+            key: ql.Date(value) if key in _DATE_KEYS and value is not None else value
+            for key, value in self._specs[row].items()
+        }
+
+    def cashflows(self, row: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return the serial dates, amounts and coupon flags of the cashflows of a row.
+        """
+        self._freeze()
+        return self._cashflows[row]
+
+    def notional(self, row: int, date: ql.Date) -> float:
+        """
+        Return the outstanding notional of a row on `date`, after any redemption on it.
+        """
+        self._freeze()
+        dates, values = self._notionals[row]
+        return float(values[np.searchsorted(dates, date.serialNumber(), side="right")])
+
+    def npv(self, row: int, curve: str = BASE_CURVE) -> float:
+        """
+        Return the present value of the cashflows of a row after the reference
+        date of the named discount curve, as the discounting bond engine would.
+        """
+        if self._curves is None or curve not in self._curves:
+            return self.materialize(row, curve).NPV()
+        curve = self._curves.handle(curve)
+        dates, amounts, _ = self.cashflows(row)
+        start = np.searchsorted(dates, curve.referenceDate().serialNumber(), "right")
+        npv = 0.0
+        for d, amount in zip(dates[start:], amounts[start:]):
+            npv += amount * curve.discount(ql.Date(int(d)))
+        return npv
+
+    def payments_between(self, row: int, start: ql.Date, end: ql.Date) -> list[float]:
+        """
+        Return the payments of a row falling in `(start, end]`, one per cashflow,
+        or one per instalment of interest and principal for amortizing loans.
+        """
+        dates, amounts, _ = self.cashflows(row)
+        lo, hi = np.searchsorted(
+            dates, [start.serialNumber(), end.serialNumber()], side="right"
+        )
+        payments = amounts[lo:hi].tolist()
+        if issubclass(self._types[row], AmortizingFixedRateLoan):
+            return [i + p for i, p in zip(payments[::2], payments[1::2])]
+        return payments
+
+    def payment_schedule(self, row: int):
+        """
+        Return the payment schedule of a row, see
+        :meth:`BondLike.build_payment_schedule`.
+        """
+        dates, amounts, _ = self.cashflows(row)
+        notional = float(self._notionals[row][1][0])
+        return self.schedules.get(
+            row,
+            lambda: self._types[row].build_payment_schedule(dates, amounts, notional),
+        )
+
+    def materialize(self, row: int, curve: str = BASE_CURVE) -> ql.Bond:
+        """
+        Build the QuantLib bond of a row, priced off the named curve if it is set.
+        """
+        bond = self._types[row].build_from_spec(self.spec_of(row))
+        if self._curves is not None and curve in self._curves:
+            bond.setPricingEngine(self._curves.pricing_engine(curve))
+        return bond
@@ -1,20 +1,17 @@
-from functools import cache
+import threading
 
+import numpy as np
 import QuantLib as ql
-from PySide6.QtCore import QObject, Signal
 
+from brms.models.price_yield import PriceYieldSweep, price_yield_sweep
+from brms.models.valuation import ValuationContext
 from brms.utils import qldate_to_string
 
 
-class Instrument(QObject):
-
-    payments_received = Signal(float)
-    payments_paid = Signal(float)
-    matured = Signal()
+class Instrument:
 
     def __init__(self, *args, **kwargs):
-        super().__init__()
-        self.instrument = None
+        pass
 
     @property
     def name(self):
@@ -26,6 +23,12 @@ class Instrument(QObject):
     def value_on_trading_book(self, date: ql.Date):
         raise NotImplementedError
 
+    def spec(self) -> dict:
+        """
+        Return the keyword arguments that rebuild the instrument in its current state.
+        """
+        raise NotImplementedError
+
 
 class Cash(Instrument):
 
@@ -51,6 +54,9 @@ class Cash(Instrument):
     def value_on_trading_book(self, date: ql.Date) -> float:
         return self.value()
 
+    def spec(self) -> dict:
+        return {"value": self._value, "name": self._name}
+
 
 class CommonEquity(Cash):
 
@@ -61,12 +67,144 @@ class CommonEquity(Cash):
 
 
 class BondLike(Instrument):
+    """
+    An instrument with a fixed schedule of interest and principal cashflows.
+
+    Only the spec of the instrument and its cashflows, as arrays, are kept. The
+    QuantLib bond is built on demand by :meth:`materialize`, e.g. for the
+    calculators, and released by the caller afterwards. Book values are
+    calculated from the arrays.
+    """
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self._pricing_engine: ql.PricingEngine | None = None
+        self._discount_curve: ql.YieldTermStructureHandle | None = None
+        # Cashflow serial dates, amounts and whether they are coupons
+        self._cf_dates = np.empty(0, dtype=np.int32)
+        self._cf_amounts = np.empty(0, dtype=np.float64)
+        self._cf_is_coupon = np.empty(0, dtype=bool)
+        # Outstanding notional, `_notionals[i]` applies from `_notional_dates[i-1]`
+        self._notional_dates = np.empty(0, dtype=np.int32)
+        self._notionals = np.zeros(1, dtype=np.float64)
+        self._payment_schedule = None
+
+    def build_instrument(self) -> ql.Bond:
+        """
+        Build the QuantLib bond described by the spec of the instrument.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def build_from_spec(cls, spec: dict) -> ql.Bond:
+        """
+        Build the QuantLib bond of the instrument `cls(**spec)`, without creating
+        the instrument, which would build the bond once more for its cashflows.
+        """
+        instrument = cls.__new__(cls)
+        vars(instrument).update(spec)
+        return instrument.build_instrument()
+
+    def materialize(self) -> ql.Bond:
+        """
+        Return a new QuantLib bond, priced by the pricing engine if one is set.
+        """
+        bond = self.build_instrument()
+        if self._pricing_engine is not None:
+            bond.setPricingEngine(self._pricing_engine)
+        return bond
+
+    def _set_cashflows(self, bond: ql.Bond) -> None:
+        cashflows = bond.cashflows()
+        self._cf_dates = np.array(
+            [cf.date().serialNumber() for cf in cashflows], dtype=np.int32
+        )
+        self._cf_amounts = np.array([cf.amount() for cf in cashflows])
+        # Redemptions are plain cashflows, not coupons
+        self._cf_is_coupon = np.array(
+            [ql.as_coupon(cf) is not None for cf in cashflows], dtype=bool
+        )
+        # The notional only changes on redemption dates
+        dates = np.unique(self._cf_dates[~self._cf_is_coupon])
+        self._notional_dates = dates
+        self._notionals = np.array(
+            [bond.notional(ql.Date(int(dates[0]) - 1))]
+            + [bond.notional(ql.Date(int(d))) for d in dates]
+        )
+        self._payment_schedule = None
+
+    def cashflows(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return the serial dates, amounts and coupon flags of the cashflows.
+        """
+        return self._cf_dates, self._cf_amounts, self._cf_is_coupon
+
+    @staticmethod
+    def build_payment_schedule(
+        cf_dates: np.ndarray, cf_amounts: np.ndarray, notional: float
+    ):
+        """
+        Build the payment schedule from the cashflows and the initial notional.
+        """
+        raise NotImplementedError
+
+    def payment_schedule(self):
+        """
+        Return the payment schedule, see :meth:`build_payment_schedule`.
+
+        It is kept with the instrument, so it is released along with it.
+        """
+        if self._payment_schedule is None:
+            self._payment_schedule = self.build_payment_schedule(
+                self._cf_dates, self._cf_amounts, float(self._notionals[0])
+            )
+        return self._payment_schedule
+
+    def payments_between(self, start: ql.Date, end: ql.Date) -> list[float]:
+        """
+        Return the payments falling in `(start, end]`, one per cashflow.
+        """
+        lo, hi = np.searchsorted(
+            self._cf_dates, [start.serialNumber(), end.serialNumber()], side="right"
+        )
+        return self._cf_amounts[lo:hi].tolist()
 
     def set_pricing_engine(self, engine: ql.PricingEngine):
-        self.instrument.setPricingEngine(engine)
+        self._pricing_engine = engine
+
+    def set_discount_curve(self, curve: ql.YieldTermStructureHandle):
+        """
+        Set the curve discounting the cashflows for the trading book value.
+        """
+        self._discount_curve = curve
+
+    def notional(self, date: ql.Date) -> float:
+        """
+        Return the outstanding notional on `date`, after any redemption on it.
+        """
+        i = np.searchsorted(self._notional_dates, date.serialNumber(), side="right")
+        return float(self._notionals[i])
+
+    def npv(self) -> float:
+        """
+        Return the present value of the cashflows after the reference date of
+        the discount curve, as the discounting bond engine would.
+        """
+        if self._discount_curve is None:
+            return self.materialize().NPV()
+        curve = self._discount_curve
+        reference_date = curve.referenceDate().serialNumber()
+        npv = 0.0
+        start = np.searchsorted(self._cf_dates, reference_date, side="right")
+        for d, amount in zip(self._cf_dates[start:], self._cf_amounts[start:]):
+            npv += amount * curve.discount(ql.Date(int(d)))
+        return npv
+
+    def value_on_banking_book(self, date: ql.Date):
+        return self.notional(date)
+
+    def value_on_trading_book(self, date: ql.Date):
+        return self.npv()
 
     def value(
         self,
@@ -91,31 +229,78 @@ class BondLike(Instrument):
             and accrued interest of the bond.
         """
 
+        bond = self.build_instrument()
         yield_curve = ql.FlatForward(
             reference_date,
             ql.QuoteHandle(ql.SimpleQuote(fixed_forward_rate)),
-            self.instrument.dayCounter(),
+            bond.dayCounter(),
             compounding,
             comp_frequency,
         )
-        bond_engine = ql.DiscountingBondEngine(ql.YieldTermStructureHandle(yield_curve))
+        return self.price(ValuationContext(reference_date, yield_curve), bond)
+
+    def price(self, context: ValuationContext, bond: ql.Bond | None = None):
+        """
+        Calculate the present value, clean price, dirty price, and accrued interest of
+        the bond on the date and curve of a valuation context.
 
-        self.instrument.setPricingEngine(bond_engine)
+        The date is passed to QuantLib explicitly instead of through its global
+        evaluation date, so that bonds can be priced on different dates at once.
 
-        # Just being cautious, restore previous evaluation date afterwards
-        old_evaluation_date = ql.Settings.instance().evaluationDate
+        Args:
+            context (ValuationContext): The valuation date and discount curve.
+            bond (ql.Bond, optional): The bond built by `build_instrument`, if
+                already built.
 
-        ql.Settings.instance().evaluationDate = reference_date
+        Returns:
+            Tuple[float, float, float, float]: The present value, clean price, dirty price,
+            and accrued interest of the bond.
+        """
 
-        npv = self.instrument.NPV()
-        clean_price = self.instrument.cleanPrice()
-        dirty_price = self.instrument.dirtyPrice()
-        accrued_interest = self.instrument.accruedAmount()
+        if bond is None:
+            bond = self.build_instrument()
+        reference_date, yield_curve = context.date, context.curve
+        settlement_date = bond.settlementDate(reference_date)
 
-        ql.Settings.instance().evaluationDate = old_evaluation_date
+        # As the discounting bond engine, without the flows on the reference date
+        npv = ql.CashFlows.npv(
+            bond.cashflows(), yield_curve, False, reference_date, reference_date
+        )
+        clean_price = ql.BondFunctions.cleanPrice(bond, yield_curve, settlement_date)
+        dirty_price = ql.BondFunctions.dirtyPrice(bond, yield_curve, settlement_date)
+        accrued_interest = ql.BondFunctions.accruedAmount(bond, settlement_date)
 
         return npv, clean_price, dirty_price, accrued_interest
 
+    def price_yield_sweep(
+        self,
+        valuation_dates: list[ql.Date],
+        fixed_forward_rates,
+        compounding: ql.Compounded | ql.Continuous,  # type: ignore
+        comp_frequency: ql.Period,
+    ) -> PriceYieldSweep:
+        """
+        Calculate the values of `value` for every valuation date and fixed forward
+        rate at once, with the duration and convexity of the bond.
+
+        Args:
+            valuation_dates (list[ql.Date]): The valuation dates.
+            fixed_forward_rates (array_like): The fixed forward rates used for discounting.
+            compounding (ql.Compounded | ql.Continuous): The compounding method.
+            comp_frequency (ql.Period): The compounding frequency.
+
+        Returns:
+            PriceYieldSweep: The values as arrays of (dates x rates).
+        """
+
+        return price_yield_sweep(
+            self.build_instrument(),
+            valuation_dates,
+            fixed_forward_rates,
+            compounding,
+            comp_frequency,
+        )
+
 
 class FixedRateBond(BondLike):
 
@@ -152,46 +337,69 @@ class FixedRateBond(BondLike):
             month_end (bool, optional): Whether the coupon dates should be adjusted to the end of the month. Defaults to False.
         """
         super().__init__()
+        self.face_value = face_value
+        self.coupon_rate = coupon_rate
+        self.issue_date = issue_date
+        self.maturity_date = maturity_date
+        self.frequency = frequency
+        self.settlement_days = settlement_days
+        self.calendar = InstrumentFactory.calendar(calendar)
+        self.day_count = InstrumentFactory.day_counter(day_count)
+        self.business_convention = business_convention
+        self.date_generation = date_generation
+        self.month_end = month_end
+
         maturity_date_str = qldate_to_string(maturity_date)
         self._name = f"{coupon_rate*100:.2f}% {maturity_date_str}"
 
-        coupons = [coupon_rate]
-        tenor = ql.Period(frequency)
-
-        schedule = ql.Schedule(
-            issue_date,
-            maturity_date,
-            tenor,
-            calendar,
-            business_convention,
-            business_convention,
-            date_generation,
-            month_end,
-        )
-
-        self.instrument = ql.FixedRateBond(
-            settlement_days, face_value, schedule, coupons, day_count
-        )
+        self._set_cashflows(self.build_instrument())
 
     @property
     def name(self):
         return self._name
 
-    def value_on_banking_book(self, date: ql.Date):
-        return self.instrument.notional(date)
+    def build_instrument(self) -> ql.FixedRateBond:
+        coupons = [self.coupon_rate]
+        schedule = InstrumentFactory.schedule(
+            self.issue_date,
+            self.maturity_date,
+            ql.Period(self.frequency),
+            self.calendar,
+            self.business_convention,
+            self.date_generation,
+            self.month_end,
+        )
 
-    def value_on_trading_book(self, date: ql.Date):
-        return self.instrument.NPV()
+        return ql.FixedRateBond(
+            self.settlement_days, self.face_value, schedule, coupons, self.day_count
+        )
 
-    @cache
-    def payment_schedule(self):
+    def spec(self) -> dict:
+        return {
+            "face_value": self.face_value,
+            "coupon_rate": self.coupon_rate,
+            "issue_date": self.issue_date,
+            "maturity_date": self.maturity_date,
+            "frequency": self.frequency,
+            "settlement_days": self.settlement_days,
+            "calendar": self.calendar,
+            "day_count": self.day_count,
+            "business_convention": self.business_convention,
+            "date_generation": self.date_generation,
+            "month_end": self.month_end,
+        }
+
+    @staticmethod
+    def build_payment_schedule(cf_dates, cf_amounts, notional):
         """
         Generates the payment schedule for a bond.
 
         Returns:
             list: A list of tuples representing the payment schedule. Each tuple contains the payment date and amount.
         """
-        return [(cf.date(), cf.amount()) for cf in self.instrument.cashflows()]
+        return [
+            (ql.Date(int(d)), float(amount)) for d, amount in zip(cf_dates, cf_amounts)
+        ]
 
 
 class TreasuryBill(Instrument):
@@ -229,6 +437,8 @@ class AmortizingFixedRateLoan(BondLike):
         calendar: ql.Calendar = ql.NullCalendar(),
         day_count: ql.DayCounter = ql.Thirty360(ql.Thirty360.BondBasis),
         business_convention=ql.Unadjusted,
+        prepayment_rate: float = 0.0,
+        prepayment_start: ql.Date | None = None,
     ):
         """
         Initializes an instance of the Instruments class.
@@ -242,38 +452,97 @@ class AmortizingFixedRateLoan(BondLike):
             calendar (ql.Calendar, optional): The calendar used for date calculations. Defaults to ql.NullCalendar().
             day_count (ql.DayCounter, optional): The day count convention used for interest calculations. Defaults to ql.Thirty360(ql.Thirty360.BondBasis).
             business_convention (int, optional): The business convention used for date adjustments. Defaults to ql.Unadjusted.
+            prepayment_rate (float, optional): The annual constant prepayment rate (CPR). Defaults to 0.
+            prepayment_start (ql.Date, optional): The date from which the loan prepays. Defaults to the issue date.
         """
         super().__init__()
+        self.face_value = face_value
+        self.interest_rate = interest_rate
+        self.issue_date = issue_date
+        self.maturity = maturity
+        self.frequency = frequency
+        self.settlement_days = settlement_days
+        self.calendar = InstrumentFactory.calendar(calendar)
+        self.day_count = InstrumentFactory.day_counter(day_count)
+        self.business_convention = business_convention
+        self.prepayment_rate = prepayment_rate
+        self.prepayment_start = prepayment_start
 
         maturity_date_str = qldate_to_string(issue_date + maturity)
         self._name = f"{interest_rate*100:.2f}% {maturity_date_str}"
 
-        coupons = [interest_rate]
-        schedule = ql.sinkingSchedule(issue_date, maturity, frequency, calendar)
-        notionals = ql.sinkingNotionals(maturity, frequency, interest_rate, face_value)
-
-        self.instrument = ql.AmortizingFixedRateBond(
-            settlement_days,
-            notionals,
-            schedule,
-            coupons,
-            day_count,
-            business_convention,
-            issue_date,
-        )
+        self._set_cashflows(self.build_instrument())
 
     @property
     def name(self):
         return self._name
 
-    def value_on_banking_book(self, date: ql.Date):
-        return self.instrument.notional(date)
+    def build_instrument(self) -> ql.AmortizingFixedRateBond:
+        coupons = [self.interest_rate]
+        schedule = InstrumentFactory.sinking_schedule(
+            self.issue_date, self.maturity, self.frequency, self.calendar
+        )
+        notionals = InstrumentFactory.sinking_notionals(
+            self.maturity, self.frequency, self.interest_rate, self.face_value
+        )
+        if self.prepayment_rate:
+            # With level payments recomputed on the prepaid balance, the outstanding
+            # balance is the scheduled one scaled by the survival factor.
+            smm = 1 - (1 - self.prepayment_rate) ** (1 / int(self.frequency))
+            start = self.prepayment_start or self.issue_date
+            prepaid = sum(1 for d in list(schedule)[1:] if d <= start)
+            notionals = [
+                n * (1 - smm) ** max(0, k - prepaid) for k, n in enumerate(notionals)
+            ]
+
+        return ql.AmortizingFixedRateBond(
+            self.settlement_days,
+            notionals,
+            schedule,
+            coupons,
+            self.day_count,
+            self.business_convention,
+            self.issue_date,
+        )
 
-    def value_on_trading_book(self, date: ql.Date):
-        return self.instrument.NPV()
+    def payments_between(self, start: ql.Date, end: ql.Date) -> list[float]:
+        """
+        Return the payments falling in `(start, end]`, one per instalment of
+        interest and principal.
+        """
+        payments = super().payments_between(start, end)
+        return [i + p for i, p in zip(payments[::2], payments[1::2])]
+
+    def spec(self) -> dict:
+        return {
+            "face_value": self.face_value,
+            "interest_rate": self.interest_rate,
+            "issue_date": self.issue_date,
+            "maturity": self.maturity,
+            "frequency": self.frequency,
+            "settlement_days": self.settlement_days,
+            "calendar": self.calendar,
+            "day_count": self.day_count,
+            "business_convention": self.business_convention,
+            "prepayment_rate": self.prepayment_rate,
+            "prepayment_start": self.prepayment_start,
+        }
+
+    def with_prepayment(
+        self, prepayment_rate: float, start: ql.Date | None = None
+    ) -> "AmortizingFixedRateLoan":
+        """
+        Return a copy of the loan that prepays at the given annual rate (CPR)
+        from `start` on.
+        """
+        spec = self.spec() | {
+            "prepayment_rate": prepayment_rate,
+            "prepayment_start": start,
+        }
+        return type(self)(**spec)
 
-    @cache
-    def payment_schedule(self):
+    @staticmethod
+    def build_payment_schedule(cf_dates, cf_amounts, notional):
         """
         Calculate the payment schedule for the instrument.
         Returns:
@@ -283,17 +552,17 @@ class AmortizingFixedRateLoan(BondLike):
                 - outstanding: A list of tuples representing the date and outstanding balance after each payment.
         """
 
-        loan = self.instrument
         interest_pmt = []
         principal_pmt = []
         outstanding = []
-        last_outstanding = loan.notional(loan.issueDate())
-        for i, cf in enumerate(loan.cashflows()):
+        last_outstanding = notional
+        for i, (d, amount) in enumerate(zip(cf_dates, cf_amounts)):
+            cf_date, amount = ql.Date(int(d)), float(amount)
             if i % 2 == 0:
-                interest_pmt.append((cf.date(), cf.amount()))
+                interest_pmt.append((cf_date, amount))
             else:
-                principal_pmt.append((cf.date(), cf.amount()))
-                outstanding.append((cf.date(), last_outstanding - cf.amount()))
+                principal_pmt.append((cf_date, amount))
+                outstanding.append((cf_date, last_outstanding - amount))
                 _, last_outstanding = outstanding[-1]
 
         return (interest_pmt, principal_pmt, outstanding)
@@ -352,6 +621,8 @@ class Mortgage(AmortizingFixedRateLoan):
         calendar: ql.Calendar = ql.NullCalendar(),
         day_count: ql.DayCounter = ql.Thirty360(ql.Thirty360.BondBasis),
         business_convention=ql.Unadjusted,
+        prepayment_rate: float = 0.0,
+        prepayment_start: ql.Date | None = None,
     ):
 
         super().__init__(
@@ -364,6 +635,8 @@ class Mortgage(AmortizingFixedRateLoan):
             calendar,
             day_count,
             business_convention,
+            prepayment_rate,
+            prepayment_start,
         )
 
 
@@ -398,6 +671,9 @@ class DemandDeposit(Instrument):
     def value_on_trading_book(self, date: ql.Date):
         return self.value()
 
+    def spec(self) -> dict:
+        return {"value": self._value}
+
 
 class TermDeposit(Instrument):
     pass
@@ -428,6 +704,140 @@ class TreasuryFutures(Instrument):
 
 
 class InstrumentFactory:
+    """
+    Create instruments.
+
+    The schedules, notionals, calendars and day counters of instruments are
+    interned: positions of the same contract shape share one instance, so
+    building and holding many positions scales with the number of distinct
+    shapes rather than with the number of positions. The least recently created
+    entries are evicted beyond :attr:`max_interned`. The interned entries are
+    guarded by a lock, as instruments may be created by several threads.
+    """
+
+    max_interned = 4096
+    _interned: dict[tuple, object] = {}
+    _interned_lock = threading.RLock()
+
+    @classmethod
+    def _intern(cls, key: tuple, build):
+        with cls._interned_lock:
+            try:
+                return cls._interned[key]
+            except KeyError:
+                pass
+            value = cls._interned[key] = build()
+            if len(cls._interned) > cls.max_interned:
+                del cls._interned[next(iter(cls._interned))]
+            return value
+
+    @classmethod
+    def clear_interned(cls) -> None:
+        with cls._interned_lock:
+            cls._interned.clear()
+
+    @classmethod
+    def calendar(cls, calendar: ql.Calendar) -> ql.Calendar:
+        """
+        Return the shared calendar of the same name as `calendar`.
+        """
+        return cls._intern(("calendar", calendar.name()), lambda: calendar)
+
+    @classmethod
+    def day_counter(cls, day_counter: ql.DayCounter) -> ql.DayCounter:
+        """
+        Return the shared day counter of the same name as `day_counter`.
+        """
+        return cls._intern(("day_counter", day_counter.name()), lambda: day_counter)
+
+    @classmethod
+    def schedule(
+        cls,
+        effective_date: ql.Date,
+        termination_date: ql.Date,
+        tenor: ql.Period,
+        calendar: ql.Calendar,
+        business_convention,
+        date_generation: ql.DateGeneration,
+        month_end: bool,
+    ) -> ql.Schedule:
+        """
+        Return the shared coupon schedule, adjusting both the coupon and the
+        termination dates with `business_convention`.
+        """
+        key = (
+            "schedule",
+            effective_date.serialNumber(),
+            termination_date.serialNumber(),
+            tenor.length(),
+            tenor.units(),
+            calendar.name(),
+            business_convention,
+            date_generation,
+            month_end,
+        )
+        return cls._intern(
+            key,
+            lambda: ql.Schedule(
+                effective_date,
+                termination_date,
+                tenor,
+                calendar,
+                business_convention,
+                business_convention,
+                date_generation,
+                month_end,
+            ),
+        )
+
+    @classmethod
+    def sinking_schedule(
+        cls,
+        start_date: ql.Date,
+        maturity: ql.Period,
+        frequency: ql.Period,
+        calendar: ql.Calendar,
+    ) -> ql.Schedule:
+        """
+        Return the shared schedule of a level-payment amortizing loan.
+        """
+        key = (
+            "sinking_schedule",
+            start_date.serialNumber(),
+            maturity.length(),
+            maturity.units(),
+            int(frequency),
+            calendar.name(),
+        )
+        return cls._intern(
+            key,
+            lambda: ql.sinkingSchedule(start_date, maturity, frequency, calendar),
+        )
+
+    @classmethod
+    def sinking_notionals(
+        cls,
+        maturity: ql.Period,
+        frequency: ql.Period,
+        rate: float,
+        face_value: float,
+    ) -> tuple[float, ...]:
+        """
+        Return the outstanding notionals of a level-payment amortizing loan, scaling
+        the shared notionals of a unit face value.
+        """
+        key = (
+            "sinking_notionals",
+            maturity.length(),
+            maturity.units(),
+            int(frequency),
+            rate,
+        )
+        notionals = cls._intern(
+            key,
+            lambda: tuple(ql.sinkingNotionals(maturity, frequency, rate, 1.0)),
+        )
+        return tuple(face_value * n for n in notionals)
 
     @staticmethod
     def create_demand_deposits(value: float):
@@ -539,6 +949,7 @@ class InstrumentFactory:
         calendar: ql.Calendar = ql.NullCalendar(),
         day_count: ql.DayCounter = ql.Thirty360(ql.Thirty360.BondBasis),
         business_convention=ql.Unadjusted,
+        prepayment_rate: float = 0.0,
     ) -> AmortizingFixedRateLoan:
 
         return AmortizingFixedRateLoan(
@@ -551,6 +962,7 @@ class InstrumentFactory:
             calendar,
             day_count,
             business_convention,
+            prepayment_rate,
         )
 
     @staticmethod
@@ -564,6 +976,7 @@ class InstrumentFactory:
         calendar: ql.Calendar = ql.NullCalendar(),
         day_count: ql.DayCounter = ql.Thirty360(ql.Thirty360.BondBasis),
         business_convention=ql.Unadjusted,
+        prepayment_rate: float = 0.0,
     ) -> Mortgage:
 
         return Mortgage(
@@ -576,6 +989,7 @@ class InstrumentFactory:
             calendar,
             day_count,
             business_convention,
+            prepayment_rate,
         )
 
     @staticmethod
@@ -0,0 +1,131 @@
+"""
+Forward liquidity projection and survival horizon
+"""
+
+import numpy as np
+
+from brms.models.cashflow_ledger import CashflowLedger, to_serial
+
+
+class LiquidityProjectionModel:
+    """
+    Project contractual inflows and outflows per day over a rolling window.
+
+    The daily flows are kept in fixed-size arrays covering the days after the
+    current date. Advancing the simulation shifts the window and only the days
+    that enter it are read from the ledger; the whole window is rebuilt only when
+    jumping backwards or further than its length.
+
+    Demand deposits run off at configurable rates: an `initial_run_off` fraction
+    is withdrawn on the first day and a `daily_run_off` fraction of the remaining
+    balance is withdrawn every day.
+    """
+
+    def __init__(
+        self, window=365, horizons=(30, 90, 365), initial_run_off=0.0, daily_run_off=0.0
+    ) -> None:
+        self.window = window
+        self.horizons = tuple(h for h in horizons if h <= window)
+        self.initial_run_off = initial_run_off
+        self.daily_run_off = daily_run_off
+        self._ledger = CashflowLedger()
+        # Serial of the first day in the window, i.e. the day after the current date
+        self._start: int | None = None
+        self._inflows = np.zeros(window)
+        self._outflows = np.zeros(window)
+
+    def reset(self) -> None:
+        self._ledger = CashflowLedger()
+        self._start = None
+        self._inflows[:] = 0.0
+        self._outflows[:] = 0.0
+
+    def set_ledger(self, ledger: CashflowLedger) -> None:
+        self._ledger = ledger
+        self._start = None
+
+    def _fill(self, first: int, last: int) -> None:
+        """
+        Read the ledger flows paid on serials `first` to `last` into the window.
+        """
+
+        ledger = self._ledger
+        lo = np.searchsorted(ledger.dates, first, side="left")
+        hi = np.searchsorted(ledger.dates, last, side="right")
+        offsets = ledger.dates[lo:hi] - first
+        inflows = ledger.amounts[lo:hi] * (ledger.signs[lo:hi] > 0)
+        outflows = ledger.amounts[lo:hi] * (ledger.signs[lo:hi] < 0)
+        n_days = last - first + 1
+        i = first - self._start
+        self._inflows[i : i + n_days] = np.bincount(offsets, inflows, n_days)
+        self._outflows[i : i + n_days] = np.bincount(offsets, outflows, n_days)
+
+    def advance_to(self, date) -> None:
+        """
+        Move the window so that it starts on the day after `date`.
+
+        :param date: The current simulation date.
+        """
+
+        start = to_serial(date) + 1
+        shift = None if self._start is None else start - self._start
+        if shift == 0:
+            return
+        if shift is not None and 0 < shift < self.window:
+            # Drop the days that have passed and read only the new ones
+            self._inflows[:-shift] = self._inflows[shift:]
+            self._outflows[:-shift] = self._outflows[shift:]
+            self._start = start
+            self._fill(start + self.window - shift, start + self.window - 1)
+        else:
+            self._start = start
+            self._fill(start, start + self.window - 1)
+
+    def deposit_run_off(self, deposits: float) -> np.ndarray:
+        """
+        Return the deposit withdrawals on each day of the window.
+        """
+
+        days = np.arange(self.window + 1)
+        remaining = deposits * (1 - self.daily_run_off) ** days
+        remaining[1:] *= 1 - self.initial_run_off
+        return remaining[:-1] - remaining[1:]
+
+    def calculate(self, cash: float, deposits: float) -> dict:
+        """
+        Calculate the projected cash position over the window.
+
+        :param cash: The current cash balance.
+        :param deposits: The current demand deposits.
+        :return: The daily "inflows", "outflows", "run_off" and "cumulative"
+            cash position arrays, the "survival_horizon" in days (None if cash
+            stays non-negative over the window) and a "summary" of
+            `(horizon, inflows, outflows, run_off, cumulative)` tuples.
+        :rtype: dict
+        """
+
+        run_off = self.deposit_run_off(deposits)
+        net = self._inflows - self._outflows - run_off
+        cumulative = cash + np.cumsum(net)
+        shortfall = np.flatnonzero(cumulative < 0)
+        survival_horizon = int(shortfall[0]) if len(shortfall) else None
+        if cash < 0:
+            survival_horizon = 0
+        summary = [
+            (
+                h,
+                float(np.sum(self._inflows[:h])),
+                float(np.sum(self._outflows[:h])),
+                float(np.sum(run_off[:h])),
+                float(cumulative[h - 1]),
+            )
+            for h in self.horizons
+        ]
+        return {
+            "inflows": self._inflows.copy(),
+            "outflows": self._outflows.copy(),
+            "run_off": run_off,
+            "cumulative": cumulative,
+            "survival_horizon": survival_horizon,
+            "summary": summary,
+        }
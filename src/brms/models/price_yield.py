@@ -0,0 +1,179 @@
+"""
+Price, duration and convexity of a bond over a grid of flat yields and dates
+
+:func:`price_yield_sweep` values the cashflows of a bond on every pair of a
+valuation date and a flat yield at once in NumPy, as :meth:`BondLike.value`
+does for one pair with a `FlatForward` curve and the discounting bond engine.
+Only the year fractions and the accrued amounts, one per cashflow and date, are
+left to QuantLib.
+"""
+
+import numpy as np
+import QuantLib as ql
+
+# Differences of year fractions below this are rounding errors of additive day
+# counts, see :func:`_discounted_sums`
+ADDITIVITY_TOLERANCE = 1e-12
+
+
+class PriceYieldSweep:
+    """
+    The outcome of :func:`price_yield_sweep`.
+
+    The values are arrays of (dates x yields). Prices are per 100 of the notional
+    outstanding on the settlement date, the duration is modified and both the
+    duration and the convexity are with respect to the flat yield. Values on
+    dates with no cashflow left are NaN.
+    """
+
+    def __init__(
+        self,
+        valuation_dates: list[ql.Date],
+        yields: np.ndarray,
+        npv: np.ndarray,
+        dirty_prices: np.ndarray,
+        accrued_interest: np.ndarray,
+        durations: np.ndarray,
+        convexities: np.ndarray,
+    ) -> None:
+        self.valuation_dates = valuation_dates
+        self.yields = yields
+        self.npv = npv
+        self.dirty_prices = dirty_prices
+        self.accrued_interest = accrued_interest
+        self.durations = durations
+        self.convexities = convexities
+
+    @property
+    def clean_prices(self) -> np.ndarray:
+        return self.dirty_prices - self.accrued_interest[:, None]
+
+
+def _continuous_rates(yields, compounding, comp_frequency) -> np.ndarray:
+    """
+    Return the continuously compounded rates equivalent to `yields`.
+    """
+    if compounding == ql.Continuous:
+        return yields
+    return comp_frequency * np.log1p(yields / comp_frequency)
+
+
+def _discounted_sums(rates, times, weights) -> np.ndarray:
+    """
+    Return the sums over cashflows `k` of `weights[i, m, k] * exp(-rates[j] *
+    times[i, k])` as an array of (measures m x dates i x rates j).
+
+    Year fractions are additive for most day counts, `times[i, k]` being the
+    years to cashflow `k` from the first date less the years to date `i`, so the
+    discount factors split into a factor per cashflow and one per date, and the
+    sums are a matrix product. The pairs of a date and a cashflow for which the
+    day count is not additive, e.g. 30/360 around the 31st, are corrected one by
+    one.
+    """
+
+    cf_times = times[0]
+    date_times = times[0, 0] - times[:, 0]
+    residuals = times - cf_times[None, :] + date_times[:, None]
+    by_cashflow = np.exp(-np.outer(rates, cf_times))
+    sums = weights.transpose(1, 0, 2) @ by_cashflow.T
+    rows, cols = np.nonzero(np.abs(residuals) > ADDITIVITY_TOLERANCE)
+    if len(rows):
+        corrections = by_cashflow[:, cols].T * np.expm1(
+            -np.outer(residuals[rows, cols], rates)
+        )
+        for m in range(weights.shape[1]):
+            np.add.at(sums[m], rows, weights[rows, m, cols][:, None] * corrections)
+    return sums * np.exp(np.outer(date_times, rates))
+
+
+def price_yield_sweep(
+    bond: ql.Bond,
+    valuation_dates: list[ql.Date],
+    yields,
+    compounding=ql.Compounded,
+    comp_frequency=ql.Annual,
+) -> PriceYieldSweep:
+    """
+    Value a bond on flat yield curves for every valuation date and yield.
+
+    As with :meth:`BondLike.value`, the curves are flat forward from the valuation
+    date in the day count of the bond. The NPV discounts the cashflows after the
+    valuation date to it, the prices those after the settlement date to it.
+
+    The duration and convexity are the derivatives of the dirty price along the
+    swept yields. They equal those of `ql.BondFunctions` for day counts such as
+    Actual/Actual, and differ slightly for 30/360 bonds settling between coupon
+    dates, as QuantLib counts the years from coupon to coupon.
+
+    :param bond: The QuantLib bond, see :meth:`BondLike.build_instrument`.
+    :param valuation_dates: The valuation dates.
+    :param yields: The flat yields, as decimals.
+    :param compounding: `ql.Compounded` or `ql.Continuous`.
+    :param comp_frequency: The compounding frequency if compounded.
+    :return: The NPV, prices, accrued interest, duration and convexity.
+    :rtype: PriceYieldSweep
+    """
+
+    yields = np.asarray(yields, dtype=np.float64)
+    day_count = bond.dayCounter()
+    cashflows = bond.cashflows()
+    cf_dates = [cf.date() for cf in cashflows]
+    cf_serials = np.array([d.serialNumber() for d in cf_dates])
+    amounts = np.array([cf.amount() for cf in cashflows])
+
+    n_dates = len(valuation_dates)
+    # Years from each valuation date to its settlement date and to every cashflow
+    times = np.empty((n_dates, len(cf_dates)))
+    settlement_times = np.empty(n_dates)
+    settlement_serials = np.empty(n_dates, dtype=np.int64)
+    notionals = np.empty(n_dates)
+    accrued_interest = np.empty(n_dates)
+    for i, date in enumerate(valuation_dates):
+        settlement_date = bond.settlementDate(date)
+        settlement_serials[i] = settlement_date.serialNumber()
+        settlement_times[i] = day_count.yearFraction(date, settlement_date)
+        times[i] = [day_count.yearFraction(date, d) for d in cf_dates]
+        if cf_serials[-1] > settlement_serials[i]:
+            notionals[i] = bond.notional(settlement_date)
+            accrued_interest[i] = ql.BondFunctions.accruedAmount(bond, settlement_date)
+        else:
+            # Not tradable any more
+            notionals[i] = accrued_interest[i] = np.nan
+    valuation_serials = np.array([d.serialNumber() for d in valuation_dates])
+
+    rates = _continuous_rates(yields, compounding, comp_frequency)
+    after_valuation = cf_serials[None, :] > valuation_serials[:, None]
+    after_settlement = cf_serials[None, :] > settlement_serials[:, None]
+    # Years from settlement, on which the duration and convexity are measured
+    tau = times - settlement_times[:, None]
+    flows = np.where(after_settlement, amounts, 0.0)
+    if compounding == ql.Continuous:
+        second_weights = tau**2
+    else:
+        second_weights = tau * (tau + 1 / comp_frequency)
+    weights = np.stack(
+        [amounts * after_valuation, flows, flows * tau, flows * second_weights], axis=1
+    )
+    npv, present_value, first, second = _discounted_sums(rates, times, weights)
+    to_settlement = np.exp(-rates[None, :] * settlement_times[:, None])
+    if compounding != ql.Continuous:
+        growth = 1 + yields[None, :] / comp_frequency
+        first = first / growth
+        second = second / growth**2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        durations = first / present_value
+        convexities = second / present_value
+        dirty_prices = 100 * present_value / to_settlement / notionals[:, None]
+    expired = ~after_settlement.any(axis=1)
+    for values in (npv, dirty_prices, durations, convexities):
+        values[expired] = np.nan
+
+    return PriceYieldSweep(
+        list(valuation_dates),
+        yields,
+        npv,
+        dirty_prices,
+        accrued_interest,
+        durations,
+        convexities,
+    )
@@ -0,0 +1,82 @@
+"""
+The Qt base classes of the models, or plain Python stand-ins when headless
+
+The models only use Qt for signals and for the table interface of the yield
+curve model. With the environment variable `BRMS_HEADLESS=1` set before the
+models are imported, they run without importing PySide6, e.g. in batch jobs.
+"""
+
+import os
+
+HEADLESS = os.environ.get("BRMS_HEADLESS", "0") not in ("", "0")
+
+if not HEADLESS:
+    from PySide6.QtCore import QAbstractTableModel, QModelIndex, QObject, Qt, Signal
+
+else:
+
+    class _BoundSignal:
+        """
+        The signal of one object: a list of slots called in order on emit.
+        """
+
+        __slots__ = ("_slots",)
+
+        def __init__(self) -> None:
+            self._slots = []
+
+        def connect(self, slot) -> None:
+            self._slots.append(slot)
+
+        def disconnect(self, slot=None) -> None:
+            if slot is None:
+                self._slots.clear()
+            else:
+                self._slots.remove(slot)
+
+        def emit(self, *args) -> None:
+            for slot in list(self._slots):
+                slot(*args)
+
+    class Signal:
+        """
+        Stand-in for the Qt signal, connected and emitted synchronously.
+        """
+
+        def __init__(self, *types) -> None:
+            self.types = types
+
+        def __set_name__(self, owner, name) -> None:
+            self.name = f"_signal_{name}"
+
+        def __get__(self, instance, owner=None):
+            if instance is None:
+                return self
+            try:
+                return instance.__dict__[self.name]
+            except KeyError:
+                signal = instance.__dict__[self.name] = _BoundSignal()
+                return signal
+
+    class QObject:
+        def __init__(self, parent=None) -> None:
+            self._parent = parent
+
+        def parent(self):
+            return self._parent
+
+    class QModelIndex:
+        def isValid(self) -> bool:
+            return False
+
+    class QAbstractTableModel(QObject):
+        def beginResetModel(self) -> None:
+            pass
+
+        def endResetModel(self) -> None:
+            pass
+
+    class Qt:
+        DisplayRole = 0
+        Horizontal = 1
+        Vertical = 2
@@ -0,0 +1,235 @@
+"""
+Sinks persisting the results of every simulation date
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+
+from brms.models.simulation import Simulation
+from brms.utils import qldate_to_pydate
+
+# The tables written and their columns
+RESULTS_TABLES = {
+    "balance_sheet": ("date", "book", "side", "item", "value"),
+    "metrics": ("date", "metric", "value"),
+}
+
+
+class ResultsSink:
+    """
+    Base class of the destinations of simulation results.
+
+    :meth:`write` receives batches of rows, one list of dicts per table of
+    :data:`RESULTS_TABLES`. It may be called from a thread other than the one
+    that created the sink, but never concurrently.
+    """
+
+    def write(self, batch: dict[str, list[dict]]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteResultsSink(ResultsSink):
+    """
+    Append results to tables of a SQLite database.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connect on first write, in the thread that writes
+        connection = sqlite3.connect(self.file_path)
+        for table, columns in RESULTS_TABLES.items():
+            definition = ", ".join(
+                f"{c} REAL" if c == "value" else f"{c} TEXT" for c in columns
+            )
+            connection.execute(f"CREATE TABLE IF NOT EXISTS {table} ({definition})")
+        return connection
+
+    def write(self, batch: dict[str, list[dict]]) -> None:
+        if self._connection is None:
+            self._connection = self._connect()
+        with self._connection:
+            for table, rows in batch.items():
+                columns = RESULTS_TABLES[table]
+                placeholders = ", ".join("?" for _ in columns)
+                self._connection.executemany(
+                    f"INSERT INTO {table} VALUES ({placeholders})",
+                    (
+                        [str(r[c]) if c == "date" else r[c] for c in columns]
+                        for r in rows
+                    ),
+                )
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class ParquetResultsSink(ResultsSink):
+    """
+    Append results as row groups of one Parquet file per table in a directory.
+
+    Requires `pyarrow`.
+    """
+
+    def __init__(self, directory: str) -> None:
+        import pyarrow as pa
+
+        self.directory = directory
+        types = {"date": pa.date32(), "value": pa.float64()}
+        self._schemas = {
+            table: pa.schema([(c, types.get(c, pa.string())) for c in columns])
+            for table, columns in RESULTS_TABLES.items()
+        }
+        self._writers = {}
+
+    def write(self, batch: dict[str, list[dict]]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        for table, rows in batch.items():
+            if not rows:
+                continue
+            if table not in self._writers:
+                os.makedirs(self.directory, exist_ok=True)
+                path = os.path.join(self.directory, f"{table}.parquet")
+                self._writers[table] = pq.ParquetWriter(path, self._schemas[table])
+            self._writers[table].write_table(
+                pa.Table.from_pylist(rows, schema=self._schemas[table])
+            )
+
+    def close(self) -> None:
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+
+def create_results_sink(file_path: str) -> ResultsSink:
+    """
+    Return the sink for `file_path`: Parquet files in a directory if it ends with
+    ".parquet", a SQLite database otherwise.
+    """
+    if file_path.endswith(".parquet"):
+        return ParquetResultsSink(file_path)
+    return SQLiteResultsSink(file_path)
+
+
+class ResultsWriter:
+    """
+    Buffer results and write them to a sink in batches on a background thread.
+
+    :meth:`append` only adds to an in-memory buffer and hands full batches to
+    the writer thread, so the simulation never waits for the disk.
+    """
+
+    def __init__(self, sink: ResultsSink, batch_size=250) -> None:
+        """
+        :param sink: Where the results are written.
+        :param batch_size: The number of dates buffered per write.
+        """
+        self.sink = sink
+        self.batch_size = batch_size
+        self._buffer = {table: [] for table in RESULTS_TABLES}
+        self._n_buffered = 0
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while (batch := self._queue.get()) is not None:
+            if self._error is not None:
+                continue
+            try:
+                self.sink.write(batch)
+            except Exception as e:
+                self._error = e
+        try:
+            self.sink.close()
+        except Exception as e:
+            self._error = self._error or e
+
+    def append(self, results: dict[str, list[dict]]) -> None:
+        """
+        Add the results of a date, see :func:`collect_results`.
+        """
+        for table, rows in results.items():
+            self._buffer[table].extend(rows)
+        self._n_buffered += 1
+        if self._n_buffered >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Hand the buffered results to the writer thread.
+        """
+        if self._n_buffered:
+            self._queue.put(self._buffer)
+            self._buffer = {table: [] for table in RESULTS_TABLES}
+            self._n_buffered = 0
+
+    def close(self) -> None:
+        """
+        Write the remaining results, wait for the writer thread and close the sink.
+
+        :raises Exception: The first error raised by the sink, if any.
+        """
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+
+def collect_results(simulation: Simulation, metrics: dict[str, float] = None):
+    """
+    Return the results of the current date of a simulation.
+
+    The book values are the ones last aggregated, i.e. as displayed in the bank
+    books or returned by :meth:`Simulation.results`.
+
+    :param simulation: The simulation.
+    :param metrics: Additional metrics of the date, e.g. risk measures.
+    :return: The rows of every table in :data:`RESULTS_TABLES`.
+    :rtype: dict[str, list[dict]]
+    """
+    date = qldate_to_pydate(simulation.current_date)
+    bank = simulation.scenario.bank_model()
+    balance_sheet = []
+    for book_name, book in (
+        ("banking_book", bank.banking_book),
+        ("trading_book", bank.trading_book),
+    ):
+        for side, data in zip(("assets", "liabilities"), book.aggregation_state()):
+            balance_sheet.extend(
+                {
+                    "date": date,
+                    "book": book_name,
+                    "side": side,
+                    "item": group["data"][0],
+                    "value": float(group["data"][1]),
+                }
+                for group in data
+            )
+    values = {
+        "cash": float(bank.banking_book.get_cash()),
+        "payments_received": simulation.payments_received,
+        "payments_paid": simulation.payments_paid,
+        **(metrics or {}),
+    }
+    return {
+        "balance_sheet": balance_sheet,
+        "metrics": [
+            {"date": date, "metric": metric, "value": value}
+            for metric, value in values.items()
+            if value is not None
+        ],
+    }
@@ -0,0 +1,108 @@
+"""
+Loading of a scenario file on a worker thread
+"""
+
+import threading
+
+from brms.models.qt import QObject, Signal
+from brms.models.scenario_model import ScenarioModel
+
+
+class ScenarioLoader(QObject):
+    """
+    Read and validate a scenario file on a worker thread.
+
+    The worker only reads the file with pandas, no QuantLib object is built on
+    it. It emits the accepted rows of positions in batches through
+    :attr:`positions_read`, for the thread owning the books to build their
+    instruments, see :meth:`ScenarioModel.build_position`, and add them to the
+    books, refreshing the views incrementally. The meta data and the yield curve
+    are loaded by the owning thread once :attr:`validated` is emitted.
+
+    Signals are emitted in this order: `validated`, then `progress` and
+    `positions_read` while rows are read, then `finished`.
+    """
+
+    # Whether the file can be loaded
+    validated = Signal(bool)
+    # The sheet being loaded, the number of rows built and the total number of rows
+    progress = Signal(str, int, int)
+    # The sheet and a batch of its accepted rows, as pairs of index label and row
+    positions_read = Signal(str, list)
+    # Whether all rows were read, i.e. loading neither failed nor was cancelled
+    finished = Signal(bool)
+
+    def __init__(self, scenario: ScenarioModel, batch_size=20, parent=None) -> None:
+        """
+        :param scenario: The scenario to load the file into.
+        :param batch_size: The number of rows emitted at a time.
+        """
+        super().__init__(parent)
+        self.scenario = scenario
+        self.batch_size = batch_size
+        self._cancelled = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self, file_path: str) -> None:
+        """
+        Start loading `file_path`. The scenario should have been reset.
+
+        :raises RuntimeError: If a file is already being loaded.
+        """
+        if self.is_running():
+            raise RuntimeError("A scenario is already being loaded")
+        self._cancelled.clear()
+        self._thread = threading.Thread(target=self._run, args=(file_path,))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def cancel(self) -> None:
+        """
+        Stop reading rows. `finished` is still emitted, with False.
+        """
+        self._cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def wait(self, timeout: float | None = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self, file_path: str) -> None:
+        scenario = self.scenario
+        self.progress.emit("Reading scenario", 0, 0)
+        valid = scenario.read_scenario_file(file_path)
+        self.validated.emit(valid)
+        if not valid:
+            self.finished.emit(False)
+            return
+
+        sheets = [
+            sheet
+            for sheet in scenario.POSITION_SHEETS
+            if sheet in scenario.validation_report.sheets
+        ]
+        total = sum(len(scenario.validation_report.sheets[s]) for s in sheets)
+        done = 0
+        for sheet in sheets:
+            self.progress.emit(sheet, done, total)
+            batch = []
+            for i, index, row in scenario.position_rows(sheet):
+                if self._cancelled.is_set():
+                    break
+                batch.append((index, row))
+                if len(batch) >= self.batch_size:
+                    self.positions_read.emit(sheet, batch)
+                    self.progress.emit(sheet, done + i + 1, total)
+                    batch = []
+            if self._cancelled.is_set():
+                break
+            if batch:
+                self.positions_read.emit(sheet, batch)
+            done += len(scenario.validation_report.sheets[sheet])
+            self.progress.emit(sheet, done, total)
+        self.finished.emit(not self._cancelled.is_set())
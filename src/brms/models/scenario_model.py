@@ -1,17 +1,38 @@
 import os
 
-import pandas as pd
 import QuantLib as ql
-from PySide6.QtCore import QObject, Signal
 
 from brms.models.bank_model import BankModel
-from brms.models.instruments import InstrumentFactory
+from brms.models.cashflow_ledger import CashflowLedger
+from brms.models.curve_engines import DEFAULT_ENGINE
+from brms.models.instruments import Instrument, InstrumentFactory
+from brms.models.qt import QObject, Signal
+from brms.models.scenario_validation import (
+    CURVE_ENGINE_ITEM,
+    ValidationReport,
+    read_scenario_sheets,
+    validate_scenario,
+)
+from brms.models.valuation import ScenarioCurves
 from brms.models.yield_curve_model import YieldCurveModel
 from brms.utils import pydate_to_qldate, qldate_to_string
 
 
 class ScenarioModel(QObject):
 
+    # The sheets of positions, with the method building an instrument from a row,
+    # the book holding it and whether it is held (True) or owed (False)
+    # fmt: off
+    POSITION_SHEETS = {
+        "Mortgages": ("_mortgage_from_row", "banking_book", True),
+        "C&I Loans": ("_ci_loan_from_row", "banking_book", True),
+        "Treasury Notes (Long)": ("_treasury_note_from_row", "trading_book", True),
+        "Treasury Notes (Short)": ("_treasury_note_from_row", "trading_book", False),
+        "Treasury Bonds (Long)": ("_treasury_bond_from_row", "trading_book", True),
+        "Treasury Bonds (Short)": ("_treasury_bond_from_row", "trading_book", False),
+    }
+    # fmt: on
+
     def __init__(self, parent: QObject | None = None) -> None:
         super().__init__(parent)
 
@@ -19,9 +40,18 @@ class ScenarioModel(QObject):
         self._dates_in_simulation: list[ql.Date] = []
         self.bank = BankModel()
         self.yield_curve = YieldCurveModel()
-        # Create the pricing engine
-        self.relinkable_handle = ql.RelinkableYieldTermStructureHandle()
-        self.bond_pricing_engine = ql.DiscountingBondEngine(self.relinkable_handle)
+        self.cashflow_ledger = CashflowLedger()
+        # The outcome of the checks of the last loaded scenario file
+        self.validation_report = ValidationReport()
+        # The base yield curve of the current date and any shocked curves, each
+        # with its own handle and pricing engine
+        self.curves = ScenarioCurves()
+        # Bond-like positions are priced off the scenario yield curves and settle
+        # their payments in cash
+        for book in (self.bank.banking_book, self.bank.trading_book):
+            book.store.set_curves(self.curves)
+            book.payment_received.connect(self.on_payments_received)
+            book.payment_paid.connect(self.on_payments_paid)
 
     def reset(self) -> None:
         """
@@ -29,6 +59,11 @@ class ScenarioModel(QObject):
         """
 
         self._scenario_file_path = ""
+        self.cashflow_ledger = CashflowLedger()
+        self.validation_report = ValidationReport()
+
+    def file_path(self) -> str:
+        return self._scenario_file_path
 
     def bank_model(self) -> BankModel:
         """
@@ -82,20 +117,50 @@ class ScenarioModel(QObject):
         cash = self.bank_model().banking_book.get_cash()
         self.bank_model().banking_book.set_cash(cash - payment)
 
+    def set_yield_data(self, yield_data: dict) -> None:
+        """
+        Set the yield data of the scenario, whose reference dates are the
+        dates in the simulation.
+
+        :param yield_data: The yield data, see
+            :meth:`YieldCurveModel.update_yield_data`.
+        """
+
+        self.yield_curve_model().update_yield_data(yield_data)
+        self._update_dates_in_simulation()
+
+    def set_yield_history(self, dates, maturities, yields) -> None:
+        """
+        Set the yield data of the scenario as an array, see
+        :meth:`YieldCurveModel.set_yield_history`.
+        """
+
+        self.yield_curve_model().set_yield_history(dates, maturities, yields)
+        self._update_dates_in_simulation()
+
+    def _update_dates_in_simulation(self) -> None:
+        self._dates_in_simulation = [
+            pydate_to_qldate(date)
+            for date in self.yield_curve_model().reference_dates()
+        ]
+
     def load_scenario(self, file_path: str) -> bool:
         """
         Load a scenario from the given file path.
 
+        The sheets are validated first, see :func:`validate_scenario`. Rows failing
+        a check are skipped and listed, with those the instruments cannot be built
+        from, in `self.validation_report`.
+
         :param file_path: The path to the scenario file.
         :type file_path: str
         :return: True if the scenario is loaded successfully, False otherwise.
         :rtype: bool
         """
 
-        if not os.path.exists(file_path):
+        if not self.read_scenario_file(file_path):
             return False
-        self._scenario_file_path = file_path
-        return all(
+        loaded = all(
             [
                 self.load_meta(),
                 self.load_yield_curve(),
@@ -107,6 +172,39 @@ class ScenarioModel(QObject):
                 self.load_treasury_bonds(long_position=False),
             ]
         )
+        self.build_cashflow_ledger()
+        return loaded
+
+    def read_scenario_file(self, file_path: str) -> bool:
+        """
+        Read and validate all sheets of a scenario file, without building anything.
+
+        :param file_path: The path to the scenario file.
+        :type file_path: str
+        :return: True if the scenario can be loaded, False otherwise.
+        :rtype: bool
+        """
+
+        self.validation_report = ValidationReport()
+        if not os.path.exists(file_path):
+            self.validation_report.errors.append(f"No such file: {file_path}")
+            return False
+        self._scenario_file_path = file_path
+        try:
+            sheets = read_scenario_sheets(file_path)
+        except Exception as e:
+            self.validation_report.errors.append(f"Cannot read the file: {e}")
+            return False
+        self.validation_report = validate_scenario(sheets)
+        return self.validation_report.ok
+
+    def build_cashflow_ledger(self) -> None:
+        """
+        Collect the cashflows of all loaded instruments into the cashflow ledger.
+        """
+
+        # Instruments are fixed once loaded, so their cashflows are collected once
+        self.cashflow_ledger = CashflowLedger.from_bank(self.bank)
 
     def load_meta(self) -> bool:
         """
@@ -116,10 +214,8 @@ class ScenarioModel(QObject):
         :rtype: bool
         """
 
-        _file_path = self._scenario_file_path
-        try:
-            df = pd.read_excel(_file_path, sheet_name="Meta", header=None)
-        except Exception:
+        df = self.validation_report.sheets.get("Meta")
+        if df is None:
             return False
 
         df.columns = ["item", "value"]
@@ -128,6 +224,11 @@ class ScenarioModel(QObject):
             self.bank.add_cash(cash_value)
             deposits_value = df.loc[df["item"] == "Demand deposits", "value"].values[0]
             self.bank.add_demand_deposits(deposits_value)
+            # Optional, the bootstrap by default
+            engine = df.loc[df["item"] == CURVE_ENGINE_ITEM, "value"].values
+            self.yield_curve.set_curve_engine(
+                str(engine[0]).strip() if len(engine) else DEFAULT_ENGINE
+            )
         except Exception:
             return False
 
@@ -143,23 +244,13 @@ class ScenarioModel(QObject):
         :rtype: bool
         """
 
-        _file_path = self._scenario_file_path
-        try:
-            df = pd.read_excel(_file_path, sheet_name="Yield Curve", index_col="Date")
-        except Exception:
+        df = self.validation_report.sheets.get("Yield Curve")
+        if df is None:
             return False
-        # A dict where key is reference date, value is a list of (maturity, rate)
-        yield_data = {
-            row.name: [(mat, rate) for mat, rate in zip(row.index, row.to_list())]
-            for _, row in df.iterrows()
-        }
-        self.yield_curve_model().update_yield_data(yield_data)
-
-        # TODO: Should this be here?
-        self._dates_in_simulation = [
-            pydate_to_qldate(date)
-            for date in self.yield_curve_model().reference_dates()
-        ]
+        quotes = df.drop(columns="Date")
+        self.set_yield_history(
+            list(df["Date"]), list(quotes.columns), quotes.to_numpy(dtype=float)
+        )
 
         return True
 
@@ -174,46 +265,7 @@ class ScenarioModel(QObject):
         :rtype: bool
         """
 
-        try:
-            df = pd.read_excel(self._scenario_file_path, sheet_name="Mortgages")
-        except Exception:
-            return False
-
-        settlement_days = 0
-        calendar_ql = ql.NullCalendar()
-        day_count = ql.ActualActual(ql.ActualActual.ISDA)
-        business_convention = ql.Following
-
-        for _, row in df.iterrows():
-            principal = row["principal"]
-            annual_rate = row["interest_rate"]
-            start_date = pydate_to_qldate(row["issue_date"])
-            maturity = ql.Period(row["maturity_years"], ql.Years)
-            match row["payment_frequency"]:
-                case "quarterly" | "Quarterly":
-                    payment_frequency = ql.Quarterly
-                case _:
-                    payment_frequency = ql.Monthly
-            try:
-                mortgage = InstrumentFactory.create_fixed_rate_mortgage(
-                    principal,
-                    annual_rate,
-                    start_date,
-                    maturity,
-                    payment_frequency,
-                    settlement_days,
-                    calendar_ql,
-                    day_count,
-                    business_convention,
-                )
-            except Exception:
-                continue
-            mortgage.set_pricing_engine(self.bond_pricing_engine)
-            mortgage.payments_paid.connect(self.on_payments_paid)
-            mortgage.payments_received.connect(self.on_payments_received)
-            self.bank_model().banking_book.add_asset(mortgage, emit_signal=False)
-
-        return True
+        return self.load_positions("Mortgages")
 
     def load_ci_loans(self) -> bool:
         """
@@ -226,48 +278,7 @@ class ScenarioModel(QObject):
         :rtype: bool
         """
 
-        try:
-            df = pd.read_excel(self._scenario_file_path, sheet_name="C&I Loans")
-        except Exception:
-            return False
-
-        settlement_days = 0
-        calendar_ql = ql.NullCalendar()
-        day_count = ql.ActualActual(ql.ActualActual.ISDA)
-        business_convention = ql.Following
-        date_generation = ql.DateGeneration.Backward
-
-        for _, row in df.iterrows():
-            principal = row["principal"]
-            annual_rate = row["interest_rate"]
-            issue_date = pydate_to_qldate(row["issue_date"])
-            maturity_date = pydate_to_qldate(row["maturity_date"])
-            match row["payment_frequency"]:
-                case "quarterly" | "Quarterly":
-                    payment_frequency = ql.Quarterly
-                case _:
-                    payment_frequency = ql.Monthly
-            try:
-                loan = InstrumentFactory.create_ci_loan(
-                    principal,
-                    annual_rate,
-                    issue_date,
-                    maturity_date,
-                    payment_frequency,
-                    settlement_days,
-                    calendar_ql,
-                    day_count,
-                    business_convention,
-                    date_generation,
-                )
-            except Exception:
-                continue
-            loan.set_pricing_engine(self.bond_pricing_engine)
-            loan.payments_paid.connect(self.on_payments_paid)
-            loan.payments_received.connect(self.on_payments_received)
-            self.bank_model().banking_book.add_asset(loan, emit_signal=False)
-
-        return True
+        return self.load_positions("C&I Loans")
 
     def load_treasury_notes(self, long_position=True) -> bool:
         """
@@ -279,50 +290,9 @@ class ScenarioModel(QObject):
         :rtype: bool
         """
 
-        sheet_name = f"Treasury Notes ({'Long' if long_position else 'Short'})"
-        try:
-            df = pd.read_excel(self._scenario_file_path, sheet_name=sheet_name)
-        except Exception:
-            return False
-
-        settlement_days = 0
-        calendar_ql = ql.NullCalendar()
-        day_count = ql.ActualActual(ql.ActualActual.ISDA)
-        business_convention = ql.Following
-        date_generation = ql.DateGeneration.Backward
-
-        for _, row in df.iterrows():
-            principal = row["principal"]
-            annual_rate = row["interest_rate"]
-            issue_date = pydate_to_qldate(row["issue_date"])
-            maturity_date = pydate_to_qldate(row["maturity_date"])
-            payment_frequency = ql.Semiannual
-            try:
-                tn = InstrumentFactory.create_treasury_note(
-                    principal,
-                    annual_rate,
-                    issue_date,
-                    maturity_date,
-                    payment_frequency,
-                    settlement_days,
-                    calendar_ql,
-                    day_count,
-                    business_convention,
-                    date_generation,
-                )
-            except Exception:
-                continue
-            tn.set_pricing_engine(self.bond_pricing_engine)
-            if long_position:
-                tn.payments_paid.connect(self.on_payments_paid)
-                tn.payments_received.connect(self.on_payments_received)
-                self.bank_model().trading_book.add_asset(tn, emit_signal=False)
-            else:
-                tn.payments_paid.connect(self.on_payments_received)
-                tn.payments_received.connect(self.on_payments_paid)
-                self.bank_model().trading_book.add_liability(tn, emit_signal=False)
-
-        return True
+        return self.load_positions(
+            f"Treasury Notes ({'Long' if long_position else 'Short'})"
+        )
 
     def load_treasury_bonds(self, long_position=True) -> bool:
         """
@@ -334,47 +304,151 @@ class ScenarioModel(QObject):
         :rtype: bool
         """
 
-        sheet_name = f"Treasury Bonds ({'Long' if long_position else 'Short'})"
-        try:
-            df = pd.read_excel(self._scenario_file_path, sheet_name=sheet_name)
-        except Exception:
-            return False
+        return self.load_positions(
+            f"Treasury Bonds ({'Long' if long_position else 'Short'})"
+        )
 
-        settlement_days = 0
-        calendar_ql = ql.NullCalendar()
-        day_count = ql.ActualActual(ql.ActualActual.ISDA)
-        business_convention = ql.Following
-        date_generation = ql.DateGeneration.Backward
-
-        for _, row in df.iterrows():
-            principal = row["principal"]
-            annual_rate = row["interest_rate"]
-            issue_date = pydate_to_qldate(row["issue_date"])
-            maturity_date = pydate_to_qldate(row["maturity_date"])
-            payment_frequency = ql.Semiannual
-            try:
-                tb = InstrumentFactory.create_treasury_bond(
-                    principal,
-                    annual_rate,
-                    issue_date,
-                    maturity_date,
-                    payment_frequency,
-                    settlement_days,
-                    calendar_ql,
-                    day_count,
-                    business_convention,
-                    date_generation,
-                )
-            except Exception:
-                continue
-            tb.set_pricing_engine(self.bond_pricing_engine)
-            if long_position:
-                tb.payments_paid.connect(self.on_payments_paid)
-                tb.payments_received.connect(self.on_payments_received)
-                self.bank_model().trading_book.add_asset(tb, emit_signal=False)
-            else:
-                tb.payments_paid.connect(self.on_payments_received)
-                tb.payments_received.connect(self.on_payments_paid)
-                self.bank_model().trading_book.add_liability(tb, emit_signal=False)
+    def load_positions(self, sheet_name: str) -> bool:
+        """
+        Build the instruments of a sheet of positions and add them to the bank.
 
+        :param sheet_name: The sheet, one of :attr:`POSITION_SHEETS`.
+        :type sheet_name: str
+        :return: True if the sheet is loaded successfully, False otherwise.
+        :rtype: bool
+        """
+
+        if sheet_name not in self.validation_report.sheets:
+            return False
+        for _, instrument in self.build_positions(sheet_name):
+            self.add_position(sheet_name, instrument)
         return True
+
+    def build_positions(self, sheet_name: str):
+        """
+        Build the instruments of the accepted rows of a sheet of positions.
+
+        Rows the instruments cannot be built from are added to the rejected rows
+        of `self.validation_report`. Nothing is added to the bank.
+
+        :param sheet_name: The sheet, one of :attr:`POSITION_SHEETS`.
+        :type sheet_name: str
+        :return: A generator of the row number and instrument of every row.
+        :rtype: Iterator[tuple[int, Instrument]]
+        """
+
+        for i, index, row in self.position_rows(sheet_name):
+            instrument = self.build_position(sheet_name, index, row)
+            if instrument is not None:
+                yield i, instrument
+
+    def position_rows(self, sheet_name: str):
+        """
+        Return the accepted rows of a sheet of positions, without building their
+        instruments, so this may run on another thread than the one owning the
+        books.
+
+        :param sheet_name: The sheet, one of :attr:`POSITION_SHEETS`.
+        :type sheet_name: str
+        :return: A generator of the row number, index label and row of every row.
+        :rtype: Iterator[tuple[int, object, pd.Series]]
+        """
+
+        df = self.validation_report.sheets.get(sheet_name)
+        if df is None:
+            return
+        for i, (index, row) in enumerate(df.iterrows()):
+            yield i, index, row
+
+    def build_position(self, sheet_name: str, index, row) -> Instrument | None:
+        """
+        Build the instrument of an accepted row of a sheet of positions.
+
+        :param sheet_name: The sheet, one of :attr:`POSITION_SHEETS`.
+        :param index: The index label of the row, see :meth:`position_rows`.
+        :param row: The row.
+        :return: The instrument, or None if it cannot be built from the row, which
+            is then added to the rejected rows of `self.validation_report`.
+        """
+
+        build = getattr(self, self.POSITION_SHEETS[sheet_name][0])
+        try:
+            return build(row)
+        except Exception as e:
+            self.validation_report.reject(sheet_name, [index], str(e))
+            return None
+
+    def add_position(self, sheet_name: str, instrument: Instrument) -> None:
+        """
+        Add an instrument built from a sheet of positions to its book.
+        """
+
+        _, book, long_position = self.POSITION_SHEETS[sheet_name]
+        book_model = getattr(self.bank_model(), book)
+        if long_position:
+            book_model.add_asset(instrument, emit_signal=False)
+        else:
+            book_model.add_liability(instrument, emit_signal=False)
+
+    @staticmethod
+    def _payment_frequency(row) -> int:
+        match row["payment_frequency"].lower():
+            case "quarterly":
+                return ql.Quarterly
+            case _:
+                return ql.Monthly
+
+    def _mortgage_from_row(self, row) -> Instrument:
+        return InstrumentFactory.create_fixed_rate_mortgage(
+            row["principal"],
+            row["interest_rate"],
+            pydate_to_qldate(row["issue_date"]),
+            ql.Period(row["maturity_years"], ql.Years),
+            self._payment_frequency(row),
+            0,  # settlement days
+            ql.NullCalendar(),
+            ql.ActualActual(ql.ActualActual.ISDA),
+            ql.Following,
+        )
+
+    def _ci_loan_from_row(self, row) -> Instrument:
+        return InstrumentFactory.create_ci_loan(
+            row["principal"],
+            row["interest_rate"],
+            pydate_to_qldate(row["issue_date"]),
+            pydate_to_qldate(row["maturity_date"]),
+            self._payment_frequency(row),
+            0,  # settlement days
+            ql.NullCalendar(),
+            ql.ActualActual(ql.ActualActual.ISDA),
+            ql.Following,
+            ql.DateGeneration.Backward,
+        )
+
+    def _treasury_note_from_row(self, row) -> Instrument:
+        return InstrumentFactory.create_treasury_note(
+            row["principal"],
+            row["interest_rate"],
+            pydate_to_qldate(row["issue_date"]),
+            pydate_to_qldate(row["maturity_date"]),
+            ql.Semiannual,
+            0,  # settlement days
+            ql.NullCalendar(),
+            ql.ActualActual(ql.ActualActual.ISDA),
+            ql.Following,
+            ql.DateGeneration.Backward,
+        )
+
+    def _treasury_bond_from_row(self, row) -> Instrument:
+        return InstrumentFactory.create_treasury_bond(
+            row["principal"],
+            row["interest_rate"],
+            pydate_to_qldate(row["issue_date"]),
+            pydate_to_qldate(row["maturity_date"]),
+            ql.Semiannual,
+            0,  # settlement days
+            ql.NullCalendar(),
+            ql.ActualActual(ql.ActualActual.ISDA),
+            ql.Following,
+            ql.DateGeneration.Backward,
+        )
@@ -0,0 +1,269 @@
+"""
+Checks of a scenario workbook run before any instrument is built
+
+pandas is imported by the functions that use it, so that the application starts
+without it and imports it when the first scenario is read.
+"""
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from brms.models.curve_engines import CURVE_ENGINES
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# The payment frequencies understood by the loaders, case-insensitive
+FREQUENCIES = ("monthly", "quarterly")
+# Bounds of the annual rates of instruments, as decimals
+RATE_RANGE = (0.0, 1.0)
+# Bounds of the par yields of the yield curve, in percent
+YIELD_RANGE = (-10.0, 100.0)
+
+META_ITEMS = ("Cash", "Demand deposits")
+# The optional item of the Meta sheet naming the curve engine of the scenario
+CURVE_ENGINE_ITEM = "Curve engine"
+# The columns every sheet of instruments must have
+INSTRUMENT_COLUMNS = {
+    "Mortgages": (
+        "principal",
+        "interest_rate",
+        "issue_date",
+        "maturity_years",
+        "payment_frequency",
+    ),
+    "C&I Loans": (
+        "principal",
+        "interest_rate",
+        "issue_date",
+        "maturity_date",
+        "payment_frequency",
+    ),
+    **{
+        f"{kind} ({side})": (
+            "principal",
+            "interest_rate",
+            "issue_date",
+            "maturity_date",
+        )
+        for kind in ("Treasury Notes", "Treasury Bonds")
+        for side in ("Long", "Short")
+    },
+}
+
+
+def read_scenario_sheets(file_path: str) -> "dict[str, pd.DataFrame]":
+    """
+    Read the sheets of a scenario workbook, opening it only once.
+
+    :param file_path: The path to the scenario file (Excel file).
+    :return: The sheets by name. Missing sheets are left out.
+    :rtype: dict[str, pd.DataFrame]
+    """
+
+    import pandas as pd
+
+    sheets = {}
+    with pd.ExcelFile(file_path) as xls:
+        names = set(xls.sheet_names)
+        if "Meta" in names:
+            sheets["Meta"] = xls.parse("Meta", header=None)
+        for name in ("Yield Curve", *INSTRUMENT_COLUMNS):
+            if name in names:
+                sheets[name] = xls.parse(name)
+    return sheets
+
+
+class ValidationReport:
+    """
+    The outcome of :func:`validate_scenario`.
+
+    `errors` lists the problems that prevent the scenario from loading at all,
+    such as a missing sheet or column. Rows failing a check are rejected and left
+    out of the accepted `sheets`; :meth:`rejected` lists them with the reasons.
+    """
+
+    def __init__(self) -> None:
+        self.errors: list[str] = []
+        self.sheets: dict[str, pd.DataFrame] = {}
+        self._rejected: list[pd.DataFrame] = []
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def reject(self, sheet: str, rows, reason: str) -> None:
+        """
+        Record the rows of `sheet` with the given index labels as rejected.
+        """
+
+        import pandas as pd
+
+        rows = np.asarray(rows)
+        if len(rows):
+            self._rejected.append(
+                pd.DataFrame({"sheet": sheet, "row": rows, "reason": reason})
+            )
+
+    def rejected(self) -> "pd.DataFrame":
+        """
+        Return the rejected rows, one per failed check.
+
+        :return: The sheet, the row number in the spreadsheet (the header being
+            row 1) and the reason of every rejection.
+        :rtype: pd.DataFrame
+        """
+
+        import pandas as pd
+
+        if not self._rejected:
+            return pd.DataFrame(columns=["sheet", "row", "reason"])
+        rejected = pd.concat(self._rejected, ignore_index=True)
+        rejected["row"] = rejected["row"].astype(int) + 2
+        return rejected.sort_values(["sheet", "row"], kind="stable", ignore_index=True)
+
+    def summary(self, max_lines=10) -> str:
+        """
+        Return a human readable summary of the errors and rejected rows.
+        """
+
+        lines = list(self.errors)
+        lines += [
+            f"{r.sheet}, row {r.row}: {r.reason}"
+            for r in self.rejected().itertuples(index=False)
+        ]
+        if len(lines) > max_lines:
+            lines = lines[:max_lines] + [f"... and {len(lines) - max_lines} more"]
+        return "\n".join(lines)
+
+
+def _validate_meta(df: "pd.DataFrame", report: ValidationReport) -> None:
+    import pandas as pd
+
+    if df.shape[1] < 2:
+        report.errors.append("Meta: expected item and value columns")
+        return
+    items = df.iloc[:, 0]
+    values = pd.to_numeric(df.iloc[:, 1], errors="coerce")
+    for item in META_ITEMS:
+        value = values[items == item]
+        if value.empty or np.isnan(value.iloc[0]):
+            report.errors.append(f"Meta: missing or non-numeric {item!r}")
+    for engine in df.iloc[:, 1][items == CURVE_ENGINE_ITEM]:
+        if str(engine).strip() not in CURVE_ENGINES:
+            names = ", ".join(CURVE_ENGINES)
+            report.errors.append(
+                f"Meta: unknown {CURVE_ENGINE_ITEM.lower()} {engine!r}, "
+                f"expected one of {names}"
+            )
+    report.sheets["Meta"] = df
+
+
+def _validate_yield_curve(df: "pd.DataFrame", report: ValidationReport) -> None:
+    import pandas as pd
+
+    sheet = "Yield Curve"
+    if "Date" not in df.columns or df.shape[1] < 2:
+        report.errors.append(f"{sheet}: expected a Date column and yield columns")
+        return
+    dates = pd.to_datetime(df["Date"], errors="coerce")
+    # Tenors may be missing on some dates, but not all of them
+    quotes = df.drop(columns="Date")
+    yields = quotes.apply(pd.to_numeric, errors="coerce")
+    lo, hi = YIELD_RANGE
+    # fmt: off
+    checks = [
+        (dates.isna(), "invalid date"),
+        ((yields.isna() & quotes.notna()).any(axis=1), "non-numeric yield"),
+        (yields.isna().all(axis=1), "no yield"),
+        (((yields < lo) | (yields > hi)).any(axis=1), f"yield outside [{lo}, {hi}]%"),
+    ]
+    # fmt: on
+    # Every date must be after all the earlier dates of rows passing the other
+    # checks, so that the accepted dates are increasing
+    passed = ~np.logical_or.reduce([np.asarray(failed) for failed, _ in checks])
+    accepted = dates[passed]
+    out_of_order = accepted <= accepted.cummax().shift()
+    checks.insert(
+        1,
+        (
+            out_of_order.reindex(dates.index, fill_value=False),
+            "date not after the previous date",
+        ),
+    )
+    _apply_checks(sheet, df, checks, report)
+    if sheet in report.sheets and report.sheets[sheet].empty:
+        report.errors.append(f"{sheet}: no valid reference date")
+
+
+def _validate_instruments(sheet: str, df: "pd.DataFrame", report: ValidationReport):
+    import pandas as pd
+
+    missing = [c for c in INSTRUMENT_COLUMNS[sheet] if c not in df.columns]
+    if missing:
+        report.errors.append(f"{sheet}: missing columns {', '.join(missing)}")
+        return
+    principal = pd.to_numeric(df["principal"], errors="coerce")
+    rate = pd.to_numeric(df["interest_rate"], errors="coerce")
+    issue_date = pd.to_datetime(df["issue_date"], errors="coerce")
+    lo, hi = RATE_RANGE
+    checks = [
+        (~(principal > 0), "principal is not a positive number"),
+        (~((rate >= lo) & (rate < hi)), f"interest rate outside [{lo}, {hi})"),
+        (issue_date.isna(), "invalid issue date"),
+    ]
+    if "maturity_date" in INSTRUMENT_COLUMNS[sheet]:
+        maturity_date = pd.to_datetime(df["maturity_date"], errors="coerce")
+        checks += [
+            (maturity_date.isna(), "invalid maturity date"),
+            (maturity_date <= issue_date, "maturity date not after issue date"),
+        ]
+    if "maturity_years" in INSTRUMENT_COLUMNS[sheet]:
+        years = pd.to_numeric(df["maturity_years"], errors="coerce")
+        checks.append(
+            (
+                ~((years > 0) & (years % 1 == 0)),
+                "maturity is not a whole number of years",
+            )
+        )
+    if "payment_frequency" in INSTRUMENT_COLUMNS[sheet]:
+        frequency = df["payment_frequency"].astype(str).str.lower()
+        checks.append((~frequency.isin(FREQUENCIES), "unknown payment frequency"))
+    _apply_checks(sheet, df, checks, report)
+
+
+def _apply_checks(sheet, df, checks, report: ValidationReport) -> None:
+    valid = np.ones(len(df), dtype=bool)
+    for failed, reason in checks:
+        failed = np.asarray(failed, dtype=bool)
+        report.reject(sheet, df.index[failed], reason)
+        valid &= ~failed
+    report.sheets[sheet] = df[valid]
+
+
+def validate_scenario(sheets: "dict[str, pd.DataFrame]") -> ValidationReport:
+    """
+    Check the sheets of a scenario with vectorized column checks.
+
+    Missing sheets and columns are errors. Rows of the yield curve and of the
+    instrument sheets are rejected if their dates are invalid or out of order,
+    their rates or yields are not numbers or out of range, or their payment
+    frequency is unknown.
+
+    :param sheets: The sheets by name, see :func:`read_scenario_sheets`.
+    :return: The report, with the accepted rows of every sheet.
+    :rtype: ValidationReport
+    """
+
+    report = ValidationReport()
+    for sheet in ("Meta", "Yield Curve", *INSTRUMENT_COLUMNS):
+        if sheet not in sheets:
+            report.errors.append(f"Missing sheet {sheet!r}")
+        elif sheet == "Meta":
+            _validate_meta(sheets[sheet], report)
+        elif sheet == "Yield Curve":
+            _validate_yield_curve(sheets[sheet], report)
+        else:
+            _validate_instruments(sheet, sheets[sheet], report)
+    return report
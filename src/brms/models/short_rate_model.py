@@ -0,0 +1,375 @@
+"""
+Monte Carlo short-rate scenarios and pathwise valuation of the bank's cashflows
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import QuantLib as ql
+
+from brms.models.cashflow_ledger import INTEREST, CashflowLedger, to_serial
+
+DAYS_PER_YEAR = 365.0
+
+
+class InitialCurve:
+    """
+    The initial term structure sampled on a fixed grid of year fractions.
+
+    Sampling the QuantLib curve once lets the short-rate models evaluate discount
+    factors and instantaneous forwards for whole arrays of times with NumPy.
+    """
+
+    def __init__(self, times: np.ndarray, log_discounts: np.ndarray) -> None:
+        self.times = np.asarray(times, dtype=np.float64)
+        self.log_discounts = np.asarray(log_discounts, dtype=np.float64)
+        self.forwards = -np.gradient(self.log_discounts, self.times)
+
+    @classmethod
+    def from_yield_curve(
+        cls, yield_curve: ql.YieldTermStructure, max_years=50.0, points_per_year=12
+    ) -> "InitialCurve":
+        """
+        Sample a QuantLib yield curve on a regular grid.
+
+        :param yield_curve: The curve to sample, e.g. the current bootstrapped curve.
+        :param max_years: The longest year fraction sampled.
+        :param points_per_year: The number of grid points per year.
+        :return: The sampled curve.
+        :rtype: InitialCurve
+        """
+
+        times = np.linspace(0.0, max_years, int(max_years * points_per_year) + 1)
+        reference_date = yield_curve.referenceDate()
+        log_discounts = np.array(
+            [
+                np.log(
+                    yield_curve.discount(reference_date + int(round(t * DAYS_PER_YEAR)))
+                )
+                for t in times
+            ]
+        )
+        return cls(times, log_discounts)
+
+    def log_discount(self, t: np.ndarray) -> np.ndarray:
+        return np.interp(t, self.times, self.log_discounts)
+
+    def forward(self, t: np.ndarray) -> np.ndarray:
+        return np.interp(t, self.times, self.forwards)
+
+
+class VasicekModel:
+    """
+    Vasicek model `dr = a (b - r) dt + sigma dW`.
+
+    The initial short rate is read off the curve and the long-run mean `b` is
+    fitted to the curve in closed form, since the log discount factors are linear
+    in `b` for given `a` and `sigma`.
+    """
+
+    def __init__(
+        self, r0: float, mean_reversion: float, long_run_mean: float, volatility: float
+    ):
+        self.r0 = r0
+        self.a = mean_reversion
+        self.b = long_run_mean
+        self.sigma = volatility
+
+    @classmethod
+    def calibrate(
+        cls, yield_curve: ql.YieldTermStructure, mean_reversion=0.1, volatility=0.01
+    ) -> "VasicekModel":
+        curve = InitialCurve.from_yield_curve(yield_curve)
+        a, sigma = mean_reversion, volatility
+        r0 = float(curve.forward(0.0))
+        tau = curve.times[1:]
+        B = (1.0 - np.exp(-a * tau)) / a
+        # ln P = b (B - tau) + c, where c collects the terms without b
+        c = -(sigma**2) / (2 * a**2) * (B - tau) - sigma**2 * B**2 / (4 * a) - B * r0
+        x = B - tau
+        b = float(np.sum((curve.log_discounts[1:] - c) * x) / np.sum(x * x))
+        return cls(r0, a, b, sigma)
+
+    def simulate(self, times: np.ndarray, n_paths: int, rng: np.random.Generator):
+        """
+        Simulate short-rate paths with the exact Gaussian transition.
+
+        :param times: Increasing year fractions, starting at 0.
+        :param n_paths: The number of paths.
+        :param rng: The random number generator.
+        :return: A (paths x times) array of short rates.
+        :rtype: np.ndarray
+        """
+
+        a, b, sigma = self.a, self.b, self.sigma
+        dt = np.diff(times)
+        decay = np.exp(-a * dt)
+        std = sigma * np.sqrt((1.0 - np.exp(-2 * a * dt)) / (2 * a))
+        shocks = rng.standard_normal((n_paths, len(dt))) * std
+        rates = np.empty((n_paths, len(times)))
+        rates[:, 0] = self.r0
+        for k in range(len(dt)):
+            rates[:, k + 1] = rates[:, k] * decay[k] + b * (1 - decay[k]) + shocks[:, k]
+        return rates
+
+    def log_bond_prices(self, t: float, maturities: np.ndarray, r_t: np.ndarray):
+        """
+        Return ln P(t, T) for every path (rows) and maturity (columns).
+        """
+
+        a, b, sigma = self.a, self.b, self.sigma
+        tau = np.asarray(maturities) - t
+        B = (1.0 - np.exp(-a * tau)) / a
+        A = (b - sigma**2 / (2 * a**2)) * (B - tau) - sigma**2 * B**2 / (4 * a)
+        return A[None, :] - B[None, :] * r_t[:, None]
+
+
+class HullWhiteModel:
+    """
+    One-factor Hull-White model fitted exactly to the initial curve.
+
+    The short rate is `r(t) = x(t) + alpha(t)` where `x` is a zero-mean
+    Ornstein-Uhlenbeck process and `alpha` absorbs the initial forward curve.
+    """
+
+    def __init__(self, curve: InitialCurve, mean_reversion: float, volatility: float):
+        self.curve = curve
+        self.a = mean_reversion
+        self.sigma = volatility
+
+    @classmethod
+    def calibrate(
+        cls, yield_curve: ql.YieldTermStructure, mean_reversion=0.03, volatility=0.01
+    ) -> "HullWhiteModel":
+        curve = InitialCurve.from_yield_curve(yield_curve)
+        return cls(curve, mean_reversion, volatility)
+
+    def alpha(self, t: np.ndarray) -> np.ndarray:
+        a, sigma = self.a, self.sigma
+        return self.curve.forward(t) + sigma**2 / (2 * a**2) * (1 - np.exp(-a * t)) ** 2
+
+    def simulate(self, times: np.ndarray, n_paths: int, rng: np.random.Generator):
+        """
+        Simulate short-rate paths with the exact Gaussian transition of `x`.
+
+        :param times: Increasing year fractions, starting at 0.
+        :param n_paths: The number of paths.
+        :param rng: The random number generator.
+        :return: A (paths x times) array of short rates.
+        :rtype: np.ndarray
+        """
+
+        a, sigma = self.a, self.sigma
+        dt = np.diff(times)
+        decay = np.exp(-a * dt)
+        std = sigma * np.sqrt((1.0 - np.exp(-2 * a * dt)) / (2 * a))
+        shocks = rng.standard_normal((n_paths, len(dt))) * std
+        x = np.zeros((n_paths, len(times)))
+        for k in range(len(dt)):
+            x[:, k + 1] = x[:, k] * decay[k] + shocks[:, k]
+        return x + self.alpha(times)[None, :]
+
+    def log_bond_prices(self, t: float, maturities: np.ndarray, r_t: np.ndarray):
+        """
+        Return ln P(t, T) for every path (rows) and maturity (columns).
+        """
+
+        a, sigma = self.a, self.sigma
+        maturities = np.asarray(maturities)
+        B = (1.0 - np.exp(-a * (maturities - t))) / a
+        log_ratio = self.curve.log_discount(maturities) - self.curve.log_discount(t)
+        A = (
+            log_ratio
+            + B * self.curve.forward(t)
+            - sigma**2 / (4 * a) * (1 - np.exp(-2 * a * t)) * B**2
+        )
+        return A[None, :] - B[None, :] * r_t[:, None]
+
+
+class MonteCarloResult:
+    """
+    Distributions of the economic value of equity (EVE) at the horizon and the net
+    interest income (NII) earned over the horizon, one value per path.
+    """
+
+    def __init__(
+        self, eve: np.ndarray, nii: np.ndarray, base_eve: float, horizon: float
+    ):
+        self.eve = eve
+        self.nii = nii
+        self.base_eve = base_eve
+        self.horizon = horizon
+
+    def summary(
+        self, quantiles=(0.01, 0.05, 0.5, 0.95, 0.99)
+    ) -> dict[str, dict[str, float]]:
+        """
+        Summarize the EVE and NII distributions.
+
+        :param quantiles: The quantiles to report.
+        :return: `{"EVE": {...}, "NII": {...}}` with mean, std and the quantiles.
+        :rtype: dict
+        """
+
+        summary = {}
+        for name, values in (("EVE", self.eve), ("NII", self.nii)):
+            stats = {"mean": float(np.mean(values)), "std": float(np.std(values))}
+            for q, v in zip(quantiles, np.quantile(values, quantiles)):
+                stats[f"q{q:g}"] = float(v)
+            summary[name] = stats
+        return summary
+
+
+def _price_block(
+    model, times, n_paths, seed, flow_times, flow_amounts, flow_interest, cash, deposits
+):
+    """
+    Simulate one block of paths and value the book on each of them.
+
+    Flows up to the horizon are reinvested in (or funded by) the cash account at
+    the simulated short rate; flows after the horizon are discounted with the
+    model's bond prices conditional on the short rate at the horizon.
+    """
+
+    rng = np.random.default_rng(seed)
+    rates = model.simulate(times, n_paths, rng)
+    horizon = times[-1]
+    dt = np.diff(times)
+    # Integral of the short rate from 0 to each grid time, per path
+    integral = np.zeros_like(rates)
+    integral[:, 1:] = np.cumsum(0.5 * (rates[:, 1:] + rates[:, :-1]) * dt, axis=1)
+
+    in_horizon = flow_times <= horizon
+    t_in = flow_times[in_horizon]
+    # Linear interpolation of the integral at the payment times
+    k = np.clip(np.searchsorted(times, t_in, side="right") - 1, 0, len(times) - 2)
+    w = (t_in - times[k]) / (times[k + 1] - times[k])
+    integral_at_pmt = integral[:, k] * (1 - w) + integral[:, k + 1] * w
+    growth = np.exp(integral[:, -1][:, None] - integral_at_pmt)
+    cash_at_horizon = cash * np.exp(integral[:, -1]) + growth @ flow_amounts[in_horizon]
+
+    t_out = flow_times[~in_horizon]
+    if len(t_out):
+        log_p = model.log_bond_prices(horizon, t_out, rates[:, -1])
+        pv_after = np.exp(log_p) @ flow_amounts[~in_horizon]
+    else:
+        pv_after = np.zeros(n_paths)
+
+    eve = cash_at_horizon + pv_after - deposits
+    contractual_interest = np.sum(flow_amounts[in_horizon & flow_interest])
+    cash_interest = cash_at_horizon - cash - np.sum(flow_amounts[in_horizon])
+    nii = contractual_interest + cash_interest
+    return eve, nii
+
+
+class ShortRateScenarioGenerator:
+    """
+    Generate short-rate paths calibrated to the current yield curve and value the
+    bank's cashflow ledger on every path.
+
+    Paths are generated and priced as (paths x dates) NumPy arrays in blocks that
+    are spread across a process pool. Each worker gets at least
+    :attr:`min_paths_per_worker` paths, so small runs are priced in this process
+    rather than waiting for workers to start.
+    """
+
+    models = {"hull-white": HullWhiteModel, "vasicek": VasicekModel}
+    min_paths_per_worker = 5_000
+
+    def __init__(
+        self,
+        yield_curve: ql.YieldTermStructure,
+        model="hull-white",
+        mean_reversion=0.03,
+        volatility=0.01,
+    ) -> None:
+        if model not in self.models:
+            raise ValueError(f"Unknown short-rate model: {model}")
+        self.model = self.models[model].calibrate(
+            yield_curve, mean_reversion, volatility
+        )
+        self.yield_curve = yield_curve
+        self.reference_date = yield_curve.referenceDate()
+
+    def run(
+        self,
+        ledger: CashflowLedger,
+        cash: float,
+        deposits: float,
+        n_paths=10_000,
+        horizon=1.0,
+        steps_per_year=52,
+        block_size=1_000,
+        n_workers: int | None = None,
+        seed: int | None = None,
+    ) -> MonteCarloResult:
+        """
+        Simulate `n_paths` paths and return the EVE and NII distributions.
+
+        :param ledger: The cashflows of the bank's books.
+        :param cash: The current cash balance.
+        :param deposits: The current demand deposits, carried at face value.
+        :param n_paths: The number of simulated paths.
+        :param horizon: The horizon in years.
+        :param steps_per_year: The number of time steps per year.
+        :param block_size: The number of paths simulated per task.
+        :param n_workers: The most processes used, defaults to the CPU count.
+            With a single worker the blocks are run in this process.
+        :param seed: The seed for reproducible paths, independent of `n_workers`.
+        :return: The simulated distributions.
+        :rtype: MonteCarloResult
+        """
+
+        ref_serial = to_serial(self.reference_date)
+        future = ledger.after(ref_serial)
+        # Net flows by payment date, as year fractions from the reference date
+        pmt_dates, inverse = np.unique(future.dates, return_inverse=True)
+        signed = future.signed_amounts()
+        flow_amounts = np.bincount(inverse, weights=signed, minlength=len(pmt_dates))
+        interest = np.where(future.kinds == INTEREST, signed, 0.0)
+        flow_interest_amounts = np.bincount(
+            inverse, weights=interest, minlength=len(pmt_dates)
+        )
+        flow_times = (pmt_dates - ref_serial) / DAYS_PER_YEAR
+
+        # Split interest and principal flows so that NII only counts interest
+        flow_times = np.concatenate([flow_times, flow_times])
+        flow_interest = np.concatenate(
+            [np.ones(len(pmt_dates), dtype=bool), np.zeros(len(pmt_dates), dtype=bool)]
+        )
+        flow_amounts = np.concatenate(
+            [flow_interest_amounts, flow_amounts - flow_interest_amounts]
+        )
+
+        times = np.linspace(
+            0.0, horizon, max(1, int(round(horizon * steps_per_year))) + 1
+        )
+        block_sizes = [block_size] * (n_paths // block_size)
+        if n_paths % block_size:
+            block_sizes.append(n_paths % block_size)
+        seeds = np.random.SeedSequence(seed).spawn(len(block_sizes))
+        flows = (flow_times, flow_amounts, flow_interest, cash, deposits)
+        tasks = [
+            (self.model, times, size, s, *flows) for size, s in zip(block_sizes, seeds)
+        ]
+        n_workers = min(
+            n_workers or os.cpu_count() or 1,
+            -(-n_paths // self.min_paths_per_worker),
+        )
+        if n_workers == 1 or len(tasks) == 1:
+            results = [_price_block(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                results = list(executor.map(_price_block, *zip(*tasks)))
+
+        eve = np.concatenate([r[0] for r in results])
+        nii = np.concatenate([r[1] for r in results])
+        # EVE today, discounting with the curve the models are calibrated to
+        discounts = np.array(
+            [self.yield_curve.discount(ql.Date(int(d))) for d in pmt_dates]
+        )
+        base_eve = (
+            cash + float(discounts @ np.bincount(inverse, weights=signed)) - deposits
+        )
+        return MonteCarloResult(eve, nii, base_eve, horizon)
@@ -0,0 +1,205 @@
+"""
+Headless simulation engine stepping a scenario through its dates
+"""
+
+import datetime
+
+import QuantLib as ql
+
+from brms.models.scenario_model import ScenarioModel
+from brms.models.valuation import (
+    BASE_CURVE,
+    ValuationContext,
+    shifted_curve,
+    shifted_curve_name,
+)
+from brms.utils import pydate_to_qldate, qldate_to_pydate
+
+
+class Simulation:
+    """
+    Advance a :class:`ScenarioModel` one reference date at a time.
+
+    On every date the yield curve of that date is built and becomes the base
+    curve of the scenario, see :class:`ScenarioCurves`, and the payments due
+    since the previous date are settled in cash. No view is involved, so the
+    same engine backs the GUI and batch runs.
+
+    The date and curve are handed to the books in a :class:`ValuationContext`
+    rather than through the global evaluation date of QuantLib, which is left
+    untouched.
+    """
+
+    def __init__(
+        self, scenario: ScenarioModel, yield_shock=None, rate_shifts_bp=()
+    ) -> None:
+        """
+        :param scenario: The loaded scenario to simulate.
+        :param yield_shock: Optional callable `(maturities_in_years, yields) -> yields`
+            applied to the par yields of every date before the curve is built.
+        :param rate_shifts_bp: Parallel shifts of the zero rates of the base curve,
+            in basis points, on which the trading book is valued next to the base
+            curve, see :meth:`results`.
+        """
+        self.scenario = scenario
+        self.yield_shock = yield_shock
+        self.rate_shifts_bp = tuple(rate_shifts_bp)
+        self.current_index = -1
+        self.current_date = ql.Date()
+        self.previous_date = ql.Date()
+        self.context = ValuationContext(ql.Date())
+        # Payments settled on the current date
+        self.payments_received = 0.0
+        self.payments_paid = 0.0
+
+    def reset(self) -> None:
+        self.current_index = -1
+        self.current_date = ql.Date()
+        self.previous_date = ql.Date()
+        self.context = ValuationContext(ql.Date())
+        self.payments_received = 0.0
+        self.payments_paid = 0.0
+
+    def dates(self) -> list[ql.Date]:
+        return self.scenario.dates_in_simulation()
+
+    def index_of(self, date: ql.Date | datetime.date) -> int:
+        """
+        Return the index of the first simulation date on or after `date`.
+        """
+        if isinstance(date, datetime.date):
+            date = pydate_to_qldate(date)
+        return next(
+            (i for i, d in enumerate(self.dates()) if d >= date), len(self.dates())
+        )
+
+    def start(self, index: int = 0) -> None:
+        """
+        Move to the date at `index` without settling any payment before it.
+        """
+        self.current_index = index
+        self.previous_date = self.current_date = self.dates()[index]
+        self.payments_received = self.payments_paid = 0.0
+        self.reprice()
+
+    def has_next(self) -> bool:
+        return 0 <= self.current_index < len(self.dates()) - 1
+
+    def step(self, reprice=True) -> bool:
+        """
+        Advance to the next date, reprice and settle the payments due.
+
+        :param reprice: Whether to build the yield curve of the next date. The
+            payments do not depend on it, so replays skip it on dates whose
+            values are not needed.
+        :return: False if the simulation has already reached its last date.
+        :rtype: bool
+        """
+        if not self.has_next():
+            return False
+        self.current_index += 1
+        self.previous_date = self.current_date
+        self.current_date = self.dates()[self.current_index]
+        if reprice:
+            self.reprice()
+        else:
+            self.set_context(self.context.on(self.current_date))
+        bank = self.scenario.bank_model()
+        self.payments_received = self.payments_paid = 0.0
+        for book in (bank.banking_book, bank.trading_book):
+            received, paid = book.calculate_payments(
+                self.previous_date, self.current_date
+            )
+            self.payments_received += received
+            self.payments_paid += paid
+        return True
+
+    def reprice(self) -> None:
+        """
+        Build the yield curve of the current date and make it the base curve of the
+        scenario, shifted by each of :attr:`rate_shifts_bp` next to it.
+        """
+        yield_curve_model = self.scenario.yield_curve_model()
+        inputs = yield_curve_model.get_curve_inputs(
+            self.current_index, self.yield_shock
+        )
+        yield_curve = yield_curve_model.build_yield_curve(inputs)
+        curves = self.scenario.curves
+        curves.link(BASE_CURVE, yield_curve)
+        for shift_bp in self.rate_shifts_bp:
+            curves.link(
+                shifted_curve_name(shift_bp), shifted_curve(curves.handle(), shift_bp)
+            )
+        self.set_context(ValuationContext(self.current_date, yield_curve))
+
+    def set_context(self, context: ValuationContext) -> None:
+        """
+        Value the positions of both books on the date of `context`.
+        """
+        self.context = context
+        bank = self.scenario.bank_model()
+        bank.banking_book.set_valuation_context(context)
+        bank.trading_book.set_valuation_context(context)
+
+    def results(self) -> dict[str, float | datetime.date]:
+        """
+        Return the balance sheet of the current date.
+
+        Banking book positions are at book value and trading book positions at
+        market value, as displayed in the bank books. The trading book is also
+        valued on the base curve shifted by each of :attr:`rate_shifts_bp`, as
+        e.g. `trading_assets_shift+100bp`.
+        """
+        bank = self.scenario.bank_model()
+        totals = {}
+        for name, book in (
+            ("banking", bank.banking_book),
+            ("trading", bank.trading_book),
+        ):
+            assets, liabilities = book.assets_data(), book.liabilities_data()
+            totals[f"{name}_assets"] = float(sum(g["data"][1] for g in assets))
+            totals[f"{name}_liabilities"] = float(
+                sum(g["data"][1] for g in liabilities)
+            )
+        for shift_bp in self.rate_shifts_bp:
+            curve = shifted_curve_name(shift_bp)
+            assets, liabilities = bank.trading_book.market_values(curve)
+            totals[f"trading_assets_{curve}"] = assets
+            totals[f"trading_liabilities_{curve}"] = liabilities
+        equity = (
+            totals["banking_assets"]
+            + totals["trading_assets"]
+            - totals["banking_liabilities"]
+            - totals["trading_liabilities"]
+        )
+        return {
+            "date": qldate_to_pydate(self.current_date),
+            "cash": float(bank.banking_book.get_cash()),
+            "payments_received": self.payments_received,
+            "payments_paid": self.payments_paid,
+            **totals,
+            "equity": equity,
+        }
+
+    def run(self, start=None, end=None) -> list[dict]:
+        """
+        Simulate from `start` to `end` and collect the results of every date.
+
+        :param start: The first date, defaults to the first reference date.
+        :param end: The last date, defaults to the last reference date.
+        :return: One :meth:`results` record per simulated date.
+        :rtype: list[dict]
+        """
+        index = 0 if start is None else self.index_of(start)
+        if index >= len(self.dates()):
+            return []
+        if isinstance(end, datetime.date):
+            end = pydate_to_qldate(end)
+        self.start(index)
+        records = [self.results()]
+        while self.has_next():
+            if end is not None and self.dates()[self.current_index + 1] > end:
+                break
+            self.step()
+            records.append(self.results())
+        return records
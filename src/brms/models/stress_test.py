@@ -0,0 +1,210 @@
+"""
+Grid of stress-test variants run in parallel through the headless simulation
+"""
+
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import QuantLib as ql
+
+from brms.models.instrument_store import Position
+from brms.models.instruments import DemandDeposit, Mortgage
+from brms.models.scenario_model import ScenarioModel
+from brms.models.simulation import Simulation
+
+
+class StressVariant:
+    """
+    A variant of the base scenario.
+
+    :param parallel_shift_bp: Shift added to every par yield, in basis points.
+    :param twist_bp: Steepening in basis points, applied linearly in maturity from
+        `-twist_bp / 2` at the shortest tenor to `+twist_bp / 2` at the longest.
+    :param deposit_run_off: Fraction of demand deposits withdrawn at the start,
+        paid out of cash.
+    :param prepayment_rate: Annual constant prepayment rate (CPR) of mortgages.
+    """
+
+    def __init__(
+        self,
+        parallel_shift_bp=0.0,
+        twist_bp=0.0,
+        deposit_run_off=0.0,
+        prepayment_rate=0.0,
+    ) -> None:
+        self.parallel_shift_bp = parallel_shift_bp
+        self.twist_bp = twist_bp
+        self.deposit_run_off = deposit_run_off
+        self.prepayment_rate = prepayment_rate
+
+    def __repr__(self) -> str:
+        return f"StressVariant({self.parameters()})"
+
+    def parameters(self) -> dict[str, float]:
+        return {
+            "parallel_shift_bp": self.parallel_shift_bp,
+            "twist_bp": self.twist_bp,
+            "deposit_run_off": self.deposit_run_off,
+            "prepayment_rate": self.prepayment_rate,
+        }
+
+    def yield_shock(self, maturities: np.ndarray, yields: np.ndarray) -> np.ndarray:
+        """
+        Shift par yields (in percent) of the given maturities (in years).
+        """
+        shift = np.full(len(yields), self.parallel_shift_bp, dtype=float)
+        if self.twist_bp and len(maturities) > 1:
+            lo, hi = np.min(maturities), np.max(maturities)
+            shift += self.twist_bp * ((maturities - lo) / (hi - lo) - 0.5)
+        return yields + shift / 100
+
+    def apply(self, scenario: ScenarioModel, start: ql.Date):
+        """
+        Apply the balance sheet changes of the variant to `scenario`, with
+        mortgages prepaying from `start` on.
+
+        :return: A callable that restores the scenario to its previous state.
+        """
+        bank = scenario.bank_model()
+        banking_book = bank.banking_book
+        cash = banking_book.get_cash()
+        deposits = [l for l in banking_book.liabilities if isinstance(l, DemandDeposit)]
+        balances = [d.value() for d in deposits]
+        assets = list(banking_book.assets)
+        n_rows = len(banking_book.store)
+
+        for deposit, balance in zip(deposits, balances):
+            deposit.set_value(balance * (1 - self.deposit_run_off))
+        banking_book.set_cash(float(cash - sum(balances) * self.deposit_run_off))
+        if self.prepayment_rate:
+            for i, asset in enumerate(assets):
+                if isinstance(asset, Position) and issubclass(
+                    asset.instrument_class, Mortgage
+                ):
+                    spec = asset.spec() | {
+                        "prepayment_rate": self.prepayment_rate,
+                        "prepayment_start": start,
+                    }
+                    banking_book.replace_asset(i, asset.instrument_class(**spec))
+
+        def restore():
+            banking_book.assets[:] = assets
+            banking_book.store.truncate(n_rows)
+            banking_book.set_cash(float(cash))
+            for deposit, balance in zip(deposits, balances):
+                deposit.set_value(balance)
+            # Forget the values of the previous run the colours compare against
+            for book in (banking_book, bank.trading_book):
+                book.set_aggregation_state([], [])
+
+        return restore
+
+
+def stress_grid(
+    parallel_shifts_bp=(0.0,),
+    twists_bp=(0.0,),
+    deposit_run_offs=(0.0,),
+    prepayment_rates=(0.0,),
+) -> list[StressVariant]:
+    """
+    Return the variants for every combination of the given stress parameters.
+    """
+    return [
+        StressVariant(*params)
+        for params in itertools.product(
+            parallel_shifts_bp, twists_bp, deposit_run_offs, prepayment_rates
+        )
+    ]
+
+
+# The parsed base scenario, shared with forked workers by copy-on-write
+_base_scenario: ScenarioModel | None = None
+
+
+def _load_base_scenario(file_path: str) -> None:
+    """
+    :raises ValueError: If the scenario fails to load.
+    """
+    global _base_scenario
+    _base_scenario = ScenarioModel()
+    if not _base_scenario.load_scenario(file_path):
+        raise ValueError(f"Failed to load the scenario {file_path}")
+
+
+def _run_variant(variant: StressVariant, start, end, rate_shifts_bp) -> list[dict]:
+    simulation = Simulation(_base_scenario, variant.yield_shock, rate_shifts_bp)
+    dates = simulation.dates()
+    index = 0 if start is None else simulation.index_of(start)
+    if index >= len(dates):
+        return []
+    restore = variant.apply(_base_scenario, dates[index])
+    try:
+        records = simulation.run(start, end)
+    finally:
+        restore()
+    parameters = variant.parameters()
+    return [{**parameters, **record} for record in records]
+
+
+class StressTestRunner:
+    """
+    Run a grid of variants of a base scenario file through the headless
+    simulation and collect the results in a tidy table.
+
+    The base scenario is parsed once. Where processes can be forked, workers
+    inherit it copy-on-write; otherwise each worker parses it once on start.
+    """
+
+    def __init__(self, file_path: str, start=None, end=None, rate_shifts_bp=()) -> None:
+        """
+        :param file_path: The base scenario file.
+        :param start: The first simulated date, defaults to the first reference date.
+        :param end: The last simulated date, defaults to the last reference date.
+        :param rate_shifts_bp: Parallel shifts in basis points of the curve of each
+            variant, on which its trading book is also valued on every date, see
+            :meth:`Simulation.results`.
+        """
+        self.file_path = file_path
+        self.start = start
+        self.end = end
+        self.rate_shifts_bp = tuple(rate_shifts_bp)
+
+    def run(self, variants: list[StressVariant], n_workers: int | None = None):
+        """
+        Simulate every variant.
+
+        :param variants: The variants to run, e.g. from :func:`stress_grid`.
+        :param n_workers: The number of processes, defaults to the CPU count.
+        :return: One row per variant and date, with the variant parameters, the
+            date and the balance sheet of :meth:`Simulation.results`, including
+            the trading book on each shifted curve.
+        :rtype: pd.DataFrame
+        """
+        n_workers = min(n_workers or os.cpu_count() or 1, len(variants))
+        starts = [self.start] * len(variants)
+        ends = [self.end] * len(variants)
+        shifts = [self.rate_shifts_bp] * len(variants)
+
+        if n_workers <= 1:
+            _load_base_scenario(self.file_path)
+            results = list(map(_run_variant, variants, starts, ends, shifts))
+        elif "fork" in multiprocessing.get_all_start_methods():
+            _load_base_scenario(self.file_path)
+            context = multiprocessing.get_context("fork")
+            with ProcessPoolExecutor(n_workers, mp_context=context) as executor:
+                results = list(
+                    executor.map(_run_variant, variants, starts, ends, shifts)
+                )
+        else:
+            with ProcessPoolExecutor(
+                n_workers, initializer=_load_base_scenario, initargs=(self.file_path,)
+            ) as executor:
+                results = list(
+                    executor.map(_run_variant, variants, starts, ends, shifts)
+                )
+
+        return pd.DataFrame([record for records in results for record in records])
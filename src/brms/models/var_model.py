@@ -0,0 +1,141 @@
+"""
+Historical-simulation value-at-risk and expected shortfall of the trading book
+"""
+
+import math
+
+import numpy as np
+import QuantLib as ql
+
+from brms.models.cashflow_ledger import TRADING_BOOK, CashflowLedger, to_serial
+
+DAYS_PER_YEAR = 365.0
+
+
+class HistoricalVaRModel:
+    """
+    Revalue the trading book under historical yield curve shocks.
+
+    Shocks are the changes in par yields over the holding period, observed over a
+    lookback window of the yield history that ends on the valuation date. They
+    are mapped onto the cashflow dates by linear interpolation in maturity and
+    applied as parallel-in-bucket shifts to the zero rates of the current curve.
+    All shocks are revalued at once from the precomputed cashflow arrays.
+
+    A horizon is only reported once the window holds :attr:`min_scenarios`
+    changes, enough for the tail beyond the confidence level to hold at least
+    one of them.
+    """
+
+    def __init__(self, confidence=0.99, lookback=250, horizons=(1, 10)) -> None:
+        self.confidence = confidence
+        self.lookback = lookback
+        self.horizons = tuple(horizons)
+        self._dates: np.ndarray = np.array([], dtype=np.int64)
+        self._tenor_years: np.ndarray = np.array([])
+        # Holding-period yield changes, keyed by horizon in days
+        self._changes: dict[int, np.ndarray] = {}
+        self._ledger = CashflowLedger()
+
+    @property
+    def min_scenarios(self) -> int:
+        """
+        The number of historical changes needed to report VaR and ES, e.g. 100
+        at 99%.
+        """
+        # Rounded first so that 1 / (1 - 0.99) does not round up to 101
+        return max(2, math.ceil(round(1 / (1 - self.confidence), 9)))
+
+    def reset(self) -> None:
+        self._dates = np.array([], dtype=np.int64)
+        self._tenor_years = np.array([])
+        self._changes.clear()
+        self._ledger = CashflowLedger()
+
+    def set_history(self, dates, tenor_years, yields) -> None:
+        """
+        Precompute the holding-period changes of the yield history.
+
+        :param dates: The reference dates of the history, in increasing order.
+        :param tenor_years: The maturity of each yield column in years.
+        :param yields: A (dates x tenors) array of par yields in percent.
+        """
+
+        yields = np.asarray(yields, dtype=np.float64) / 100
+        self._dates = np.array([to_serial(d) for d in dates], dtype=np.int64)
+        self._tenor_years = np.asarray(tenor_years, dtype=np.float64)
+        # Row i holds the change over the `h` observations ending at row i + h
+        self._changes = {h: yields[h:] - yields[:-h] for h in self.horizons}
+
+    def set_portfolio(self, ledger: CashflowLedger) -> None:
+        """
+        Keep the trading book cashflows of the ledger.
+        """
+
+        self._ledger = ledger.select(ledger.books == TRADING_BOOK)
+
+    def shocks(self, date, horizon: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the historical yield changes available on `date` for `horizon`.
+
+        :return: The tenors (years) without missing quotes in the window and the
+            (scenarios x tenors) changes.
+        """
+
+        changes = self._changes.get(horizon)
+        if changes is None or not len(changes):
+            return self._tenor_years[:0], np.empty((0, 0))
+        # Number of observations up to and including `date`
+        n_obs = np.searchsorted(self._dates, to_serial(date), side="right")
+        end = max(0, n_obs - horizon)
+        window = changes[max(0, end - self.lookback) : end]
+        valid = ~np.isnan(window).any(axis=0)
+        return self._tenor_years[valid], window[:, valid]
+
+    def calculate(self, date: ql.Date, yield_curve: ql.YieldTermStructure):
+        """
+        Calculate VaR and ES for every horizon on `date`.
+
+        :param date: The valuation date.
+        :param yield_curve: The curve used to value the trading book on `date`.
+        :return: A dict keyed by horizon (days) of `(VaR, ES)` tuples, reported as
+            positive losses. Horizons with fewer than :attr:`min_scenarios`
+            historical changes are omitted.
+        :rtype: dict[int, tuple[float, float]]
+        """
+
+        results = {}
+        future = self._ledger.after(date)
+        if yield_curve is None or not len(future):
+            return results
+
+        # Net cashflows by payment date
+        pmt_dates, inverse = np.unique(future.dates, return_inverse=True)
+        amounts = np.bincount(inverse, weights=future.signed_amounts())
+        ref_serial = to_serial(yield_curve.referenceDate())
+        # fmt: off
+        discounts = np.array([yield_curve.discount(ql.Date(int(d))) for d in pmt_dates])
+        # fmt: on
+        times = (pmt_dates - ref_serial) / DAYS_PER_YEAR
+        zero_rates = -np.log(discounts) / np.maximum(times, 1e-8)
+        base_value = float(discounts @ amounts)
+
+        for horizon in self.horizons:
+            tenors, changes = self.shocks(date, horizon)
+            if len(changes) < self.min_scenarios or not len(tenors):
+                continue
+            # Interpolation weights from tenors onto the cashflow times
+            weights = np.array(
+                [
+                    np.interp(times, tenors, np.eye(len(tenors))[j])
+                    for j in range(len(tenors))
+                ]
+            )
+            shocked = np.exp(-(zero_rates + changes @ weights) * times)
+            pnl = shocked @ amounts - base_value
+            threshold = np.quantile(pnl, 1 - self.confidence)
+            var = -threshold
+            es = -float(np.mean(pnl[pnl <= threshold]))
+            results[horizon] = (float(var), es)
+
+        return results
@@ -1,8 +1,161 @@
-from datetime import date
+import re
+from datetime import date, datetime
 
+import numpy as np
 import QuantLib as ql
-from dateutil.relativedelta import relativedelta
-from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from brms.models.curve_engines import (
+    DAYS_PER_YEAR,
+    DEFAULT_ENGINE,
+    PARAMETRIC_ENGINES,
+    NelsonSiegelHistory,
+    get_curve_engine,
+)
+from brms.models.qt import QAbstractTableModel, QModelIndex, Qt
+
+
+def maturity_in_months(maturity: str) -> int | None:
+    """
+    Convert a maturity label such as "1 Mo", "6M", "10 Yr" or "30Y" to months.
+
+    :param maturity: The maturity label used in the yield curve data.
+    :type maturity: str
+    :return: The maturity in months, or None if the label is not recognised.
+    :rtype: int | None
+    """
+
+    parsed = re.fullmatch(r"\s*(\d+)\s*(Mo|M|Yr|Y)\s*", maturity)
+    if parsed is None:
+        return None
+    n, unit = int(parsed.group(1)), parsed.group(2)
+    return n if unit in ("Mo", "M") else 12 * n
+
+
+def maturity_in_years(maturity: str) -> float:
+    """
+    Convert a maturity label such as "1 Mo", "6M", "10 Yr" or "30Y" to years.
+
+    :param maturity: The maturity label used in the yield curve data.
+    :type maturity: str
+    :return: The maturity in years, or NaN if the label is not recognised.
+    :rtype: float
+    """
+
+    months = maturity_in_months(maturity)
+    return float("nan") if months is None else months / 12
+
+
+class TenorGrid:
+    """
+    The maturities of the yield data, parsed once, and the maturity dates of
+    every reference date and maturity, computed in bulk.
+
+    A maturity date is the reference date moved by whole months, on the same day
+    of the month or the last day of shorter months, as with `relativedelta`.
+    """
+
+    def __init__(self, labels, reference_dates) -> None:
+        """
+        :param labels: The maturity labels, e.g. "1 Mo" or "10 Yr".
+        :param reference_dates: The reference dates.
+        """
+        self.labels = list(labels)
+        months = [maturity_in_months(label) for label in self.labels]
+        # Whether each label is recognised
+        self.valid = np.array([m is not None for m in months], dtype=bool)
+        self.months = np.array([m or 0 for m in months], dtype=np.int64)
+        self.years = np.where(self.valid, self.months / 12, np.nan)
+
+        days = np.array(
+            [np.datetime64(d.strftime("%Y-%m-%d"), "D") for d in reference_dates],
+            dtype="datetime64[D]",
+        )
+        self.reference_dates = days
+        start_month = days.astype("datetime64[M]")
+        day_of_month = days - start_month.astype("datetime64[D]")
+        end_month = start_month[:, None] + self.months[None, :]
+        month_length = (end_month + 1).astype("datetime64[D]") - end_month.astype(
+            "datetime64[D]"
+        )
+        # (dates x maturities), NaT for unrecognised labels
+        self.maturity_dates = end_month.astype("datetime64[D]") + np.minimum(
+            day_of_month[:, None], month_length - 1
+        )
+        self.maturity_dates[:, ~self.valid] = np.datetime64("NaT")
+
+    def __len__(self) -> int:
+        return len(self.reference_dates)
+
+    def reference_datetime(self, row: int) -> datetime:
+        return self.reference_dates[row].astype("datetime64[us]").item()
+
+    def maturity_datetimes(self, row: int, columns=None) -> np.ndarray:
+        """
+        Return the maturity dates of a row as datetimes.
+
+        :param row: The row of the reference date.
+        :param columns: Optional index or mask of the maturities to return.
+        """
+        dates = self.maturity_dates[row]
+        if columns is not None:
+            dates = dates[columns]
+        return dates.astype("datetime64[us]").astype(object)
+
+
+class ZeroRateGrid:
+    """
+    The par yields and zero rates of every reference date, the zero rates on
+    tenors fixed in days from the reference date.
+
+    Rows are filled in order by :meth:`YieldCurveModel.fill_zero_rates`, so the
+    grid can be built a few rows at a time and drawn from as it fills.
+    """
+
+    def __init__(self, tenor_grid: TenorGrid, par_yields, zero_days) -> None:
+        """
+        :param tenor_grid: The maturities and maturity dates of the par yields.
+        :param par_yields: A (dates x maturities) array of par yields in percent.
+        :param zero_days: The tenors of the zero rates in days.
+        """
+        self.tenor_grid = tenor_grid
+        self.reference_dates = tenor_grid.reference_dates
+        self.par_years = tenor_grid.years
+        self.par_yields = np.asarray(par_yields, dtype=np.float64)
+        self.zero_days = np.asarray(zero_days, dtype=np.int64)
+        # Annually compounded zero rates in percent, NaN beyond the longest
+        # maturity quoted on the date and in rows not yet filled
+        self.zero_rates = np.full(
+            (len(self.reference_dates), len(self.zero_days)), np.nan
+        )
+        self.n_filled = 0
+
+    def __len__(self) -> int:
+        return len(self.reference_dates)
+
+    @property
+    def complete(self) -> bool:
+        return self.n_filled == len(self)
+
+    def frame(self, row: int):
+        """
+        Return the curves of a row, without missing values.
+
+        :return: The reference date, the par maturity dates and yields and the
+            zero rate dates and rates.
+        :rtype: tuple[datetime, list[datetime], np.ndarray, list[datetime], np.ndarray]
+        """
+        reference_date = self.tenor_grid.reference_datetime(row)
+        yields = self.par_yields[row]
+        valid = self.tenor_grid.valid & ~np.isnan(yields)
+        par_dates = list(self.tenor_grid.maturity_datetimes(row, valid))
+        zero_rates = self.zero_rates[row]
+        filled = ~np.isnan(zero_rates)
+        zero_dates = list(
+            (self.reference_dates[row] + self.zero_days[filled])
+            .astype("datetime64[us]")
+            .astype(object)
+        )
+        return reference_date, par_dates, yields[valid], zero_dates, zero_rates[filled]
 
 
 class YieldCurveModel(QAbstractTableModel):
@@ -10,15 +163,43 @@ class YieldCurveModel(QAbstractTableModel):
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
         self._yield_curve: ql.YieldTermStructure | None = None
-        self._yield_data: dict[date, list[tuple[str, float]]] = {}
+        # The par yields in percent of every reference date (row) and maturity
+        # (column), with NaN for missing quotes
+        self._yields = np.empty((0, 0), dtype=np.float64)
         self._reference_dates: list[date] = []
         self._maturities: list[str] = []
+        # Row of each reference date
+        self._rows: dict[date, int] = {}
+        self._tenor_grid = TenorGrid([], [])
+        self._zero_rate_grid: ZeroRateGrid | None = None
+        # The fitted parameters of all dates, keyed by whether they are Svensson's
+        self._nelson_siegel_histories: dict[bool, NelsonSiegelHistory] = {}
+        self._curve_engine = DEFAULT_ENGINE
+        self._build_curve = get_curve_engine(DEFAULT_ENGINE)
 
     def reset(self) -> None:
+        self.set_yield_history([], [], np.empty((0, 0)))
+
+    def curve_engine(self) -> str:
+        return self._curve_engine
+
+    def set_curve_engine(self, name: str) -> None:
+        """
+        Set how the yield curves are built from the par yields, see
+        :data:`brms.models.curve_engines.CURVE_ENGINES`.
+
+        The zero rate grid is discarded and the views are reset if it changes.
+
+        :param name: The name of the curve engine.
+        :raises ValueError: If there is no such engine.
+        """
+        build_curve = get_curve_engine(name)
+        if name == self._curve_engine:
+            return
         self.beginResetModel()
-        self._yield_data.clear()
-        self._reference_dates.clear()
-        self._maturities.clear()
+        self._curve_engine = name
+        self._build_curve = build_curve
+        self._zero_rate_grid = None
         self.endResetModel()
 
     def reference_dates(self):
@@ -34,7 +215,10 @@ class YieldCurveModel(QAbstractTableModel):
         :param query_date: The date for which to fetch the yield data.
         :return: A list of tuples containing (maturity, yield).
         """
-        return self._yield_data.get(query_date, [])
+        row = self._rows.get(query_date)
+        if row is None:
+            return []
+        return list(zip(self._maturities, self._yields[row].tolist()))
 
     def update_yield_data(
         self, new_yield_data: dict[date, list[tuple[str, float]]]
@@ -48,15 +232,158 @@ class YieldCurveModel(QAbstractTableModel):
         :param new_yield_data: The new yield data to update.
         :type new_yield_data: dict
         """
-        self.beginResetModel()
-        self._yield_data = new_yield_data
-        self._reference_dates = list(new_yield_data.keys())
+        maturities = []
         if new_yield_data:
-            self._maturities = [mat for mat, _ in next(iter(new_yield_data.values()))]
-        else:
-            self._maturities = []
+            maturities = [mat for mat, _ in next(iter(new_yield_data.values()))]
+        yields = np.array(
+            [[rate for _, rate in data] for data in new_yield_data.values()],
+            dtype=np.float64,
+        ).reshape(len(new_yield_data), len(maturities))
+        self.set_yield_history(list(new_yield_data), maturities, yields)
+
+    def set_yield_history(self, dates, maturities, yields) -> None:
+        """
+        Replace the yield data and notify the view that the data has changed.
+
+        :param dates: The reference dates, in increasing order.
+        :param maturities: The maturity labels, e.g. "1 Mo" or "10 Yr".
+        :param yields: A (dates x maturities) array of par yields in percent,
+            with NaN for missing quotes.
+        """
+        self.beginResetModel()
+        self._reference_dates = list(dates)
+        self._maturities = list(maturities)
+        self._yields = np.asarray(yields, dtype=np.float64).reshape(
+            len(self._reference_dates), len(self._maturities)
+        )
+        self._rows = {d: i for i, d in enumerate(self._reference_dates)}
+        self._tenor_grid = TenorGrid(self._maturities, self._reference_dates)
+        self._zero_rate_grid = None
+        self._nelson_siegel_histories = {}
         self.endResetModel()
 
+    def yield_history(self) -> tuple[list[date], list[str], np.ndarray]:
+        """
+        Return the yield data as a (dates x maturities) array.
+
+        :return: The reference dates, the maturities and the yields in percent,
+            with NaN for missing quotes. The array is the one held by the model
+            and must not be modified.
+        :rtype: tuple[list[date], list[str], np.ndarray]
+        """
+        return self._reference_dates, self._maturities, self._yields
+
+    def tenor_grid(self) -> TenorGrid:
+        """
+        Return the parsed maturities and the maturity dates of the current data.
+        """
+        return self._tenor_grid
+
+    def nelson_siegel_history(self, svensson=True) -> NelsonSiegelHistory:
+        """
+        Return the Nelson-Siegel or Svensson parameters of all reference dates,
+        fitted at once on first use.
+
+        :param svensson: Whether to fit Svensson curves, Nelson-Siegel otherwise.
+        """
+        history = self._nelson_siegel_histories.get(svensson)
+        if history is None:
+            history = NelsonSiegelHistory.fit(self._tenor_grid, self._yields, svensson)
+            self._nelson_siegel_histories[svensson] = history
+        return history
+
+    def zero_rate_grid(self) -> ZeroRateGrid | None:
+        """
+        Return the grid of zero rates of the current data, if one was created by
+        :meth:`new_zero_rate_grid`.
+        """
+        return self._zero_rate_grid
+
+    def new_zero_rate_grid(self, n_points=50) -> ZeroRateGrid:
+        """
+        Create an empty grid of zero rates of the current data, to be filled by
+        :meth:`fill_zero_rates`.
+
+        :param n_points: The number of zero rate tenors, evenly spaced from the
+            reference date to the longest maturity.
+        """
+        tenor_grid = self._tenor_grid
+        max_days = int(np.nanmax(tenor_grid.years, initial=0.0) * 365)
+        zero_days = np.linspace(0, max_days, n_points).astype(np.int64)
+        self._zero_rate_grid = ZeroRateGrid(tenor_grid, self._yields, zero_days)
+        return self._zero_rate_grid
+
+    def fill_zero_rates(self, grid: ZeroRateGrid, n_rows: int) -> None:
+        """
+        Build the curves of the next `n_rows` rows of `grid` and fill in their
+        zero rates. Rows whose curve fails to build are left as NaN.
+
+        With a parametric curve engine the zero rates are evaluated from the
+        fitted parameters of all dates, see :meth:`nelson_siegel_history`,
+        instead of building the curves.
+
+        The curves are built without changing the global evaluation date. A grid
+        replaced since, by new data or a new grid, is left as is.
+        """
+        if grid is not self._zero_rate_grid:
+            return
+        svensson = PARAMETRIC_ENGINES.get(self._curve_engine)
+        if svensson is not None:
+            history = self.nelson_siegel_history(svensson)
+            rows = slice(grid.n_filled, min(grid.n_filled + n_rows, len(grid)))
+            # Annually compounded, taking the two day counts as equal
+            zero_rates = 100 * np.expm1(
+                history.zero_rates(rows, grid.zero_days / DAYS_PER_YEAR)
+            )
+            tenor_grid = self._tenor_grid
+            quoted = tenor_grid.valid & ~np.isnan(self._yields[rows])
+            maturity_dates = tenor_grid.maturity_dates[rows]
+            terms = maturity_dates - tenor_grid.reference_dates[rows, None]
+            longest = np.where(quoted, terms.astype(np.int64), -1).max(axis=1)
+            zero_rates[grid.zero_days[None, :] > longest[:, None]] = np.nan
+            grid.zero_rates[rows] = zero_rates
+            grid.n_filled = rows.stop
+            return
+        day_count = ql.ActualActual(ql.ActualActual.ISDA)
+        for row in range(grid.n_filled, min(grid.n_filled + n_rows, len(grid))):
+            grid.n_filled = row + 1
+            inputs = self.get_curve_inputs(row)
+            ref_date, dates, _ = inputs
+            if not len(dates):
+                continue
+            longest = (max(dates) - ref_date).days
+            try:
+                yield_curve = self._build_curve(inputs)
+                ql_date = ql.Date(ref_date.day, ref_date.month, ref_date.year)
+                for j, days in enumerate(grid.zero_days[grid.zero_days <= longest]):
+                    grid.zero_rates[row, j] = 100 * (
+                        yield_curve.zeroRate(
+                            ql_date + int(days), day_count, ql.Compounded, ql.Annual
+                        ).rate()
+                    )
+            except RuntimeError:
+                grid.zero_rates[row] = np.nan
+
+    def get_curve_inputs(self, row: int, yield_shock=None):
+        """
+        Return the inputs of :meth:`build_yield_curve` for a row of the data.
+
+        :param row: The row of the reference date.
+        :param yield_shock: Optional callable `(maturities_in_years, yields) -> yields`
+            applied to the yields before they are returned, e.g. a stress scenario.
+        :return: The reference date, the maturity dates and the yields, without
+            missing quotes.
+        :rtype: tuple[datetime, np.ndarray, np.ndarray]
+        """
+        tenor_grid = self._tenor_grid
+        yields = self._yields[row]
+        valid = tenor_grid.valid & ~np.isnan(yields)
+        yields = yields[valid]
+        if yield_shock is not None:
+            yields = yield_shock(tenor_grid.years[valid], yields)
+        maturity_dates = tenor_grid.maturity_datetimes(row, valid)
+        return tenor_grid.reference_datetime(row), maturity_dates, yields
+
     def rowCount(self, parent=QModelIndex()):
         return len(self._reference_dates)
 
@@ -65,10 +392,7 @@ class YieldCurveModel(QAbstractTableModel):
 
     def data(self, index, role=Qt.DisplayRole):
         if role == Qt.DisplayRole:
-            query_date = self._reference_dates[index.row()]
-            yield_data = self._yield_data.get(query_date)
-            _, rate = yield_data[index.column()]
-            return rate
+            return self._yields.item(index.row(), index.column())
         return None
 
     def headerData(self, section, orientation, role=Qt.DisplayRole):
@@ -79,81 +403,18 @@ class YieldCurveModel(QAbstractTableModel):
                 return self._reference_dates[section].strftime("%Y-%m-%d")
         return None
 
-    def build_yield_curve(self, yield_data):
-
+    def build_curve(self, yield_data):
+        """
+        Return the curve of `yield_data` without making it the curve of the
+        model, e.g. to draw a row the simulation is not on.
+        """
         if yield_data is None:
             return
-        ref_date, dates, yields = yield_data
-
-        # Convert date to QuantLib Date
-        ql_date = ql.Date(ref_date.day, ref_date.month, ref_date.year)
-        ql.Settings.instance().evaluationDate = ql_date
+        return self._build_curve(yield_data)
 
-        calendar = ql.UnitedStates(ql.UnitedStates.NYSE)
-        business_convention = ql.Following
-        end_of_month = False
-        day_count = ql.ActualActual(ql.ActualActual.ISDA)
-
-        # Maturity<=1yr
-        zcb_data = []
-        coupon_bond_data = []
-        # Add another week to be sure
-        one_year_later = ref_date + relativedelta(years=1) + relativedelta(weeks=1)
-        for maturity_date, y in zip(dates, yields):
-            if maturity_date <= one_year_later:
-                zcb_data.append((maturity_date, float(y) / 100))
-            else:
-                # Assuming price is 100.0 for simplicity
-                coupon_bond_data.append((maturity_date, float(y) / 100, 100.0))
-
-        # Create zero-coupon bond helpers for the short end
-        zcb_helpers = []
-        for maturity_date, rate in zcb_data:
-            maturity_period = ql.Period((maturity_date - ref_date).days, ql.Days)
-            zcb_helpers.append(
-                ql.DepositRateHelper(
-                    ql.QuoteHandle(ql.SimpleQuote(rate)),
-                    maturity_period,
-                    0,  # settlement days
-                    calendar,
-                    business_convention,
-                    end_of_month,
-                    day_count,
-                )
-            )
-
-        # Create fixed rate bond helpers for the long end
-        bond_helpers = []
-        for maturity_date, coupon_rate, price in coupon_bond_data:
-            maturity_period = ql.Period((maturity_date - ref_date).days, ql.Days)
-            schedule = ql.Schedule(
-                ql_date,
-                ql_date + maturity_period,
-                ql.Period(ql.Semiannual),
-                calendar,
-                business_convention,
-                business_convention,
-                ql.DateGeneration.Backward,
-                end_of_month,
-            )
-            bond_helpers.append(
-                ql.FixedRateBondHelper(
-                    ql.QuoteHandle(ql.SimpleQuote(price)),
-                    0,  # settlement days
-                    100.0,  # face value
-                    schedule,
-                    [coupon_rate],
-                    day_count,
-                )
-            )
-
-        # Combine the helpers
-        rate_helpers = zcb_helpers + bond_helpers
-
-        # Build the yield curve
-        self._yield_curve = ql.PiecewiseLogCubicDiscount(
-            ql_date, rate_helpers, day_count
-        )
-        self._yield_curve.enableExtrapolation()
+    def build_yield_curve(self, yield_data):
 
+        if yield_data is None:
+            return
+        self._yield_curve = self._build_curve(yield_data)
         return self._yield_curve
@@ -1,9 +1,12 @@
 import datetime
 import time
 from functools import wraps
+from typing import TYPE_CHECKING
 
 import QuantLib as ql
-from PySide6.QtCore import QDate
+
+if TYPE_CHECKING:
+    from PySide6.QtCore import QDate
 
 
 def timeit(func):
@@ -18,7 +21,7 @@ def timeit(func):
     return timed
 
 
-def qdate_to_qldate(date: QDate):
+def qdate_to_qldate(date: "QDate"):
     """
     Convert a QDate object to a ql.Date object.
 
@@ -28,6 +31,8 @@ def qdate_to_qldate(date: QDate):
     Returns:
         ql.Date: The converted ql.Date object.
     """
+    from PySide6.QtCore import QDate
+
     assert isinstance(date, QDate)
     return ql.Date(date.day(), date.month(), date.year())
 
@@ -1,3 +1,21 @@
-from .bank_book_widget import BankBooksWidget
-from .calculator_widget import BondCalculatorWidget, LoanCalculatorWidget
-from .yield_curve_widget import YieldCurveWidget
+# The widgets are imported on first access, so that importing one view module
+# does not pull in the others, e.g. matplotlib for the yield curve plot
+import importlib
+
+_WIDGETS = {
+    "BankBooksWidget": ".bank_book_widget",
+    "BondCalculatorWidget": ".calculator_widget",
+    "GapReportWidget": ".gap_report_widget",
+    "LiquidityWidget": ".liquidity_widget",
+    "LoanCalculatorWidget": ".calculator_widget",
+    "RiskMetricsWidget": ".risk_metrics_widget",
+    "YieldCurveWidget": ".yield_curve_widget",
+}
+
+__all__ = list(_WIDGETS)
+
+
+def __getattr__(name):
+    if name not in _WIDGETS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_WIDGETS[name], __name__), name)
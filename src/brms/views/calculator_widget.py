@@ -1,3 +1,4 @@
+import numpy as np
 from PySide6.QtCore import QDate, Qt
 from PySide6.QtWidgets import (
     QComboBox,
@@ -29,7 +30,7 @@ class BaseCalculatorWidget(BRMSWidget):
 
 class BondCalculatorWidget(BaseCalculatorWidget):
     def __init__(self, parent=None):
-        super().__init__(parent, name="Fixed-Rate Bond Calculator", size=(660, 560))
+        super().__init__(parent, name="Fixed-Rate Bond Calculator", size=(660, 680))
 
         # Create the form layout
         calculator_layout = QHBoxLayout()
@@ -167,6 +168,45 @@ class BondCalculatorWidget(BaseCalculatorWidget):
 
         valuation_parameters_group_box.setLayout(valuation_parameters_layout)
 
+        # ======================================================================
+        # Price-yield sweep
+        # ======================================================================
+        # Create the group box for the grid of yields and valuation dates
+        sweep_group_box = QGroupBox("Price-Yield Sweep")
+        sweep_layout = QFormLayout()
+
+        sweep_yields_label = QLabel("Yields")
+        sweep_yields_layout = QHBoxLayout()
+        self.sweep_min_yield_edit = BRMSDoubleSpinBox()
+        self.sweep_min_yield_edit.setDecimals(3)
+        self.sweep_min_yield_edit.setSuffix("%")
+        self.sweep_min_yield_edit.setValue(0)
+        self.sweep_max_yield_edit = BRMSDoubleSpinBox()
+        self.sweep_max_yield_edit.setDecimals(3)
+        self.sweep_max_yield_edit.setSuffix("%")
+        self.sweep_max_yield_edit.setValue(10)
+        sweep_yields_layout.addWidget(self.sweep_min_yield_edit)
+        sweep_yields_layout.addWidget(QLabel("to"))
+        sweep_yields_layout.addWidget(self.sweep_max_yield_edit)
+        sweep_layout.addRow(sweep_yields_label, sweep_yields_layout)
+
+        sweep_steps_label = QLabel("Yield Steps")
+        self.sweep_steps_edit = QSpinBox()
+        self.sweep_steps_edit.setRange(2, 10_000)
+        self.sweep_steps_edit.setValue(201)
+        sweep_layout.addRow(sweep_steps_label, self.sweep_steps_edit)
+
+        sweep_dates_label = QLabel("Valuation Dates")
+        self.sweep_dates_edit = QSpinBox()
+        self.sweep_dates_edit.setRange(1, 10_000)
+        self.sweep_dates_edit.setValue(1)
+        self.sweep_dates_edit.setToolTip(
+            "Number of valuation dates from the valuation date to maturity"
+        )
+        sweep_layout.addRow(sweep_dates_label, self.sweep_dates_edit)
+
+        sweep_group_box.setLayout(sweep_layout)
+
         # ======================================================================
         # Stack together
         # ======================================================================
@@ -176,11 +216,14 @@ class BondCalculatorWidget(BaseCalculatorWidget):
         self.calculate_button = QPushButton(text="Calculate")
         self.calculate_button.setDefault(True)
         self.calculate_button.setFocus()
+        self.sweep_button = QPushButton(text="Sweep")
 
         control_panel_layout.addWidget(bond_features_group_box)
         control_panel_layout.addWidget(self.payments_button)
         control_panel_layout.addWidget(valuation_parameters_group_box)
         control_panel_layout.addWidget(self.calculate_button)
+        control_panel_layout.addWidget(sweep_group_box)
+        control_panel_layout.addWidget(self.sweep_button)
 
         calculator_layout.addLayout(control_panel_layout)
 
@@ -284,6 +327,86 @@ class BondCalculatorWidget(BaseCalculatorWidget):
 
         value_dialog.exec()
 
+    def show_price_yield_sweep(
+        self, yields, dates, clean_prices, durations, convexities, flat_yield
+    ):
+        """
+        Plot the price-yield curves of a sweep in a dialog.
+
+        The clean prices are drawn against the yields, one curve per valuation
+        date, and the duration and convexity of the first valuation date beside
+        them. The flat yield of the calculator is marked on both.
+
+        Args:
+            yields (np.ndarray): The yields in percent.
+            dates (list[datetime.date]): The valuation dates.
+            clean_prices (np.ndarray): The clean prices, (dates x yields).
+            durations (np.ndarray): The modified durations, (dates x yields).
+            convexities (np.ndarray): The convexities, (dates x yields).
+            flat_yield (float): The flat yield in percent.
+        """
+        from matplotlib import colormaps
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+        from matplotlib.collections import LineCollection
+        from matplotlib.figure import Figure
+
+        sweep_dialog = QDialog(self)
+        sweep_dialog.setWindowTitle("Price-Yield Sweep")
+        sweep_dialog.resize(900, 420)
+        layout = QVBoxLayout(sweep_dialog)
+
+        canvas = FigureCanvasQTAgg(Figure(figsize=(9, 4), layout="constrained"))
+        price_ax, risk_ax = canvas.figure.subplots(1, 2)
+
+        if len(dates) == 1:
+            price_ax.plot(yields, clean_prices[0], color="blue")
+        else:
+            # One collection draws the curves of all dates much faster than lines
+            curves = LineCollection(
+                [np.column_stack([yields, prices]) for prices in clean_prices],
+                colors=colormaps["viridis"](np.linspace(0, 1, len(dates))),
+                linewidths=1,
+            )
+            price_ax.add_collection(curves)
+            price_ax.autoscale_view()
+        price_ax.set_xlabel("Yield (%)", fontsize=10)
+        price_ax.set_ylabel("Clean Price", fontsize=10)
+        if len(dates) == 1:
+            price_ax.set_title(f"Price-Yield at {dates[0]:%Y-%m-%d}", fontsize=11)
+        else:
+            price_ax.set_title(
+                f"Price-Yield from {dates[0]:%Y-%m-%d} (purple) "
+                f"to {dates[-1]:%Y-%m-%d} (yellow)",
+                fontsize=11,
+            )
+
+        risk_ax.plot(yields, durations[0], color="blue", label="Modified Duration")
+        risk_ax.set_xlabel("Yield (%)", fontsize=10)
+        risk_ax.set_ylabel("Modified Duration", fontsize=10)
+        convexity_ax = risk_ax.twinx()
+        convexity_ax.plot(yields, convexities[0], color="crimson", label="Convexity")
+        convexity_ax.set_ylabel("Convexity", fontsize=10)
+        risk_ax.set_title(f"Sensitivities at {dates[0]:%Y-%m-%d}", fontsize=11)
+        risk_ax.legend(
+            handles=risk_ax.get_lines() + convexity_ax.get_lines(),
+            fontsize=9,
+            loc="upper right",
+        )
+
+        for ax in (price_ax, risk_ax):
+            ax.axvline(flat_yield, color="gray", linestyle="--", linewidth=1)
+            ax.grid(True, linestyle="--", alpha=0.7)
+            ax.tick_params(axis="both", which="major", labelsize=9)
+        convexity_ax.tick_params(axis="both", which="major", labelsize=9)
+
+        layout.addWidget(canvas)
+
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(sweep_dialog.close)
+        layout.addWidget(close_button)
+
+        sweep_dialog.exec()
+
 
 class LoanCalculatorWidget(BaseCalculatorWidget):
     def __init__(self, parent=None):
@@ -0,0 +1,53 @@
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QGroupBox,
+    QHeaderView,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+
+class GapReportWidget(QWidget):
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+
+        group_box = QGroupBox("Repricing Gap")
+        self.table_widget = QTableWidget()
+        self.table_widget.setAlternatingRowColors(True)
+        self.table_widget.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table_widget.setColumnCount(4)
+        self.table_widget.setHorizontalHeaderLabels(
+            ["Assets", "Liabilities", "Gap", "Cumulative Gap"]
+        )
+        self.table_widget.horizontalHeader().setSectionResizeMode(
+            QHeaderView.ResizeToContents
+        )
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.table_widget)
+        group_box.setLayout(layout)
+
+        gap_layout = QVBoxLayout()
+        gap_layout.addWidget(group_box)
+        self.setLayout(gap_layout)
+
+    def show_gap_report(self, bands, columns):
+        """
+        Display the maturity ladder.
+
+        :param bands: The time band labels, one per row.
+        :param columns: The values of each column, in the order of the header.
+        """
+        self.table_widget.clearContents()
+        self.table_widget.setRowCount(len(bands))
+        self.table_widget.setVerticalHeaderLabels(bands)
+        for column, values in enumerate(columns):
+            for row, value in enumerate(values):
+                item = QTableWidgetItem(self.locale().toString(float(value), "f", 2))
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                if value < 0:
+                    item.setForeground(Qt.red)
+                self.table_widget.setItem(row, column, item)
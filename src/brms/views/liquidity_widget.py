@@ -0,0 +1,80 @@
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QFormLayout,
+    QGroupBox,
+    QHeaderView,
+    QLabel,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from brms.views.base import BRMSDoubleSpinBox
+
+
+class LiquidityWidget(QWidget):
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+
+        group_box = QGroupBox("Liquidity Projection")
+
+        run_off_layout = QFormLayout()
+        self.initial_run_off_edit = BRMSDoubleSpinBox()
+        self.initial_run_off_edit.setSuffix("%")
+        self.initial_run_off_edit.setRange(0, 100)
+        run_off_layout.addRow(
+            QLabel("Initial Deposit Run-off"), self.initial_run_off_edit
+        )
+        self.daily_run_off_edit = BRMSDoubleSpinBox()
+        self.daily_run_off_edit.setSuffix("%")
+        self.daily_run_off_edit.setRange(0, 100)
+        run_off_layout.addRow(QLabel("Daily Deposit Run-off"), self.daily_run_off_edit)
+
+        self.survival_horizon_label = QLabel()
+
+        self.table_widget = QTableWidget()
+        self.table_widget.setAlternatingRowColors(True)
+        self.table_widget.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table_widget.setColumnCount(4)
+        self.table_widget.setHorizontalHeaderLabels(
+            ["Inflows", "Outflows", "Deposit Run-off", "Cash Position"]
+        )
+        self.table_widget.horizontalHeader().setSectionResizeMode(
+            QHeaderView.ResizeToContents
+        )
+
+        layout = QVBoxLayout()
+        layout.addLayout(run_off_layout)
+        layout.addWidget(self.survival_horizon_label)
+        layout.addWidget(self.table_widget)
+        group_box.setLayout(layout)
+
+        liquidity_layout = QVBoxLayout()
+        liquidity_layout.addWidget(group_box)
+        self.setLayout(liquidity_layout)
+
+    def show_liquidity(self, survival_horizon, summary):
+        """
+        Display the survival horizon and the projection over each horizon.
+
+        :param survival_horizon: The number of days before cash turns negative,
+            or None if it stays non-negative over the projection.
+        :param summary: A list of `(days, inflows, outflows, run_off, position)`.
+        """
+        if survival_horizon is None:
+            text = "Survival Horizon: beyond projection"
+        else:
+            text = f"Survival Horizon: <u>{survival_horizon}</u> days"
+        self.survival_horizon_label.setText(text)
+        self.table_widget.clearContents()
+        self.table_widget.setRowCount(len(summary))
+        self.table_widget.setVerticalHeaderLabels([f"{d} days" for d, *_ in summary])
+        for row, (_, *values) in enumerate(summary):
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(self.locale().toString(value, "f", 2))
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                if value < 0:
+                    item.setForeground(Qt.red)
+                self.table_widget.setItem(row, column, item)
@@ -6,20 +6,21 @@ from PySide6.QtWidgets import (
     QLabel,
     QMainWindow,
     QMessageBox,
+    QProgressDialog,
     QSizePolicy,
     QVBoxLayout,
     QWidget,
 )
 
 from brms import __about__, __github__, __version__
-from brms.controllers import BondCalculatorController, LoanCalculatorController
-from brms.models import YieldCurveModel
 from brms.views import (
     BankBooksWidget,
-    BondCalculatorWidget,
-    LoanCalculatorWidget,
+    GapReportWidget,
+    LiquidityWidget,
+    RiskMetricsWidget,
     YieldCurveWidget,
 )
+from brms.views.base import BRMSSplitter
 
 from brms.resources import resource  # noqa isort:skip
 
@@ -39,17 +40,19 @@ class MainWindow(QMainWindow):
         self.create_status_bar()
         self.apply_styles()
 
-        # fmt: off
-        self.bond_calculator = BondCalculatorWidget(self)
-        self.loan_calculator = LoanCalculatorWidget(self)
-        self.bond_calculator_ctrl = BondCalculatorController(self.bond_calculator)
-        self.loan_calculator_ctrl = LoanCalculatorController(self.loan_calculator)
+        # The calculators are built when first opened
+        self._bond_calculator = None
+        self._loan_calculator = None
 
+        # fmt: off
         self.bank_books_widget = BankBooksWidget(self, Qt.WindowType.Widget)
+        self.gap_report_widget = GapReportWidget(self)
+        self.liquidity_widget = LiquidityWidget(self)
 
         # self.yield_curve_model = YieldCurveModel()
         self.yield_curve_widget = YieldCurveWidget(self)
         # self.yield_curve_ctrl = YieldCurveController(self.yield_curve_model, self.yield_curve_widget)
+        self.risk_metrics_widget = RiskMetricsWidget(self)
         # fmt: on
 
         self.create_central_widget()
@@ -74,16 +77,22 @@ class MainWindow(QMainWindow):
         self.move(window_geometry.topLeft())
 
     def create_actions(self):
+        self.previous_action = QAction(
+            QIcon.fromTheme("media-skip-backward"), "Back", self
+        )
         # fmt: off
         self.new_action = QAction("New simulation", self)
         self.open_action = QAction("Load scenario", self)
-        self.save_action = QAction("Save", self)
+        self.save_action = QAction("Save checkpoint", self)
+        self.load_checkpoint_action = QAction("Load checkpoint", self)
+        self.record_action = QAction("Record results", self)
         self.exit_action = QAction("Exit", self)
         self.exit_action.setShortcut("Ctrl+Q")
         self.start_action = QAction(QIcon.fromTheme("media-playback-start"), "Start", self)
         self.pause_action = QAction(QIcon.fromTheme("media-playback-pause"), "Pause", self)
         self.stop_action = QAction(QIcon.fromTheme("media-playback-stop"), "Stop", self)
         self.next_action = QAction(QIcon.fromTheme("media-skip-forward"), "Next", self)
+        self.go_to_date_action = QAction("Go to date", self)
         self.risk_metrics_action = QAction(QIcon(":/icons/bar-chart.png"), "Risk Metrics", self)
         self.stress_test_action = QAction(QIcon.fromTheme("dialog-warning"), "Stress Test", self)
         self.mgmt_action = QAction(QIcon.fromTheme("computer"), "Management", self)
@@ -98,6 +107,7 @@ class MainWindow(QMainWindow):
         self.speed_up_action = QAction(QIcon(":/icons/plus-key.png"), "Speed Up", self)
         self.speed_down_action = QAction(QIcon(":/icons/minus-key.png"), "Slow Down", self)
         self.next_action.setToolTip("Advance to next period in the simulation")
+        self.previous_action.setToolTip("Go back to previous period in the simulation")
         self.mgmt_action.setToolTip("Take actions to manage risk")
         # fmt: on
 
@@ -106,8 +116,12 @@ class MainWindow(QMainWindow):
                 self.new_action,
                 self.open_action,
                 self.save_action,
+                self.load_checkpoint_action,
+                self.record_action,
                 self.exit_action,
                 self.next_action,
+                self.previous_action,
+                self.go_to_date_action,
                 self.start_action,
                 self.pause_action,
                 self.stop_action,
@@ -133,6 +147,8 @@ class MainWindow(QMainWindow):
         self.pause_action.setDisabled(True)
         self.stop_action.setDisabled(True)
 
+        self.record_action.setCheckable(True)
+        self.record_action.setChecked(False)
         self.fullscreen_action.setCheckable(True)
         self.fullscreen_action.setChecked(False)
         self.bond_calculator_action.setCheckable(True)
@@ -153,10 +169,16 @@ class MainWindow(QMainWindow):
         file_menu.addAction(self.new_action)
         file_menu.addAction(self.open_action)
         file_menu.addAction(self.save_action)
+        file_menu.addAction(self.load_checkpoint_action)
+        file_menu.addSeparator()
+        file_menu.addAction(self.record_action)
+        file_menu.addSeparator()
         file_menu.addAction(self.exit_action)
 
         # Edit menu
         edit_menu.addAction(self.next_action)
+        edit_menu.addAction(self.previous_action)
+        edit_menu.addAction(self.go_to_date_action)
         edit_menu.addAction(self.start_action)
         edit_menu.addAction(self.pause_action)
         edit_menu.addAction(self.stop_action)
@@ -185,6 +207,7 @@ class MainWindow(QMainWindow):
         self.toolbar = self.addToolBar("Toolbar")
         self.toolbar.setToolButtonStyle(Qt.ToolButtonTextBesideIcon)
 
+        self.toolbar.addAction(self.previous_action)
         self.toolbar.addAction(self.next_action)
         self.toolbar.addAction(self.start_action)
         self.toolbar.addAction(self.pause_action)
@@ -221,7 +244,17 @@ class MainWindow(QMainWindow):
         top_panel_layout.addWidget(QLabel("|"))
         top_panel_layout.addWidget(self.current_date_label)
         layout.addLayout(top_panel_layout)
-        layout.addWidget(self.bank_books_widget)
+        reports_splitter = BRMSSplitter()
+        reports_splitter.setOrientation(Qt.Orientation.Vertical)
+        reports_splitter.addWidget(self.gap_report_widget)
+        reports_splitter.addWidget(self.liquidity_widget)
+        splitter = BRMSSplitter()
+        splitter.setOrientation(Qt.Orientation.Horizontal)
+        splitter.addWidget(self.bank_books_widget)
+        splitter.addWidget(reports_splitter)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 1)
+        layout.addWidget(splitter)
         central_widget.setLayout(layout)
 
     def apply_styles(self):
@@ -314,8 +347,28 @@ class MainWindow(QMainWindow):
         self.fullscreen_action.triggered.connect(self.toggle_fullscreen)
         self.bond_calculator_action.triggered.connect(self.toggle_bond_calculator)
         self.loan_calculator_action.triggered.connect(self.toggle_loan_calculator)
-        self.bond_calculator.closeEvent = self.uncheck_bond_calculator_action
-        self.loan_calculator.closeEvent = self.uncheck_loan_calculator_action
+
+    @property
+    def bond_calculator(self):
+        if self._bond_calculator is None:
+            from brms.controllers import BondCalculatorController
+            from brms.views import BondCalculatorWidget
+
+            self._bond_calculator = BondCalculatorWidget(self)
+            self.bond_calculator_ctrl = BondCalculatorController(self._bond_calculator)
+            self._bond_calculator.closeEvent = self.uncheck_bond_calculator_action
+        return self._bond_calculator
+
+    @property
+    def loan_calculator(self):
+        if self._loan_calculator is None:
+            from brms.controllers import LoanCalculatorController
+            from brms.views import LoanCalculatorWidget
+
+            self._loan_calculator = LoanCalculatorWidget(self)
+            self.loan_calculator_ctrl = LoanCalculatorController(self._loan_calculator)
+            self._loan_calculator.closeEvent = self.uncheck_loan_calculator_action
+        return self._loan_calculator
 
     def toggle_fullscreen(self):
         if self.isFullScreen():
@@ -328,14 +381,14 @@ class MainWindow(QMainWindow):
     def toggle_bond_calculator(self):
         if self.bond_calculator_action.isChecked():
             self.bond_calculator.show()
-        else:
-            self.bond_calculator.close()
+        elif self._bond_calculator is not None:
+            self._bond_calculator.close()
 
     def toggle_loan_calculator(self):
         if self.loan_calculator_action.isChecked():
             self.loan_calculator.show()
-        else:
-            self.loan_calculator.close()
+        elif self._loan_calculator is not None:
+            self._loan_calculator.close()
 
     def uncheck_bond_calculator_action(self, event):
         self.bond_calculator_action.setChecked(False)
@@ -361,6 +414,15 @@ class MainWindow(QMainWindow):
         msg_box.setStandardButtons(QMessageBox.Ok)
         msg_box.exec()
 
+    def create_progress_dialog(self, title: str, label: str) -> QProgressDialog:
+        progress_dialog = QProgressDialog(label, "Cancel", 0, 0, self)
+        progress_dialog.setWindowTitle(title)
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(200)
+        progress_dialog.setAutoClose(False)
+        progress_dialog.setAutoReset(False)
+        return progress_dialog
+
     def show_load_scenario_messagebox(self):
         reply = QMessageBox.question(
             self,
@@ -0,0 +1,55 @@
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QHeaderView,
+    QLabel,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+from brms.views.base import BRMSWidget
+
+
+class RiskMetricsWidget(BRMSWidget):
+
+    def __init__(self, parent=None):
+        super().__init__(parent, Qt.WindowType.Window)
+        self.setWindowTitle("Risk Metrics")
+        self.setGeometry(100, 100, 480, 200)
+
+        self.date_label = QLabel("Trading Book Historical-Simulation VaR")
+
+        self.table_widget = QTableWidget()
+        self.table_widget.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table_widget.setColumnCount(2)
+        self.table_widget.setHorizontalHeaderLabels(["VaR", "Expected Shortfall"])
+        self.table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.date_label)
+        layout.addWidget(self.table_widget)
+        self.setLayout(layout)
+
+        self.center_window()
+
+    def show_var(self, title, metrics):
+        """
+        Display VaR and ES for each holding period.
+
+        :param title: The text shown above the table.
+        :param metrics: A list of `(label, var, es)` tuples, one per row. `var` and
+            `es` are None when there is not enough history.
+        """
+        self.date_label.setText(title)
+        self.table_widget.clearContents()
+        self.table_widget.setRowCount(len(metrics))
+        self.table_widget.setVerticalHeaderLabels([label for label, *_ in metrics])
+        for row, (_, var, es) in enumerate(metrics):
+            for column, value in enumerate((var, es)):
+                if value is None:
+                    text = "n/a"
+                else:
+                    text = self.locale().toString(value, "f", 2)
+                item = QTableWidgetItem(text)
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table_widget.setItem(row, column, item)
@@ -1,7 +1,6 @@
+from datetime import date
+
 import numpy as np
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-from matplotlib.ticker import FuncFormatter
 from PySide6.QtCore import QSize, Qt, Signal
 from PySide6.QtGui import QAction, QCloseEvent, QIcon, QShowEvent
 from PySide6.QtWidgets import (
@@ -9,6 +8,8 @@ from PySide6.QtWidgets import (
     QFileDialog,
     QHBoxLayout,
     QHeaderView,
+    QLabel,
+    QSlider,
     QStyledItemDelegate,
     QTableView,
     QToolBar,
@@ -63,11 +64,18 @@ class YieldCurveWidget(BRMSWidget):
         figure_action = QAction(QIcon(":/icons/line-chart-axis.png"), "Show Plot", self)
         all_view_action = QAction(QIcon(":/icons/table-and-graph.png"), "Show Both", self)
         # fmt: on
+        self.play_action = QAction(
+            QIcon.fromTheme("media-playback-start"), "Play History", self
+        )
+        self.play_action.setCheckable(True)
+        self.play_action.setToolTip("Animate the curves across all reference dates")
 
         self.toolbar.addAction(table_action)
         self.toolbar.addAction(figure_action)
         self.toolbar.addAction(all_view_action)
         self.toolbar.addAction(save_action)
+        self.toolbar.addSeparator()
+        self.toolbar.addAction(self.play_action)
 
         self.table_view = QTableView()
         self.table_view.setHorizontalHeader(RightAlignHeaderView(Qt.Horizontal))
@@ -81,9 +89,20 @@ class YieldCurveWidget(BRMSWidget):
         self.splitter.addWidget(self.table_view)
         self.splitter.addWidget(self.plot_widget)
 
+        # Scrubber through the reference dates, enabled once their zero rates
+        # are precomputed
+        self.scrubber = QSlider(Qt.Horizontal)
+        self.scrubber_label = QLabel()
+        scrubber_layout = QHBoxLayout()
+        scrubber_layout.addWidget(self.scrubber)
+        scrubber_layout.addWidget(self.scrubber_label)
+        scrubber_layout.setContentsMargins(10, 0, 10, 10)
+        self.set_playback_range(0)
+
         main_layout = QVBoxLayout(self)
         main_layout.addWidget(self.toolbar)
         main_layout.addWidget(self.splitter)
+        main_layout.addLayout(scrubber_layout)
         self.setLayout(main_layout)
 
         self.splitter.setContentsMargins(10, 10, 10, 10)
@@ -101,6 +120,21 @@ class YieldCurveWidget(BRMSWidget):
     def set_model(self, model):
         self.table_view.setModel(model)
 
+    def set_playback_range(self, n_dates: int):
+        """
+        Let the scrubber and the playback go through `n_dates` reference dates,
+        or disable them if there is none.
+        """
+        self.scrubber.setRange(0, max(n_dates - 1, 0))
+        self.scrubber.setEnabled(n_dates > 0)
+        self.play_action.setEnabled(n_dates > 0)
+        if n_dates == 0:
+            self.play_action.setChecked(False)
+            self.scrubber_label.clear()
+
+    def set_playback_label(self, text: str):
+        self.scrubber_label.setText(text)
+
     def set_default_view(self):
         self.resize(*self._all_views_size)
         total_size = 1000  # Arbitrary total size
@@ -128,13 +162,25 @@ class YieldCurveWidget(BRMSWidget):
 
 
 class PlotWidget(QWidget):
+    """
+    The yield curve plot. Matplotlib is imported and the canvas created when
+    the plot is first shown or drawn.
+
+    The curves, the title and the legend are persistent artists drawn with
+    blitting: an update restores the cached background of the axes and redraws
+    only them. The axis limits are rounded so that they rarely change; the
+    whole figure is redrawn, and the background cached again, when they do.
+    """
+
+    # Y-axis bounds are multiples of this, in percent
+    y_step = 0.5
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.layout = QVBoxLayout(self)
-        self.canvas = FigureCanvas(Figure(figsize=(5, 3)))
-        self.layout.addWidget(self.canvas)
-        self.ax = self.canvas.figure.add_subplot(111)
-        self.ax.set_title("Yield Curve", fontsize=11)
+        self._canvas = None
+        self._ax = None
+        self._background = None
         # Checkboxes
         checkbox_layout = QHBoxLayout()
         checkbox_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
@@ -152,34 +198,111 @@ class PlotWidget(QWidget):
         # checkbox_layout.addWidget(self.export_button)
         self.layout.addLayout(checkbox_layout)
 
+    @property
+    def canvas(self):
+        if self._canvas is None:
+            self._create_canvas()
+        return self._canvas
+
+    @property
+    def ax(self):
+        if self._ax is None:
+            self._create_canvas()
+        return self._ax
+
+    def _create_canvas(self):
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+        from matplotlib.figure import Figure
+        from matplotlib.ticker import FuncFormatter
+
+        self._canvas = FigureCanvasQTAgg(Figure(figsize=(5, 3)))
+        self.layout.insertWidget(0, self._canvas)
+        ax = self._ax = self._canvas.figure.add_subplot(111)
+        ax.xaxis_date()
+        ax.set_ylabel("Yield (%)", fontsize=11)
+        ax.tick_params(axis="both", which="major", labelsize=10)
+        ax.yaxis.set_major_formatter(FuncFormatter(lambda x, _: f"{x:.2f}"))
+        (self._par_line,) = ax.plot(
+            [], [], marker="o", color="blue", label="Treasury Par Yields"
+        )
+        (self._zero_line,) = ax.plot(
+            [], [], color="crimson", label="Interpolated Zero Rates"
+        )
+        self._legend = ax.legend(fontsize=9, loc="lower right")
+        self._legend.set_visible(False)
+        self._title = ax.set_title("Yield Curve", fontsize=11)
+        # In drawing order, above the background
+        self._animated = [self._par_line, self._zero_line, self._legend, self._title]
+        for artist in self._animated:
+            artist.set_animated(True)
+        self._bounds = None
+        self._show_grid = None
+        self._canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _on_draw(self, event):
+        # Cache the background after every full draw, e.g. on resize
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for artist in self._animated:
+            self.canvas.figure.draw_artist(artist)
+
+    def _blit(self, redraw: bool):
+        if redraw or self._background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_animated()
+        self.canvas.blit(self.canvas.figure.bbox)
+
+    def showEvent(self, event: QShowEvent):
+        if self._canvas is None:
+            self._create_canvas()
+        super().showEvent(event)
+
     def clear_plot(self):
-        self.ax.clear()
-        self.ax.set_title("Yield Curve", fontsize=11)
-        self.canvas.draw_idle()
+        if self._canvas is None:
+            return
+        self._par_line.set_data([], [])
+        self._zero_line.set_data([], [])
+        self._legend.set_visible(False)
+        self._title.set_text("Yield Curve")
+        self._blit(redraw=False)
 
     def update_plot(
         self, maturities, yields, maturities_z, zero_rates, title, rescale_y, show_grid
     ):
-        self.ax.clear()
-        self.ax.plot(
-            maturities, yields, marker="o", color="blue", label="Treasury Par Yields"
-        )
-        self.ax.plot(
-            maturities_z, zero_rates, color="crimson", label="Interpolated Zero Rates"
-        )
-        self.ax.set_ylabel("Yield (%)", fontsize=11)
+        ax = self.ax
+        self._par_line.set_data(maturities, yields)
+        self._zero_line.set_data(maturities_z, zero_rates)
+        self._legend.set_visible(True)
+        self._title.set_text(title)
+
+        # The x-axis spans whole months from the shortest maturity to the first
+        # January after the longest one
+        start, end = min(maturities), max(maturities)
+        x_bounds = (date(start.year, start.month, 1), date(end.year + 1, 1, 1))
         # Rescale y-axis if checkbox is checked
         if rescale_y:
-            self.ax.set_ybound(0, np.max(yields) * 1.1)
+            top = np.ceil(np.max(yields) * 1.1 / self.y_step) * self.y_step
+            y_bounds = (0.0, float(top))
         else:
-            self.ax.set_ybound(0.0, 10.0)
-        self.ax.set_title(title, fontsize=11)
-        if show_grid:
-            self.ax.grid(True, linestyle="--", alpha=0.7)
-        self.ax.tick_params(axis="both", which="major", labelsize=10)
-        self.ax.yaxis.set_major_formatter(FuncFormatter(lambda x, _: f"{x:.2f}"))
-        self.ax.legend(fontsize=9, loc="lower right")
-        self.canvas.draw_idle()
+            y_bounds = (0.0, 10.0)
+        redraw = False
+        if (x_bounds, y_bounds) != self._bounds:
+            ax.set_xlim(*x_bounds)
+            ax.set_ybound(*y_bounds)
+            self._bounds = (x_bounds, y_bounds)
+            redraw = True
+        if show_grid != self._show_grid:
+            if show_grid:
+                ax.grid(True, linestyle="--", alpha=0.7)
+            else:
+                ax.grid(False)
+            self._show_grid = show_grid
+            redraw = True
+        self._blit(redraw)
 
     def export_plot(self):
         options = QFileDialog.Options()
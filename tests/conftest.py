@@ -0,0 +1,4 @@
+import os
+
+# The models use plain Python signals instead of Qt, see `brms.models.qt`
+os.environ.setdefault("BRMS_HEADLESS", "1")
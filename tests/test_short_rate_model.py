@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+import QuantLib as ql
+
+from brms.models import short_rate_model
+from brms.models.cashflow_ledger import INTEREST, PRINCIPAL, CashflowLedger
+from brms.models.short_rate_model import (
+    HullWhiteModel,
+    ShortRateScenarioGenerator,
+    VasicekModel,
+)
+
+REFERENCE_DATE = ql.Date(3, 1, 2022)
+# Whole years, the initial curves being sampled on whole days
+MATURITIES = np.array([1.0, 2.0, 3.0, 5.0, 10.0])
+
+
+@pytest.fixture
+def yield_curve():
+    return ql.FlatForward(
+        REFERENCE_DATE, 0.03, ql.Actual365Fixed(), ql.Continuous, ql.Annual
+    )
+
+
+def vasicek_zero_coupon_price(r0, a, b, sigma, tau):
+    """
+    The textbook Vasicek price `A(tau) exp(-B(tau) r0)` of a zero-coupon bond.
+    """
+    B = (1 - np.exp(-a * tau)) / a
+    A = np.exp((B - tau) * (a**2 * b - sigma**2 / 2) / a**2 - sigma**2 * B**2 / (4 * a))
+    return A * np.exp(-B * r0)
+
+
+def initial_short_rate(model):
+    if isinstance(model, HullWhiteModel):
+        return model.alpha(np.array([0.0]))
+    return np.array([model.r0])
+
+
+def monte_carlo_prices(model, maturity, t=0.0, n_paths=20_000, steps_per_year=250):
+    """
+    Return the Monte Carlo prices at time 0 of zero-coupon bonds paying at each
+    of `MATURITIES` up to `maturity`, discounting along the simulated paths up to
+    `t` and with the model prices from `t` on.
+    """
+    times = np.linspace(0.0, maturity, int(maturity * steps_per_year) + 1)
+    rates = model.simulate(times, n_paths, np.random.default_rng(42))
+    integral = np.zeros_like(rates)
+    integral[:, 1:] = np.cumsum(
+        0.5 * (rates[:, 1:] + rates[:, :-1]) * np.diff(times), axis=1
+    )
+    k = np.searchsorted(times, t)
+    maturities = MATURITIES[(MATURITIES >= t) & (MATURITIES <= maturity)]
+    if t == 0.0:
+        # Discount along the paths all the way
+        cols = np.searchsorted(times, maturities)
+        return maturities, np.exp(-integral[:, cols]).mean(axis=0)
+    log_p = model.log_bond_prices(times[k], maturities, rates[:, k])
+    return maturities, (np.exp(-integral[:, k][:, None] + log_p)).mean(axis=0)
+
+
+def test_vasicek_bond_prices_match_closed_form():
+    model = VasicekModel(0.02, 0.1, 0.04, 0.01)
+    for t, r_t in ((0.0, 0.02), (1.5, 0.035)):
+        log_p = model.log_bond_prices(t, t + MATURITIES, np.array([r_t]))[0]
+        expected = vasicek_zero_coupon_price(r_t, 0.1, 0.04, 0.01, MATURITIES)
+        np.testing.assert_allclose(np.exp(log_p), expected, rtol=1e-12)
+
+
+def test_hull_white_prices_the_initial_curve(yield_curve):
+    model = HullWhiteModel.calibrate(yield_curve)
+    log_p = model.log_bond_prices(0.0, MATURITIES, initial_short_rate(model))[0]
+    np.testing.assert_allclose(np.exp(log_p), np.exp(-0.03 * MATURITIES), rtol=1e-9)
+
+
+@pytest.mark.parametrize("model_name", ["vasicek", "hull-white"])
+@pytest.mark.parametrize("t", [0.0, 1.0])
+def test_simulated_discount_factors_match_bond_prices(yield_curve, model_name, t):
+    model = ShortRateScenarioGenerator.models[model_name].calibrate(yield_curve)
+    maturities, prices = monte_carlo_prices(model, 5.0, t)
+    log_p = model.log_bond_prices(0.0, maturities, initial_short_rate(model))
+    np.testing.assert_allclose(prices, np.exp(log_p[0]), rtol=1e-3)
+
+
+def ledger():
+    # A 5-year 4% annual bond of 100 held and a 2-year 3% one of 50 issued
+    dates, amounts, kinds, signs = [], [], [], []
+    for face, rate, years, sign in ((100.0, 0.04, 5, 1), (50.0, 0.03, 2, -1)):
+        for year in range(1, years + 1):
+            serial = (REFERENCE_DATE + ql.Period(year, ql.Years)).serialNumber()
+            dates += [serial, serial] if year == years else [serial]
+            amounts += [face * rate, face] if year == years else [face * rate]
+            kinds += [INTEREST, PRINCIPAL] if year == years else [INTEREST]
+            signs += [sign] * (2 if year == years else 1)
+    n = len(dates)
+    return CashflowLedger(dates, amounts, kinds, signs, np.zeros(n), np.zeros(n))
+
+
+def test_generator_results_do_not_depend_on_workers(yield_curve, monkeypatch):
+    generator = ShortRateScenarioGenerator(yield_curve)
+    run = dict(n_paths=2_000, block_size=500, seed=7)
+    serial = generator.run(ledger(), 10.0, 20.0, n_workers=1, **run)
+    monkeypatch.setattr(generator, "min_paths_per_worker", 500)
+    parallel = generator.run(ledger(), 10.0, 20.0, n_workers=2, **run)
+    np.testing.assert_array_equal(serial.eve, parallel.eve)
+    np.testing.assert_array_equal(serial.nii, parallel.nii)
+
+
+def test_generator_prices_small_runs_in_process(yield_curve, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("no worker processes for a small run")
+
+    monkeypatch.setattr(short_rate_model, "ProcessPoolExecutor", no_pool)
+    generator = ShortRateScenarioGenerator(yield_curve, "vasicek")
+    result = generator.run(ledger(), 10.0, 20.0, n_paths=1_000, n_workers=8, seed=1)
+    assert result.eve.shape == result.nii.shape == (1_000,)
@@ -0,0 +1,68 @@
+import json
+import os
+import subprocess
+import sys
+
+from brms.main import STARTUP_BUDGET
+
+# Shows the main window in a fresh interpreter and reports, once it is painted,
+# the time since `brms.main` was first imported and the modules loaded by then
+FIRST_PAINT = """
+import json, sys, time
+
+start = time.perf_counter()
+import brms.main
+
+def first_paint(app):
+    startup_time = time.perf_counter() - start
+    print(json.dumps({"startup_time": startup_time, "modules": sorted(sys.modules)}))
+    app.quit()
+
+brms.main.App.create_controller = first_paint
+brms.main.App(sys.argv).exec()
+"""
+
+# Imported after the first paint, see `brms.main`
+DEFERRED_MODULES = [
+    "QuantLib",
+    "pandas",
+    "matplotlib",
+    "brms.models",
+    "brms.controllers",
+]
+# The Qt modules the main window is painted with
+QT_MODULES = {"PySide6.QtCore", "PySide6.QtGui", "PySide6.QtWidgets"}
+
+
+def first_paint():
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    src = os.path.join(os.path.dirname(__file__), os.pardir, "src")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src, env.get("PYTHONPATH")]))
+    output = subprocess.run(
+        [sys.executable, "-c", FIRST_PAINT],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=60,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def test_first_paint_within_budget_without_heavy_modules():
+    report = first_paint()
+    modules = report["modules"]
+
+    loaded = [
+        name
+        for name in DEFERRED_MODULES
+        if any(m == name or m.startswith(f"{name}.") for m in modules)
+    ]
+    assert not loaded, f"{loaded} imported before the first paint"
+    qt_modules = {m for m in modules if m.startswith("PySide6.Qt")}
+    extra = sorted(qt_modules - QT_MODULES)
+    assert not extra, f"{extra} imported before the first paint"
+    assert report["startup_time"] <= STARTUP_BUDGET, (
+        f"Startup took {report['startup_time']:.2f}s, over the budget of "
+        f"{STARTUP_BUDGET:.2f}s"
+    )
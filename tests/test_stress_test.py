@@ -0,0 +1,71 @@
+import datetime
+import os
+
+import pandas as pd
+import pytest
+
+from brms.models.instruments import DemandDeposit
+from brms.models.scenario_model import ScenarioModel
+from brms.models.simulation import Simulation
+from brms.models.stress_test import StressTestRunner, StressVariant, stress_grid
+
+SCENARIO = os.path.join(os.path.dirname(__file__), os.pardir, "scenario_default.xlsx")
+END = datetime.date(2021, 11, 15)
+
+
+@pytest.fixture(scope="module")
+def variants():
+    return stress_grid(
+        parallel_shifts_bp=(0.0, 100.0),
+        deposit_run_offs=(0.0, 0.2),
+        prepayment_rates=(0.1,),
+    )
+
+
+def test_parallel_run_matches_serial_run(variants):
+    runner = StressTestRunner(SCENARIO, end=END, rate_shifts_bp=(50.0,))
+    serial = runner.run(variants, n_workers=1)
+    parallel = runner.run(variants, n_workers=2)
+
+    assert len(serial) == len(variants) * serial["date"].nunique()
+    assert "trading_assets_shift+50bp" in serial
+    pd.testing.assert_frame_equal(serial, parallel, check_exact=True)
+
+
+def balance_sheet(scenario: ScenarioModel):
+    banking_book = scenario.bank_model().banking_book
+    return {
+        "cash": banking_book.get_cash(),
+        "deposits": [
+            liability.value()
+            for liability in banking_book.liabilities
+            if isinstance(liability, DemandDeposit)
+        ],
+        "assets": [id(asset) for asset in banking_book.assets],
+        "specs": [asset.spec() for asset in banking_book.assets],
+        "rows": len(banking_book.store),
+    }
+
+
+def load_scenario() -> ScenarioModel:
+    scenario = ScenarioModel()
+    assert scenario.load_scenario(SCENARIO)
+    return scenario
+
+
+def test_restore_leaves_base_scenario_unchanged():
+    scenario = load_scenario()
+    before = balance_sheet(scenario)
+
+    variant = StressVariant(100.0, 50.0, deposit_run_off=0.3, prepayment_rate=0.2)
+    simulation = Simulation(scenario, variant.yield_shock)
+    restore = variant.apply(scenario, simulation.dates()[0])
+    assert balance_sheet(scenario) != before
+    simulation.run(end=END)
+    restore()
+
+    assert balance_sheet(scenario) == before
+    for book in (scenario.bank.banking_book, scenario.bank.trading_book):
+        assert book.aggregation_state() == ([], [])
+    expected = Simulation(load_scenario()).run(end=END)
+    assert Simulation(scenario).run(end=END) == expected
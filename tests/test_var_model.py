@@ -0,0 +1,76 @@
+import numpy as np
+import QuantLib as ql
+
+from brms.models.cashflow_ledger import PRINCIPAL, TRADING_BOOK, CashflowLedger
+from brms.models.var_model import HistoricalVaRModel
+
+START = ql.Date(3, 1, 2022)
+# Daily par yields in percent of the 1 and 2-year tenors
+YIELDS = np.array(
+    [
+        [3.00, 3.50],
+        [3.10, 3.40],
+        [2.95, 3.45],
+        [3.05, 3.70],
+        [3.20, 3.60],
+        [3.00, 3.55],
+        [2.90, 3.20],
+        [3.15, 3.35],
+        [3.10, 3.50],
+        [3.40, 3.80],
+        [3.30, 3.60],
+        [3.35, 3.65],
+    ]
+)
+DATES = [START + i for i in range(len(YIELDS))]
+
+
+def model():
+    var_model = HistoricalVaRModel(confidence=0.9, lookback=10, horizons=(1,))
+    var_model.set_history(DATES, [1.0, 2.0], YIELDS)
+    # Receive 100 in 365 days and pay 40 in 730 days, one and two years
+    dates = [(DATES[-1] + days).serialNumber() for days in (365, 730)]
+    n = len(dates)
+    var_model.set_portfolio(
+        CashflowLedger(
+            dates,
+            [100.0, 40.0],
+            [PRINCIPAL] * n,
+            [1, -1],
+            [TRADING_BOOK] * n,
+            np.zeros(n),
+        )
+    )
+    return var_model
+
+
+def curve(date):
+    return ql.FlatForward(date, 0.03, ql.Actual365Fixed(), ql.Continuous)
+
+
+def test_var_and_es_match_hand_calculation():
+    var_model = model()
+    assert var_model.min_scenarios == 10
+    results = var_model.calculate(DATES[-1], curve(DATES[-1]))
+
+    # The 10 daily changes up to the valuation date, in decimals
+    changes = np.diff(YIELDS, axis=0)[1:] / 100
+    base = 100 * np.exp(-0.03) - 40 * np.exp(-0.06)
+    pnl = sorted(
+        100 * np.exp(-(0.03 + d1)) - 40 * np.exp(-(0.03 + d2) * 2) - base
+        for d1, d2 in changes
+    )
+    # The 10% quantile of 10 values lies 90% of the way from the worst to the
+    # second worst, and only the worst is beyond it
+    var = -(pnl[0] + 0.9 * (pnl[1] - pnl[0]))
+    es = -pnl[0]
+    assert results.keys() == {1}
+    np.testing.assert_allclose(results[1], (var, es), rtol=1e-10)
+    assert var > 0
+
+
+def test_horizon_omitted_without_minimum_sample():
+    var_model = model()
+    # 10 daily changes are observed up to the day before, 9 the day before that
+    assert var_model.calculate(DATES[-2], curve(DATES[-2])).keys() == {1}
+    assert var_model.calculate(DATES[-3], curve(DATES[-3])) == {}